@@ -1,10 +1,39 @@
 #!/usr/bin/env python3
 
-from pycaching.cache import Cache  # NOQA
-from pycaching.geocaching import Geocaching  # NOQA
-from pycaching.log import Log  # NOQA
-from pycaching.trackable import Trackable  # NOQA
-from pycaching.geo import Point, Rectangle  # NOQA
+import importlib
+import sys
+
+# Classes available directly from the package, imported on first access (PEP 562), so importing
+# pycaching doesn't import requests, bs4 and geopy until they are really needed.
+_lazy_attributes = {
+    "Cache": "pycaching.cache",
+    "Geocaching": "pycaching.geocaching",
+    "Log": "pycaching.log",
+    "Trackable": "pycaching.trackable",
+    "Point": "pycaching.geo",
+    "Rectangle": "pycaching.geo",
+}
+
+__all__ = ["login"] + list(_lazy_attributes)
+
+
+def __getattr__(name):
+    try:
+        module = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name)) from None
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # don't call __getattr__ next time
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # module __getattr__ is not supported
+    for _name in _lazy_attributes:
+        __getattr__(_name)
 
 
 def login(username=None, password=None):
@@ -14,6 +43,7 @@ def login(username=None, password=None):
 
     :return: Created :class:`.Geocaching` instance.
     """
+    from pycaching.geocaching import Geocaching
     g = Geocaching()
     g.login(username, password)
     return g
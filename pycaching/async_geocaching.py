@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+from urllib.parse import urljoin
+
+import aiohttp
+
+from pycaching.cache import Cache
+from pycaching.errors import (Error, NotLoggedInException, LoginFailedException, PMOnlyException, LoadError,
+                              ValueError as PycachingValueError)
+from pycaching.geo import Point
+from pycaching.geocaching import Geocaching
+from pycaching.log import Log, Type as LogType
+from pycaching.strainers import CacheDetailsStrainer
+from pycaching.trackable import Trackable
+from pycaching.util import DateParser
+
+
+class AsyncGeocaching(object):
+    """Provides asynchronous methods for communicating with geocaching.com website.
+
+    This is an :mod:`asyncio` counterpart of :class:`.Geocaching` built on top of `aiohttp
+    <https://docs.aiohttp.org/>`_. Pages are parsed by the same code as in the synchronous client,
+    but the parsing runs in a thread pool executor, so it doesn't block the event loop.
+
+    Lazy loading is not possible without blocking the event loop. Objects returned by
+    :meth:`get_cache` and :meth:`get_trackable` are loaded, but caches generated by :meth:`search`
+    and :meth:`my_logs` have only the properties found on the listing pages. Accessing a property
+    which isn't filled in raises :class:`.Error`, load such caches by :meth:`load_cache` first.
+    Generators :meth:`search`, :meth:`load_logbook` and :meth:`my_logs` are asynchronous
+    generators.
+
+    Request policies of :class:`.Geocaching` are not supported: requests are not stored in a
+    :class:`.ResponseCache`, not throttled by a :class:`.RateLimiter` (only the number of concurrent
+    requests is limited), not retried by a :class:`.RetryPolicy` and not reported to
+    instrumentation hooks.
+
+    Can be used as an asynchronous context manager, which closes the session on exit:
+
+    .. code-block:: python
+
+        async with AsyncGeocaching() as geocaching:
+            await geocaching.login("user", "pass")
+            cache = await geocaching.get_cache("GC1PAR2")
+    """
+
+    _baseurl = Geocaching._baseurl
+    _urls = Geocaching._urls
+    _credentials_file = Geocaching._credentials_file
+
+    # objects owned by this client must not be loaded synchronously, see :func:`.util.check_synchronous`
+    _asynchronous = True
+
+    def __init__(self, *, session=None, limit=10, html_parser=None):
+        """Create an AsyncGeocaching instance.
+
+        :param aiohttp.ClientSession session: Session used for all requests. If not given, a new
+            one is created on first request (and closed by :meth:`close`).
+        :param int limit: Maximum number of concurrent requests (and connections of created
+            session).
+        :param html_parser: HTML parser used for all loaded pages, see :class:`.Geocaching`.
+        """
+        self._logged_in = False
+        self._logged_username = None
+        self._session = session
+        self._own_session = session is None
+        self._limit = limit
+        self._semaphore = None  # created on first request, inside of event loop
+        self.html_parser = html_parser
+        self._date_parser = DateParser()
+
+    # share implementation with the synchronous client
+    html_parser = Geocaching.html_parser
+    _parse_html = Geocaching._parse_html
+    _get_credentials = Geocaching._get_credentials
+    _load_credentials = Geocaching._load_credentials
+    _search_parse_cache = Geocaching._search_parse_cache
+    _my_logs_url = Geocaching._my_logs_url
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the session, if it was created by this instance."""
+        if self._own_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self._limit))
+        return self._session
+
+    async def _parse(self, markup, parse_only=None):
+        """Parse HTML in the default executor, not to block the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._parse_html, markup, parse_only)
+
+    async def _request(self, url, *, expect="soup", method="GET", login_check=True, parse_only=None, **kwargs):
+        """
+        Do a HTTP request and return a response based on expect param.
+
+        :param str url: Request target.
+        :param str method: HTTP method to use.
+        :param str expect: Expected type of data (either :code:`soup`, :code:`json` or :code:`raw`).
+        :param bool login_check: Whether to check if user is logged in or not.
+        :param bs4.SoupStrainer parse_only: Parse only matching parts of the page (used only when
+            expecting :code:`soup`).
+        :param kwargs: Passed to `aiohttp.ClientSession.request
+            <https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession.request>`_
+            as is.
+        """
+        # check login unless explicitly turned off
+        if login_check and not self._logged_in:
+            raise NotLoggedInException("Login is needed.")
+
+        url = url if "//" in url else urljoin(self._baseurl, url)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._limit)
+
+        try:
+            async with self._semaphore:
+                async with self._get_session().request(method, url, **kwargs) as res:
+                    res.raise_for_status()
+
+                    # return bs4.BeautifulSoup, JSON dict or raw aiohttp.ClientResponse
+                    if expect == "soup":
+                        text = await res.text()
+                    elif expect == "json":
+                        return await res.json(content_type=None)
+                    elif expect == "raw":
+                        await res.read()
+                        return res
+
+        except aiohttp.ClientError as e:
+            raise Error("Cannot load page: {}".format(url)) from e
+
+        return await self._parse(text, parse_only)
+
+    async def login(self, username=None, password=None):
+        """Log in the user for this instance of AsyncGeocaching.
+
+        See :meth:`.Geocaching.login`.
+
+        :raise .LoginFailedException: If login fails either because of bad credentials or
+            non-existing credentials file.
+        """
+        logging.info("Logging in...")
+
+        username, password = self._get_credentials(username, password)
+
+        logging.debug("Checking for previous login.")
+        if self._logged_in:
+            logging.info("Already logged in as {}.".format(self._logged_username))
+            if self._logged_username == username:
+                return
+            else:
+                logging.info("Want to login as {} => logging out.".format(username))
+                await self.logout()
+
+        login_page = await self._request(self._urls["login_page"], login_check=False)
+        post = Geocaching._get_login_post_data(login_page, username, password)
+
+        logging.debug("Submiting login form.")
+        after_login_page = await self._request(self._urls["login_page"], method="POST",
+                                               data=post, login_check=False)
+
+        logging.debug("Checking the result.")
+        if Geocaching._parse_logged_user(after_login_page):
+            logging.info("Logged in successfully as {}.".format(username))
+            self._logged_in = True
+            self._logged_username = username
+        else:
+            await self.logout()
+            raise LoginFailedException("Cannot login to the site "
+                                       "(probably wrong username or password).")
+
+    async def logout(self):
+        """Log out the user for this instance."""
+        logging.info("Logging out.")
+        self._logged_in = False
+        self._logged_username = None
+        if self._session is not None:
+            self._session.cookie_jar.clear()
+
+    async def get_logged_user(self, login_page=None):
+        """Return the name of currently logged user or :code:`None`.
+
+        :param .bs4.BeautifulSoup login_page: Object containing already loaded page.
+        """
+        login_page = login_page or await self._request(self._urls["login_page"], login_check=False)
+        return Geocaching._parse_logged_user(login_page)
+
+    async def search(self, point, limit=float("inf")):
+        """Return an asynchronous generator of caches around some point.
+
+        See :meth:`.Geocaching.search`. Caches have only the properties shown in search results,
+        load them by :meth:`load_cache` to get the others.
+
+        :param .geo.Point point: Search center point.
+        :param int limit: Maximum number of caches to generate.
+        """
+        logging.info("Searching at {}".format(point))
+
+        start_index = 0
+        while True:
+            # get one page
+            params = Geocaching._search_params(point, start_index)
+            if start_index == 0:
+                whole_page = await self._request(self._urls["search"], params=params)
+                geocaches_table = whole_page.find(id="geocaches")
+            else:
+                res = await self._request(self._urls["search_more"], params=params, expect="json")
+                geocaches_table = await self._parse(res["HtmlString"].strip())
+            rows = geocaches_table.find_all("tr")
+
+            # leave loop if there are no (more) results
+            if not rows:
+                return
+
+            # prepare language-dependent mappings
+            if start_index == 0:
+                localized_size_mapping = Geocaching._search_get_size_mapping(whole_page)
+
+            # parse caches in result
+            for start_index, row in enumerate(rows, start_index):
+
+                limit -= 1  # handle limit
+                if limit < 0:
+                    return
+
+                yield self._search_parse_cache(row, localized_size_mapping)
+
+            start_index += 1
+
+    async def geocode(self, location):
+        """Return a :class:`.Point` object from geocoded location.
+
+        :param str location: Location to geocode.
+        :raise .GeocodeError: If location cannot be geocoded (not found).
+        """
+        res = await self._request("api/geocode", params={"q": location}, expect="json")
+        return Point._from_geocode_response(res)
+
+    async def get_cache(self, wp=None, guid=None, *, method="full"):
+        """Return a loaded :class:`.Cache` object by its waypoint or GUID.
+
+        :param str wp: Cache waypoint.
+        :param str guid: Cache GUID.
+        :param str method: Loading method used for waypoint, see :meth:`load_cache`.
+
+        .. note ::
+           Provide only the GUID or the waypoint, not both.
+        """
+        if (wp is None) == (guid is None):
+            raise TypeError('Please provide exactly one of `wp` or `guid`.')
+        if guid is not None:
+            return await self._cache_from_guid(guid)
+        cache = Cache(self, wp)
+        await self.load_cache(cache, method=method)
+        return cache
+
+    async def load_cache(self, cache, method="full"):
+        """Load details of given cache.
+
+        :param .Cache cache: Cache to load.
+        :param str method: Loading method, one of :code:`full` (see :meth:`.Cache.load`),
+            :code:`quick` (see :meth:`.Cache.load_quick`) or :code:`guid` (see
+            :meth:`.Cache.load_by_guid`).
+        :raise .PMOnlyException: If cache is PM only and current user is basic member.
+        :raise .LoadError: If cache loading fails (probably because of not existing cache).
+        """
+        if method == "full":
+            url, params = cache._get_details_url()
+            try:
+                root = await self._request(url, params=params, parse_only=CacheDetailsStrainer())
+            except Error as e:
+                # probably 404 during cache loading - cache does not exist
+                raise LoadError("Error in loading cache") from e
+            cache._parse_details_page(root)
+        elif method == "quick":
+            res = await self._request(Cache._urls["tiles_server"], params={"i": cache.wp}, expect="json")
+            cache._parse_map_details(res)
+        elif method == "guid":
+            if not cache.guid:
+                await self.load_cache(cache, method="quick")
+            res = await self._request(Cache._urls["print_page"], params={"guid": cache.guid})
+            cache._parse_print_page(res)
+        else:
+            raise PycachingValueError("Unknown loading method '{}'.".format(method))
+
+    async def _cache_from_guid(self, guid):
+        logging.info('Loading cache with GUID {!r}'.format(guid))
+        print_page = await self._request(Cache._urls["print_page"], params={"guid": guid})
+        return Cache._from_print_page(self, guid, print_page)
+
+    async def _try_getting_cache_from_guid(self, guid):
+        """Try to get a cache from guid page if possible, otherwise quickly load it by gccode.
+
+        :param str guid: Guid of the cache that should be read in.
+        """
+        try:
+            return await self.get_cache(guid=guid)
+        except PMOnlyException:
+            res = await self._request(Cache._urls["cache_details"], params={"guid": guid}, expect="raw")
+            return await self.get_cache(Geocaching._wp_from_details_url(res.url), method="quick")
+
+    async def load_logbook(self, cache, limit=float("inf")):
+        """Return an asynchronous generator of logs for given cache.
+
+        See :meth:`.Cache.load_logbook`. If the cache is not fully loaded yet, it is loaded first.
+
+        :param .Cache cache: Cache which logbook to load.
+        :param int limit: Maximum number of logs to generate.
+        """
+        logging.info("Loading logbook for {}...".format(cache))
+
+        if not cache._has_logbook_token:
+            await self.load_cache(cache)
+
+        page = 0
+        per_page = min(limit, 100)  # max number to fetch in one request is 100 items
+
+        while True:
+            # get one page
+            res = await self._request(Cache._urls["logbook"], params=cache._logbook_params(page, per_page),
+                                      expect="json")
+            logbook_page = Cache._parse_logbook_page(res)
+            page += 1
+
+            if not logbook_page:
+                # result is empty - no more logs
+                return
+
+            created = self._date_parser.parse_many(log_data["Created"] for log_data in logbook_page)
+            visited = self._date_parser.parse_many(log_data["Visited"] for log_data in logbook_page)
+
+            for log_data, log_created, log_visited in zip(logbook_page, created, visited):
+
+                limit -= 1  # handle limit
+                if limit < 0:
+                    return
+
+                yield Log._from_logbook_data(log_data, created=log_created, visited=log_visited)
+
+    async def get_trackable(self, tid):
+        """Return a loaded :class:`.Trackable` object by its trackable ID.
+
+        :param str tid: Trackable ID.
+        """
+        trackable = Trackable(self, tid)
+        root = await self._request(trackable._get_details_url())
+        trackable._parse_details_page(root)
+        return trackable
+
+    async def my_logs(self, log_type=None, limit=float("inf")):
+        """Return an asynchronous generator of the logged-in user's logs.
+
+        See :meth:`.Geocaching.my_logs`. PM only caches are loaded only with basic details.
+
+        :param log_type: The log type to search for. Use a :class:`~.log.Type` value.
+            If set to ``None``, all logs will be returned (default: ``None``).
+        :param limit: The maximum number of results to return (default: infinity).
+        """
+        logging.info("Getting {} of my logs of type {}".format(limit, log_type))
+        page = await self._request(self._my_logs_url(log_type))
+
+        logs = Geocaching._parse_my_logs(page)
+        dates = self._date_parser.parse_many(date for _, date in logs)
+
+        yielded = 0
+        for (guid, _), date in zip(logs, dates):
+            if yielded >= limit:
+                break
+
+            current_cache = await self._try_getting_cache_from_guid(guid)
+            current_cache.visited = date
+
+            yield current_cache
+            yielded += 1
+
+    def my_finds(self, limit=float("inf")):
+        """Return an asynchronous generator of the logged-in user's finds.
+
+        :param limit: The maximum number of results to return (default: infinity).
+        """
+        return self.my_logs(LogType.found_it, limit)
+
+    def my_dnfs(self, limit=float("inf")):
+        """Return an asynchronous generator of the logged-in user's DNFs.
+
+        :param limit: The maximum number of results to return (default: infinity).
+        """
+        return self.my_logs(LogType.didnt_find_it, limit)
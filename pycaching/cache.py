@@ -2,19 +2,28 @@
 
 import logging
 import datetime
+import math
 import re
 import enum
 import os
-from bs4.element import Script
-from pycaching import errors
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pycaching import coordinates, errors
 from pycaching.geo import Point
 from pycaching.trackable import Trackable
 from pycaching.log import Log, Type as LogType
-from pycaching.util import parse_date, rot13, lazy_loaded
+from pycaching.util import parse_date, rot13, lazy_loaded, check_synchronous
 
 # prefix _type() function to avoid collisions with cache type
 _type = type
 
+# marks attributes not filled in
+_missing = object()
+
+# shared instances of all possible difficulty and terrain values
+_ratings = {rating / 2: rating / 2 for rating in range(2, 11)}
+
 
 class Cache(object):
     """Represents a geocache with its properties and methods for loading them.
@@ -30,6 +39,12 @@ class Cache(object):
     on geocaching.com.
     """
 
+    # no per-instance __dict__, because large numbers of caches are often held in memory
+    __slots__ = ("_geocaching", "_wp", "_guid", "url", "_name", "_type", "_location", "_original_location",
+                 "_state", "_found_status", "_size", "_difficulty", "_terrain", "_author", "_hidden", "_visited",
+                 "_attributes", "_summary", "_description", "_hint", "_favorites", "_pm_only", "_log_counts",
+                 "_waypoints", "__logbook_token", "__trackable_page_url", "trackables", "__weakref__")
+
     # generated by util.get_possible_attributes()
     # TODO: smarter way of keeping attributes up to date
     _possible_attributes = {
@@ -111,6 +126,59 @@ class Cache(object):
         "log_page": "play/geocache/{wp}/log",
     }
 
+    # snapshot keys mapped to names of attributes storing the properties
+    _snapshot_attributes = {
+        "wp": "_wp",
+        "guid": "_guid",
+        "url": "url",
+        "name": "_name",
+        "type": "_type",
+        "location": "_location",
+        "original_location": "_original_location",
+        "state": "_state",
+        "found_status": "_found_status",
+        "size": "_size",
+        "difficulty": "_difficulty",
+        "terrain": "_terrain",
+        "author": "_author",
+        "hidden": "_hidden",
+        "visited": "_visited",
+        "attributes": "_attributes",
+        "summary": "_summary",
+        "description": "_description",
+        "hint": "_hint",
+        "favorites": "_favorites",
+        "pm_only": "_pm_only",
+        "log_counts": "_log_counts",
+        "waypoints": "_waypoints",
+        "logbook_token": "_Cache__logbook_token",
+        "trackable_page_url": "_Cache__trackable_page_url",
+    }
+
+    # conversions of non-JSON property values (None is never converted)
+    _snapshot_encoders = {
+        "type": lambda type: type.value,
+        "location": lambda point: [point.latitude, point.longitude],
+        "original_location": lambda point: [point.latitude, point.longitude],
+        "found_status": lambda log: log.to_snapshot(),
+        "size": lambda size: size.value,
+        "hidden": lambda date: date.isoformat(),
+        "visited": lambda date: date.isoformat(),
+        "log_counts": lambda log_counts: {type.value: count for type, count in log_counts.items()},
+        "waypoints": lambda waypoints: [waypoint.to_snapshot() for waypoint in waypoints.values()],
+    }
+    _snapshot_decoders = {
+        "type": lambda value: Type(value),
+        "location": lambda value: Point(*value),
+        "original_location": lambda value: Point(*value),
+        "found_status": lambda value: Log.from_snapshot(value),
+        "size": lambda value: Size(value),
+        "hidden": lambda value: datetime.datetime.strptime(value, "%Y-%m-%d").date(),
+        "visited": lambda value: datetime.datetime.strptime(value, "%Y-%m-%d").date(),
+        "log_counts": lambda value: {LogType(type): count for type, count in value.items()},
+        "waypoints": lambda value: {data["id"]: Waypoint.from_snapshot(data) for data in value},
+    }
+
     @classmethod
     def _from_print_page(cls, geocaching, guid, soup):
         """Create a cache instance from a souped print-page and a GUID."""
@@ -134,7 +202,7 @@ class Cache(object):
             cache_info["favorites"] = int(fav_text)
         except ValueError:  # element not present when 0 favorites
             cache_info["favorites"] = 0
-        cache_info["hidden"] = parse_date(
+        cache_info["hidden"] = geocaching._date_parser.parse(
             content.find(class_="HalfRight AlignRight").p.text.strip().partition(":")[2].strip())
         cache_info["location"] = Point.from_string(content.find(class_="LatLong").text.strip())
         cache_info["state"] = None  # not on the page
@@ -208,6 +276,38 @@ class Cache(object):
         c.location = Point.from_block(block)
         return c
 
+    @classmethod
+    def from_snapshot(cls, geocaching, snapshot):
+        """Return :class:`.Cache` instance from a snapshot created by :meth:`to_snapshot`.
+
+        No loading is done, the cache has exactly the properties stored in the snapshot.
+
+        :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance.
+        :param dict snapshot: Cache snapshot.
+        """
+        c = cls(geocaching, None)
+        for name, attribute in cls._snapshot_attributes.items():
+            if name in snapshot:
+                value = snapshot[name]
+                decode = cls._snapshot_decoders.get(name)
+                setattr(c, attribute, decode(value) if decode and value is not None else value)
+        return c
+
+    def to_snapshot(self):
+        """Return a snapshot of all properties filled in, which can be serialized to JSON.
+
+        Accessing properties is avoided, so no lazy loading is triggered.
+
+        :rtype: :class:`dict`
+        """
+        snapshot = {}
+        for name, attribute in self._snapshot_attributes.items():
+            value = getattr(self, attribute, _missing)  # attributes are plain slots, not lazy properties
+            if value is not _missing:
+                encode = self._snapshot_encoders.get(name)
+                snapshot[name] = encode(value) if encode and value is not None else value
+        return snapshot
+
     @property
     def wp(self):
         """The cache GC code, must start with :code:`GC`.
@@ -410,7 +510,7 @@ class Cache(object):
         difficulty = float(difficulty)
         if difficulty < 1 or difficulty > 5 or difficulty * 10 % 5 != 0:  # X.0 or X.5
             raise errors.ValueError("Difficulty must be from 1 to 5 and divisible by 0.5.")
-        self._difficulty = difficulty
+        self._difficulty = _ratings[difficulty]
 
     @property
     @lazy_loaded
@@ -429,7 +529,7 @@ class Cache(object):
         terrain = float(terrain)
         if terrain < 1 or terrain > 5 or terrain * 10 % 5 != 0:  # X.0 or X.5
             raise errors.ValueError("Terrain must be from 1 to 5 and divisible by 0.5.")
-        self._terrain = terrain
+        self._terrain = _ratings[terrain]
 
     @property
     @lazy_loaded
@@ -442,7 +542,7 @@ class Cache(object):
 
     @author.setter
     def author(self, author):
-        author = str(author).strip()
+        author = sys.intern(str(author).strip())  # shared by all caches of the author
         self._author = author
 
     @property
@@ -504,7 +604,7 @@ class Cache(object):
 
         self._attributes = {}
         for name, allowed in attributes.items():
-            name = name.strip().lower()
+            name = sys.intern(name.strip().lower())
             if name in self._possible_attributes:
                 self._attributes[name] = allowed
             else:
@@ -606,6 +706,17 @@ class Cache(object):
     def _logbook_token(self, logbook_token):
         self.__logbook_token = logbook_token
 
+    @property
+    def _has_logbook_token(self):
+        """Whether the logbook token is known, checked without lazy loading.
+
+        :type: :class:`bool`
+        """
+        try:
+            return self.__logbook_token is not None
+        except AttributeError:
+            return False
+
     @property
     @lazy_loaded
     def _trackable_page_url(self):
@@ -619,12 +730,15 @@ class Cache(object):
     def _trackable_page_url(self, trackable_page_url):
         self.__trackable_page_url = trackable_page_url
 
-    def load(self):
+    def load(self, *, partial=True):
         """Load all possible cache details.
 
         Use full cache details page. Therefore all possible properties are filled in, but the
         loading is a bit slow.
 
+        By default, only the page regions containing cache details are parsed, which saves a lot
+        of time and memory. Use :code:`partial=False` to parse the whole page.
+
         If you want to load basic details about a PM only cache, the :class:`.PMOnlyException` is
         still thrown, but avaliable details are filled in. If you know, that the cache you are
         loading is PM only, please consider using :meth:`load_quick` as it will load the same
@@ -634,22 +748,47 @@ class Cache(object):
            This method is called automatically when you access a property which isn't yet filled in
            (so-called "lazy loading"). You don't have to call it explicitly.
 
+        :param bool partial: Whether to parse only the page regions containing cache details.
         :raise .PMOnlyException: If cache is PM only and current user is basic member.
         :raise .LoadError: If cache loading fails (probably because of not existing cache).
         """
-        try:
-            # pick url based on what info we have right now
-            if hasattr(self, "url"):
-                root = self.geocaching._request(self.url)
-            elif hasattr(self, "_wp"):
-                root = self.geocaching._request(self._urls["cache_details"],
-                                                params={"wp": self._wp})
+        check_synchronous(self.geocaching, "load_cache")
+        with self.geocaching._span("Cache.load", getattr(self, "_wp", None)):
+            url, params = self._get_details_url()
+            if partial:
+                from pycaching.strainers import CacheDetailsStrainer  # imports bs4
+                parse_only = CacheDetailsStrainer()
             else:
-                raise errors.LoadError("Cache lacks info for loading")
-        except errors.Error as e:
-            # probably 404 during cache loading - cache does not exist
-            raise errors.LoadError("Error in loading cache") from e
+                parse_only = None
+            try:
+                root = self.geocaching._request(url, params=params, parse_only=parse_only)
+            except errors.Error as e:
+                # probably 404 during cache loading - cache does not exist
+                raise errors.LoadError("Error in loading cache") from e
+
+            self._parse_details_page(root)
+            self.geocaching._store_snapshot(self, self.wp)
+
+    def _get_details_url(self):
+        """Return URL and query parameters of cache details page.
 
+        :raise .LoadError: If there is not enough info to load the cache.
+        """
+        # pick url based on what info we have right now
+        if hasattr(self, "url"):
+            return self.url, None
+        elif hasattr(self, "_wp"):
+            return self._urls["cache_details"], {"wp": self._wp}
+        else:
+            raise errors.LoadError("Cache lacks info for loading")
+
+    def _parse_details_page(self, root):
+        """Fill in cache details from parsed cache details page.
+
+        :param bs4.BeautifulSoup root: Parsed cache details page.
+        :raise .PMOnlyException: If cache is PM only and current user is basic member.
+        :raise .LoadError: If the page does not contain cache details.
+        """
         # check for PM only caches if using free account
         self.pm_only = root.find("section", "premium-upgrade-widget") is not None
 
@@ -708,7 +847,7 @@ class Cache(object):
         attributes_widget, inventory_widget, *_ = root.find_all("div", "CacheDetailNavigationWidget")
 
         hidden = cache_details.find("div", "minorCacheDetails").find_all("div")[1].text
-        self.hidden = parse_date(hidden.split(":")[-1])
+        self.hidden = self.geocaching._date_parser.parse(hidden.split(":")[-1])
 
         self.location = Point.from_string(root.find(id="uxLatLon").text)
 
@@ -738,6 +877,7 @@ class Cache(object):
         else:
             self.favorites = 0
 
+        from bs4.element import Script  # bs4 is imported only when pages are parsed
         js_content = "\n".join(root.find_all(string=lambda i: isinstance(i, Script)))
         self._logbook_token = re.findall("userToken\\s*=\\s*'([^']+)'", js_content)[0]
         # find original location if any
@@ -771,10 +911,19 @@ class Cache(object):
 
         :raise .LoadError: If cache loading fails (probably because of not existing cache).
         """
-        res = self.geocaching._request(self._urls["tiles_server"],
-                                       params={"i": self.wp},
-                                       expect="json")
-
+        check_synchronous(self.geocaching, "load_cache")
+        with self.geocaching._span("Cache.load_quick", self.wp):
+            res = self.geocaching._request(self._urls["tiles_server"],
+                                           params={"i": self.wp},
+                                           expect="json")
+            self._parse_map_details(res)
+
+    def _parse_map_details(self, res):
+        """Fill in basic cache details from map tooltip data.
+
+        :param dict res: JSON returned by map details endpoint.
+        :raise .LoadError: If the data does not contain the cache.
+        """
         if res["status"] == "failed" or len(res["data"]) != 1:
             msg = res["msg"] if "msg" in res else "Unknown error (probably not existing cache)"
             raise errors.LoadError("Cache {} cannot be loaded: {}".format(self, msg))
@@ -788,7 +937,7 @@ class Cache(object):
         self.size = Size.from_string(data["container"]["text"])
         self.difficulty = data["difficulty"]["text"]
         self.terrain = data["terrain"]["text"]
-        self.hidden = parse_date(data["hidden"])
+        self.hidden = self.geocaching._date_parser.parse(data["hidden"])
         self.author = data["owner"]["text"]
         self.favorites = int(data["fp"])
         self.pm_only = data["subrOnly"]
@@ -808,13 +957,23 @@ class Cache(object):
 
         :raise .PMOnlyException: If the PM only warning is shown on the page
         """
-        # If GUID has not yet been set, load it using the "tiles_server"
-        # utilizing `load_quick()`
-        if not self.guid:
-            self.load_quick()
+        check_synchronous(self.geocaching, "load_cache")
+        with self.geocaching._span("Cache.load_by_guid", getattr(self, "_wp", None)):
+            # If GUID has not yet been set, load it using the "tiles_server"
+            # utilizing `load_quick()`
+            if not self.guid:
+                self.load_quick()
+
+            res = self.geocaching._request(self._urls["print_page"],
+                                           params={"guid": self.guid})
+            self._parse_print_page(res)
+
+    def _parse_print_page(self, res):
+        """Fill in cache details from parsed print page.
 
-        res = self.geocaching._request(self._urls["print_page"],
-                                       params={"guid": self.guid})
+        :param bs4.BeautifulSoup res: Parsed print page.
+        :raise .PMOnlyException: If the PM only warning is shown on the page
+        """
         if res.find("p", "Warning") is not None:
             raise errors.PMOnlyException()
         content = res.find(id="Content")
@@ -838,10 +997,10 @@ class Cache(object):
         # TODO do NOT use English phrases like "Placed by" to search for attributes
 
         self.author = content.find(
-            "p", text=re.compile("Placed by:")).text.split("\r\n")[2].strip()
+            "p", text=re.compile("Placed by:")).text.splitlines()[2].strip()
 
         hidden_p = content.find("p", text=re.compile("Placed Date:"))
-        self.hidden = hidden_p.text.replace("Placed Date:", "").strip()
+        self.hidden = self.geocaching._date_parser.parse(hidden_p.text.replace("Placed Date:", ""))
 
         attr_img = content.find_all("img", src=re.compile("\/attributes\/"))
         attributes_raw = [
@@ -961,55 +1120,117 @@ class Cache(object):
         :param int per_page: Logs per page (used to calculate start index).
         :raise .LoadError: If loading fails.
         """
-        res = self.geocaching._request(self._urls["logbook"], params={
+        res = self.geocaching._request(self._urls["logbook"], params=self._logbook_params(page, per_page),
+                                       expect="json")
+        return self._parse_logbook_page(res)
+
+    def _logbook_params(self, page, per_page):
+        """Return query parameters for loading one page from logbook."""
+        return {
             "tkn": self._logbook_token,  # will trigger lazy_loading if needed
             "idx": int(page) + 1,  # Groundspeak indexes this from 1 (OMG..)
             "num": int(per_page),
             "decrypt": "true"
-        }, expect="json")
+        }
+
+    @staticmethod
+    def _parse_logbook_page(res):
+        """Return a list of raw log data from logbook page JSON.
 
+        :raise .LoadError: If logbook page contains an error.
+        """
         if res["status"] != "success":
             error_msg = res["msg"] if "msg" in res else "Unknown error"
             raise errors.LoadError("Logbook cannot be loaded: {}".format(error_msg))
 
         return res["data"]
 
-    def load_logbook(self, limit=float("inf")):
+    def load_logbook(self, limit=float("inf"), *, workers=4, since=None):
         """Return a generator of logs for this cache.
 
         Yield instances of :class:`.Log` filled with log data.
 
+        The number of logbook pages is determined from :attr:`log_counts`, so the pages can be
+        loaded concurrently by a pool of worker threads. Logs are still yielded in logbook order.
+
+        If `since` is given, only new logs are generated and the loading stops at the first
+        already known log. Pages are loaded one by one in such case, as usually only a few of them
+        are needed. See also :class:`.LogbookCheckpoints`.
+
         :param int limit: Maximum number of logs to generate.
+        :param int workers: Maximum number of concurrently loaded logbook pages.
+        :param since: ID of the newest known log (:class:`int`) or a date (:class:`datetime.date`),
+            logs created before it are considered known.
         """
+        if workers < 1:
+            raise errors.ValueError("At least one worker is needed.")
+        check_synchronous(self.geocaching, "load_logbook")
+        if limit <= 0:
+            return
+
         logging.info("Loading logbook for {}...".format(self))
 
-        page = 0
         per_page = min(limit, 100)  # max number to fetch in one request is 100 items
 
-        while True:
-            # get one page
-            logbook_page = self._logbook_get_page(page, per_page)
-            page += 1
-
-            if not logbook_page:
-                # result is empty - no more logs
-                return
-
-            for log_data in logbook_page:
-
-                limit -= 1  # handle limit
-                if limit < 0:
-                    return
-
-                img_filename = log_data["LogTypeImage"].rsplit(".", 1)[0]  # filename w/o extension
-
-                # create and fill log object
-                l = Log()
-                l.type = LogType.from_filename(img_filename)
-                l.text = log_data["LogText"]
-                l.visited = log_data["Visited"]
-                l.author = log_data["UserName"]
-                yield l
+        # trigger lazy loading here, not in worker threads
+        self._logbook_token
+        log_count = sum(self.log_counts.values())
+        expected_pages = math.ceil(min(limit, log_count) / per_page)
+        if since is not None:
+            expected_pages = min(expected_pages, 1)
+            if isinstance(since, datetime.datetime):
+                since = since.date()
+
+        date_parser = self.geocaching._date_parser
+        page = received = 0
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    while len(pending) < workers and page < expected_pages:
+                        pending.append(executor.submit(self._logbook_get_page, page, per_page))
+                        page += 1
+
+                    if pending:
+                        logbook_page = pending.popleft().result()
+                    elif received >= log_count or since is not None:
+                        # the last page was full, so there may be more logs than expected (log counts
+                        # are outdated), or new logs are searched for - continue one by one
+                        logbook_page = self._logbook_get_page(page, per_page)
+                        page += 1
+                    else:
+                        # all logs were loaded, no need to request an empty page
+                        return
+                    received += len(logbook_page)
+
+                    # dates of a whole page are parsed at once, they are in user's date format
+                    created = date_parser.parse_many(log_data["Created"] for log_data in logbook_page)
+                    visited = date_parser.parse_many(log_data["Visited"] for log_data in logbook_page)
+
+                    for log_data, log_created, log_visited in zip(logbook_page, created, visited):
+
+                        limit -= 1  # handle limit
+                        if limit < 0:
+                            return
+
+                        log = Log._from_logbook_data(log_data, created=log_created, visited=log_visited)
+                        if since is not None:
+                            if isinstance(since, datetime.date):
+                                known = log.created < since
+                            else:
+                                known = log.id <= since
+                            if known:
+                                return
+
+                        yield log
+
+                    if limit == 0 or len(logbook_page) < per_page:
+                        # limit reached or page is not full - no more logs
+                        return
+            finally:
+                # the generator was closed early
+                for future in pending:
+                    future.cancel()
 
     # TODO: trackable list can have multiple pages - handle it in similar way as _logbook_get_page
     # for example see: http://www.geocaching.com/geocache/GC26737_geocaching-jinak-tb-gc-hrbitov
@@ -1020,6 +1241,7 @@ class Cache(object):
 
         :param int limit: Maximum number of trackables to generate.
         """
+        check_synchronous(self.geocaching)
         logging.info("Loading trackables for {}...".format(self))
         self.trackables = []
 
@@ -1058,6 +1280,7 @@ class Cache(object):
         :return: Tuple of data nescessary to log the cache.
         :rtype: :class:`tuple` of (:class:`set`:, :class:`dict`, class:`str`)
         """
+        check_synchronous(self.geocaching)
         log_page = self.geocaching._request(self._get_log_page_url())
 
         # find all valid log types for the cache
@@ -1088,8 +1311,9 @@ class Cache(object):
         post["LogText"] = log.text
 
         self.geocaching._request(self._get_log_page_url(), method="POST", data=post)
+        self.geocaching._forget_snapshot(Cache, self.wp)
 
-        self.found_status = log
+        self._found_status = log
 
 
 class Waypoint(object):
@@ -1101,7 +1325,12 @@ class Waypoint(object):
        :param Point location: waypoint coordinates
        :param str note: Information about the waypoint
     """
+
+    __slots__ = ("_identifier", "_type", "_location", "_note")
+
     def __init__(self, id=None, type=None, location=None, note=None):
+        if type is not None:
+            type = sys.intern(type)
         self._identifier = id
         self._type = type
         self._location = location
@@ -1120,24 +1349,45 @@ class Waypoint(object):
         waypoints_table = soup.find('table', id=table_id)
         if waypoints_table:
             waypoints_table = waypoints_table.find_all("tr")
+            rows = []
             for r1, r2 in zip(waypoints_table[1::2], waypoints_table[2::2]):
                 columns = r1.find_all("td") + r2.find_all("td")
                 identifier = columns[3].text.strip()
                 type = columns[1].find("img").get("title")
                 location_string = columns[5].text.strip()
-                try:
-                    loc = Point(location_string)
-                except ValueError:
-                    loc = None
+                note = columns[8].text.strip()
+                rows.append((identifier, type, location_string, note))
+
+            locations = coordinates.parse_many(row[2] for row in rows)
+            for (identifier, type, location_string, note), location in zip(rows, locations):
+                if location is None:
                     logging.debug("No valid location format in waypoint {}: {}".format(
                         identifier, location_string))
-                note = columns[8].text.strip()
-                waypoints_dict[identifier] = cls(identifier, type, loc, note)
+                else:
+                    location = Point(*location)
+                waypoints_dict[identifier] = cls(identifier, type, location, note)
         return waypoints_dict
 
     def __str__(self):
         return self.identifier
 
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Return a waypoint from a snapshot created by :meth:`to_snapshot`."""
+        location = snapshot["location"]
+        location = Point(*location) if location is not None else None
+        return cls(snapshot["id"], snapshot["type"], location, snapshot["note"])
+
+    def to_snapshot(self):
+        """Return a snapshot of the waypoint, which can be serialized to JSON.
+
+        :rtype: :class:`dict`
+        """
+        location = None
+        if self._location is not None:
+            location = [self._location.latitude, self._location.longitude]
+        return {"id": self._identifier, "type": self._type, "location": location, "note": self._note}
+
     @property
     def identifier(self):
         """The waypoint unique identifier.
@@ -1160,7 +1410,7 @@ class Waypoint(object):
 
     @type.setter
     def type(self, type):
-        self._type = type
+        self._type = sys.intern(type)
 
     @property
     def location(self):
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+import json
+import math
+import threading
+
+from pycaching import errors
+from pycaching.cache import Cache
+
+# mean Earth radius in meters, distances are computed on a sphere
+_earth_radius = 6371008.8
+
+
+def _central_angle(phi1, lam1, cos_phi1, phi2, lam2, cos_phi2):
+    """Return angle between two points (in radians) by haversine formula."""
+    h = math.sin((phi2 - phi1) / 2) ** 2 + cos_phi1 * cos_phi2 * math.sin((lam2 - lam1) / 2) ** 2
+    return 2 * math.asin(math.sqrt(min(h, 1.0)))
+
+
+class CacheIndex(object):
+    """Spatial index of caches for fast nearest, radius and rectangle queries.
+
+    Caches are put into a grid of cells by their :attr:`.Cache.location`, so a query examines only
+    caches in the cells near the queried area instead of all of them. Distances are great-circle
+    distances in meters on a sphere with the mean Earth radius, so they can differ from
+    :mod:`geopy` geodesic distances by up to 0.5 %.
+
+    Caches are indexed by their waypoints, adding a cache with an already indexed waypoint replaces
+    the old one. The index can be saved to a file by :meth:`save` and loaded back by :meth:`load`.
+    """
+
+    def __init__(self, caches=(), *, cell_size=0.1):
+        """Create an index.
+
+        :param caches: Iterable of :class:`.Cache` objects to index.
+        :param float cell_size: Size of grid cells in degrees. Best performance is achieved, when
+            typical queries cover a few cells.
+        """
+        if not 0 < cell_size <= 180:
+            raise errors.ValueError("Cell size must be in range (0, 180].")
+        self.cell_size = cell_size
+        self._lock = threading.Lock()
+        self._entries = {}  # {wp: (cache, latitude, longitude, phi, lambda, cos(phi), cell)}
+        self._cells = {}  # {(row, column): {wp: entry}}
+        self.update(caches)
+
+    def _cell(self, latitude, longitude):
+        return int((latitude + 90) // self.cell_size), int((longitude + 180) // self.cell_size)
+
+    def add(self, cache):
+        """Add a cache to the index.
+
+        :param .Cache cache: Cache with a known location, it is not loaded.
+        :raise .ValueError: If the cache location is not known.
+        """
+        location = getattr(cache, "_location", None)  # avoid lazy loading
+        if location is None:
+            raise errors.ValueError("Cache {} has no location.".format(cache.wp))
+        latitude, longitude = location.latitude, location.longitude
+        phi, lam = math.radians(latitude), math.radians(longitude)
+        cell = self._cell(latitude, longitude)
+        entry = cache, latitude, longitude, phi, lam, math.cos(phi), cell
+
+        with self._lock:
+            self._remove(cache.wp)
+            self._entries[cache.wp] = entry
+            self._cells.setdefault(cell, {})[cache.wp] = entry
+
+    def update(self, caches):
+        """Add many caches to the index, see :meth:`add`."""
+        for cache in caches:
+            self.add(cache)
+
+    def remove(self, cache):
+        """Remove a cache from the index.
+
+        :param cache: :class:`.Cache` or its waypoint.
+        :raise KeyError: If the cache is not indexed.
+        """
+        wp = cache.wp if isinstance(cache, Cache) else str(cache).upper().strip()
+        with self._lock:
+            if not self._remove(wp):
+                raise KeyError(wp)
+
+    def _remove(self, wp):
+        entry = self._entries.pop(wp, None)
+        if entry is None:
+            return False
+        cell = self._cells[entry[6]]
+        del cell[wp]
+        if not cell:
+            del self._cells[entry[6]]
+        return True
+
+    def __len__(self):
+        """Return number of indexed caches."""
+        return len(self._entries)
+
+    def __contains__(self, cache):
+        """Return if a cache (:class:`.Cache` or its waypoint) is indexed."""
+        wp = cache.wp if isinstance(cache, Cache) else str(cache).upper().strip()
+        return wp in self._entries
+
+    def __iter__(self):
+        """Iterate over indexed caches."""
+        with self._lock:
+            caches = [entry[0] for entry in self._entries.values()]
+        return iter(caches)
+
+    def _candidates(self, lat_min, lat_max, lon_intervals):
+        """Yield entries in cells overlapping given latitude and longitude intervals (in degrees)."""
+        row_min, row_max = self._cell(lat_min, 0)[0], self._cell(lat_max, 0)[0]
+        col_ranges = [(self._cell(0, lon_min)[1], self._cell(0, lon_max)[1]) for lon_min, lon_max in lon_intervals]
+        size = (row_max - row_min + 1) * sum(col_max - col_min + 1 for col_min, col_max in col_ranges)
+
+        if size > len(self._cells):
+            # the area covers more cells than there are occupied ones, check them all
+            for (row, col), cell in self._cells.items():
+                if row_min <= row <= row_max and any(col_min <= col <= col_max for col_min, col_max in col_ranges):
+                    yield from cell.values()
+        else:
+            cells = self._cells
+            for row in range(row_min, row_max + 1):
+                for col_min, col_max in col_ranges:
+                    for col in range(col_min, col_max + 1):
+                        cell = cells.get((row, col))
+                        if cell:
+                            yield from cell.values()
+
+    def _within(self, point, radius):
+        """Return sorted list of (distance, cache) for caches within a radius around point."""
+        angle = radius / _earth_radius
+        phi, lam = math.radians(point.latitude), math.radians(point.longitude)
+        cos_phi = math.cos(phi)
+
+        if angle >= math.pi:
+            candidates = self._entries.values()
+        else:
+            # bounding box of the circle, see http://janmatuschek.de/LatitudeLongitudeBoundingCoordinates
+            lat_min, lat_max = point.latitude - math.degrees(angle), point.latitude + math.degrees(angle)
+            if lat_min <= -90 or lat_max >= 90:
+                lon_intervals = [(-180, 180)]  # circle contains a pole
+            else:
+                delta = math.degrees(math.asin(math.sin(angle) / cos_phi))
+                lon_min, lon_max = point.longitude - delta, point.longitude + delta
+                if lon_min < -180:
+                    lon_intervals = [(lon_min + 360, 180), (-180, lon_max)]
+                elif lon_max > 180:
+                    lon_intervals = [(lon_min, 180), (-180, lon_max - 360)]
+                else:
+                    lon_intervals = [(lon_min, lon_max)]
+            candidates = self._candidates(max(lat_min, -90), min(lat_max, 90), lon_intervals)
+
+        found = []
+        for cache, _, _, phi2, lam2, cos_phi2, _ in candidates:
+            distance = _central_angle(phi, lam, cos_phi, phi2, lam2, cos_phi2) * _earth_radius
+            if distance <= radius:
+                found.append((distance, cache))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def within(self, point, radius):
+        """Return caches within a radius around a point.
+
+        :param .Point point: Center of the area.
+        :param float radius: Radius in meters.
+        :return: List of :class:`.Cache` objects sorted by distance from the point.
+        :rtype: :class:`list`
+        """
+        with self._lock:
+            return [cache for _, cache in self._within(point, radius)]
+
+    def nearest(self, point, k=1):
+        """Return caches nearest to a point.
+
+        :param .Point point: Examined point.
+        :param int k: Number of caches to return.
+        :return: List of at most `k` :class:`.Cache` objects sorted by distance from the point.
+        :rtype: :class:`list`
+        """
+        radius = math.radians(self.cell_size) * _earth_radius
+        with self._lock:
+            k = min(k, len(self._entries))
+            if k <= 0:
+                return []
+            while True:
+                # all caches within the radius are found, so if there are enough of them, the
+                # nearest ones are among them
+                found = self._within(point, radius)
+                if len(found) >= k:
+                    return [cache for _, cache in found[:k]]
+                # the more caches are missing, the farther they probably are
+                radius *= 2 * math.sqrt(k / max(len(found), 1))
+
+    def in_rectangle(self, rectangle):
+        """Return caches inside a rectangle (including its border).
+
+        :param .Rectangle rectangle: Examined area.
+        :return: List of :class:`.Cache` objects.
+        :rtype: :class:`list`
+        """
+        lats = [p.latitude for p in rectangle.points]
+        lons = [p.longitude for p in rectangle.points]
+        lat_min, lat_max, lon_min, lon_max = min(lats), max(lats), min(lons), max(lons)
+        with self._lock:
+            return [cache for cache, latitude, longitude, *_ in self._candidates(lat_min, lat_max, [(lon_min, lon_max)])
+                    if lat_min <= latitude <= lat_max and lon_min <= longitude <= lon_max]
+
+    def save(self, file):
+        """Save the index with snapshots of indexed caches (see :meth:`.Cache.to_snapshot`) as JSON.
+
+        :param file: Path to the output file or a file object opened for writing in text mode.
+        """
+        with self._lock:
+            data = {"cell_size": self.cell_size,
+                    "caches": [entry[0].to_snapshot() for entry in self._entries.values()]}
+        if hasattr(file, "write"):
+            json.dump(data, file)
+        else:
+            with open(file, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+    @classmethod
+    def load(cls, geocaching, file):
+        """Load an index saved by :meth:`save`.
+
+        :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance (passed to caches).
+        :param file: Path to the input file or a file object opened for reading in text mode.
+        :raise .LoadError: If the file is not a saved index.
+        """
+        try:
+            if hasattr(file, "read"):
+                data = json.load(file)
+            else:
+                with open(file, encoding="utf-8") as f:
+                    data = json.load(f)
+            snapshots, cell_size = data["caches"], data["cell_size"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise errors.LoadError("Cannot load cache index.") from e
+        return cls((Cache.from_snapshot(geocaching, snapshot) for snapshot in snapshots), cell_size=cell_size)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import sqlite3
+import threading
+
+from pycaching import errors
+
+
+class LogbookCheckpoints(object):
+    """Store of the newest known log per cache, used for incremental logbook loading.
+
+    Checkpoints are kept in memory. If a database path is given, they are also stored on disk, so
+    they survive between program runs.
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            wp TEXT PRIMARY KEY,
+            log_id INTEGER NOT NULL
+        )
+    """
+
+    def __init__(self, path=None):
+        """Create or open a checkpoint store.
+
+        :param str path: Path to the SQLite database file. Checkpoints are kept only in memory if
+            not given.
+        """
+        self._lock = threading.Lock()
+        self._checkpoints = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(self._schema)
+                self._checkpoints.update(self._db.execute("SELECT wp, log_id FROM checkpoints"))
+
+    def get(self, wp):
+        """Return ID of the newest known log of a cache or :code:`None`.
+
+        :param str wp: Cache waypoint.
+        """
+        return self._checkpoints.get(wp.upper())
+
+    def set(self, wp, log_id):
+        """Record ID of the newest known log of a cache.
+
+        :param str wp: Cache waypoint.
+        :param int log_id: Log ID.
+        """
+        wp, log_id = wp.upper(), int(log_id)
+        with self._lock:
+            self._checkpoints[wp] = log_id
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (wp, log_id))
+
+    def load_new_logs(self, cache, **kwargs):
+        """Return a generator of logs added to cache logbook since the last call.
+
+        Yield logs newer than the checkpoint of this cache (or whole logbook, if there is no
+        checkpoint yet) using :meth:`.Cache.load_logbook`. The checkpoint is moved to the newest
+        log once the generator is exhausted, so logs are not lost if the iteration is interrupted.
+
+        :param .Cache cache: Cache to load logs for.
+        :param kwargs: Other arguments passed to :meth:`.Cache.load_logbook`, except `limit`.
+        :raise .ValueError: If `limit` is given, as the logs cut off by it would be skipped by the
+            moved checkpoint.
+        """
+        if "limit" in kwargs:
+            raise errors.ValueError("Limit cannot be used with checkpoints, new logs would be lost.")
+        return self._load_new_logs(cache, **kwargs)
+
+    def _load_new_logs(self, cache, **kwargs):
+        newest = since = self.get(cache.wp)
+        for log in cache.load_logbook(since=since, **kwargs):
+            newest = log.id if newest is None else max(newest, log.id)
+            yield log
+
+        if newest != since:
+            self.set(cache.wp, newest)
+
+    def __len__(self):
+        return len(self._checkpoints)
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
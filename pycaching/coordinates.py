@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+import functools
+import re
+
+from pycaching import errors
+
+_degrees = r"(\d{1,3})"
+_minutes_int = r"(\d{1,2})"
+_minutes = r"(\d+[.,]\d+)"
+_seconds = r"(\d+(?:[.,]\d+)?)"
+_decimal = r"(\d+(?:[.,]\d+)?)"
+
+_marks = "°º˚'′\"″"
+_part_sep = r"[\s{}:]+".format(_marks)
+
+
+def _axis_pattern(letters, first, *rest):
+    """Return a regex of one axis: hemisphere letter, sign and the parts (each part is a group).
+
+    Hemisphere letter can be placed before the whole axis, right after degrees or at the end.
+    """
+    pattern = r"([{0}])?\s*([-+]?)\s*{1}\s*([{0}])?".format(letters, first)
+    for part in rest:
+        pattern += _part_sep + part
+    return pattern + r"[\s{}]*([{}])?".format(_marks, letters)
+
+
+def _grammar(*parts):
+    """Compile a regex matching latitude and longitude, each made of the given parts."""
+    return re.compile(
+        r"\s*" + _axis_pattern("NSns", *parts)
+        + r"(?:[\s{0}:,;/]+|(?<=[NSns]))".format(_marks)  # separator may be only the letter
+        + _axis_pattern("EWew", *parts)
+        + r"(?![\s{}]*\d)".format(_marks))  # no more numbers may follow
+
+
+# Only one of them can match a string, the most common one is tried first.
+_ddm = _grammar(_degrees, _minutes)  # N 49° 45.123 E 013° 22.123
+_dms = _grammar(_degrees, _minutes_int, _seconds)  # 49° 45' 7.38" N 13° 22' 7.38" E
+_dd = _grammar(_decimal)  # 49.75205, 13.36872
+
+
+_negative = frozenset("SsWw-")
+
+
+def _minutes_value(raw):
+    value = float(raw.replace(",", "."))
+    if value >= 60:
+        raise ValueError("Minutes and seconds must be less than 60.")
+    return value
+
+
+# Functions returning signed decimal degrees of one axis from its regex groups.
+
+def _ddm_axis(letter, sign, degrees, letter_deg, minutes, letter_end):
+    value = round(int(degrees) + _minutes_value(minutes) / 60, 5)
+    return -value if sign in _negative or letter in _negative or letter_deg in _negative \
+        or letter_end in _negative else value
+
+
+def _dms_axis(letter, sign, degrees, letter_deg, minutes, seconds, letter_end):
+    value = int(degrees) + _minutes_value(minutes) / 60 + _minutes_value(seconds) / 3600
+    return -value if sign in _negative or letter in _negative or letter_deg in _negative \
+        or letter_end in _negative else value
+
+
+def _dd_axis(letter, sign, degrees, letter_deg, letter_end):
+    value = float(degrees.replace(",", "."))
+    return -value if sign in _negative or letter in _negative or letter_deg in _negative \
+        or letter_end in _negative else value
+
+
+_grammars = (
+    (_ddm, _ddm_axis, 6),
+    (_dms, _dms_axis, 7),
+    (_dd, _dd_axis, 5),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse(string):
+    """Return latitude and longitude in decimal degrees parsed from a string.
+
+    Coordinates in degrees and decimal minutes (the format used on geocaching.com), degrees,
+    minutes and seconds or decimal degrees are recognized. The parsing is lenient, example
+    inputs are:
+
+    - :code:`N 49° 45.123 E 013° 22.123`
+    - :code:`S 36 51.918 E 174 46.725`
+    - :code:`49N 45,123 013E 22,123`
+    - :code:`49°45'7.38"N 13°22'7.38"E`
+    - :code:`-49.75205, 13.36872`
+
+    Results in degrees and decimal minutes are rounded to 5 decimal places. Results of repeated
+    strings are cached.
+
+    :param str string: Coordinates to parse.
+    :return: Tuple of latitude and longitude.
+    :rtype: :class:`tuple` of :class:`float`
+    :raise .ValueError: If string cannot be parsed as coordinates.
+    """
+    for grammar, axis, size in _grammars:
+        m = grammar.match(string)
+        if m:
+            break
+    else:
+        raise errors.ValueError("Unknown coordinates format - '{}'.".format(string))
+
+    groups = m.groups()
+    try:
+        latitude, longitude = axis(*groups[:size]), axis(*groups[size:])
+    except ValueError as e:
+        raise errors.ValueError("Invalid coordinates - '{}'.".format(string)) from e
+
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise errors.ValueError("Coordinates out of range - '{}'.".format(string))
+    return latitude, longitude
+
+
+def parse_many(strings, *, strict=False):
+    """Parse many coordinates at once, see :func:`parse`.
+
+    :param strings: Iterable of coordinates to parse.
+    :param bool strict: Whether to raise an error for unparseable coordinates instead of returning
+        :code:`None` for them.
+    :return: List of tuples of latitude and longitude (or :code:`None`) in the same order.
+    :rtype: :class:`list`
+    :raise .ValueError: If some string cannot be parsed and :code:`strict` is set.
+    """
+    if strict:
+        return [parse(string) for string in strings]
+
+    result = []
+    for string in strings:
+        try:
+            result.append(parse(string))
+        except errors.ValueError:
+            result.append(None)
+    return result
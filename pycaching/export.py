@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+import gzip
+import io
+import json
+import logging
+from xml.sax.saxutils import escape, quoteattr
+
+from pycaching import errors
+from pycaching.cache import Cache, Waypoint
+from pycaching.log import Log
+
+# cache properties, which can be requested by `fields`, mapped to their snapshot keys
+_fields = {"found" if name == "found_status" else name: name for name in Cache._snapshot_attributes
+           if name not in ("logbook_token", "trackable_page_url")}
+
+# Groundspeak names of cache types, keyed by values of :class:`.cache.Type`
+_cache_types = {
+    "2": "Traditional Cache",
+    "3": "Multi-cache",
+    "8": "Unknown Cache",
+    "5": "Letterbox Hybrid",
+    "6": "Event Cache",
+    "453": "Mega-Event Cache",
+    "7005": "Giga-Event Cache",
+    "137": "Earthcache",
+    "13": "Cache In Trash Out Event",
+    "11": "Webcam Cache",
+    "4": "Virtual Cache",
+    "1858": "Wherigo Cache",
+    "3653": "Lost and Found Event Cache",
+    "9": "Project APE Cache",
+    "3773": "Groundspeak HQ",
+    "1304": "GPS Adventures Exhibit",
+    "4738": "Groundspeak Block Party",
+    "12": "Locationless (Reverse) Cache",
+    "3774": "Groundspeak Lost and Found Celebration",
+}
+
+# Groundspeak names of log types, keyed by values of :class:`.log.Type`
+_log_types = {
+    "74": "Announcement",
+    "5": "Archive",
+    "10": "Attended",
+    "3": "Didn't find it",
+    "48": "Discovered It",
+    "23": "Enable Listing",
+    "2": "Found it",
+    "19": "Grab It (Not from a Cache)",
+    "16": "Mark Missing",
+    "7": "Needs Archived",
+    "45": "Needs Maintenance",
+    "4": "Write note",
+    "83": "OC Team Comment",
+    "46": "Owner Maintenance",
+    "14": "Dropped Off",
+    "18": "Post Reviewer Note",
+    "24": "Publish Listing",
+    "25": "Retract Listing",
+    "13": "Retrieve It from a Cache",
+    "76": "Submit for Review",
+    "22": "Temporarily Disable Listing",
+    "12": "Unarchive",
+    "47": "Update Coordinates",
+    "75": "Visit",
+    "11": "Webcam Photo Taken",
+    "9": "Will Attend",
+}
+
+
+def _cache_id(wp):
+    """Return numeric cache ID computed from its GC code."""
+    code = wp[2:]
+    if len(code) <= 3 or (len(code) == 4 and code[0] in "0123456789ABCDEF"):
+        return int(code, 16)
+    alphabet = "0123456789ABCDEFGHJKMNPQRTVWXYZ"
+    number = 0
+    for char in code:
+        number = number * 31 + alphabet.index(char)
+    return number - 411120
+
+
+class Exporter(object):
+    """Base class of streaming exporters.
+
+    Exporters write :class:`.Cache`, :class:`.Waypoint` and :class:`.Log` objects one by one, as
+    they are passed to :meth:`write`, so any number of objects can be exported using constant
+    memory. Waypoints and logs belong to the cache written before them.
+
+    Exporters can be used as context managers, which call :meth:`close` at the end.
+    """
+
+    #: Cache properties which are always exported, because the output format requires them.
+    required_fields = ()
+
+    def __init__(self, file, *, fields=None, compress=None):
+        """Create an exporter.
+
+        :param file: Path to the output file or a file object opened for writing (in text mode,
+            binary if `compress` is :code:`True`).
+        :param fields: Names of cache properties to export, missing ones are loaded. If not given,
+            all already loaded properties are exported and nothing is loaded. If a cache cannot be
+            loaded, its already known properties are exported.
+        :param bool compress: Whether to compress the output by gzip. By default, paths ending with
+            :code:`.gz` are compressed.
+        :raise .ValueError: If an unknown cache property is requested.
+        """
+        if fields is not None:
+            fields = set(fields)
+            unknown = fields - set(_fields)
+            if unknown:
+                raise errors.ValueError("Unknown cache properties: {}.".format(", ".join(sorted(unknown))))
+            fields.update(self.required_fields)
+        self.fields = fields
+        self._cache_wp = None  # the last written cache, following waypoints and logs belong to it
+
+        if not hasattr(file, "write"):
+            if compress is None:
+                compress = str(file).endswith(".gz")
+            if compress:
+                self._file = gzip.open(file, "wt", encoding="utf-8")
+            else:
+                self._file = open(file, "w", encoding="utf-8")
+            self._close_file = True
+        elif compress:
+            # closing the wrapper finishes gzip stream, but leaves the passed file open
+            self._file = io.TextIOWrapper(gzip.GzipFile(fileobj=file, mode="wb"), encoding="utf-8")
+            self._close_file = True
+        else:
+            self._file = file
+            self._close_file = False
+
+        self._start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, item):
+        """Write a single cache, waypoint or log.
+
+        :raise .ValueError: If the item cannot be exported.
+        """
+        if isinstance(item, Cache):
+            self._write_cache(item)
+            self._cache_wp = item.wp
+        elif isinstance(item, Waypoint):
+            self._write_waypoint(item)
+        elif isinstance(item, Log):
+            self._write_log(item)
+        else:
+            raise errors.ValueError("Cannot export {!r}.".format(item))
+
+    def write_all(self, items):
+        """Write all caches, waypoints and logs from an iterable, eg. a search result."""
+        for item in items:
+            self.write(item)
+
+    def close(self):
+        """Finish the output and close the file, if opened by the exporter."""
+        if self._file is None:
+            return
+        self._end()
+        if self._close_file:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+    def _cache_snapshot(self, cache):
+        """Return snapshot of cache properties to export, loading only the requested ones."""
+        fields = self.fields if self.fields is not None else self.required_fields
+        # check the slots directly, lazy loading would load the cache again for each missing property
+        if not all(hasattr(cache, Cache._snapshot_attributes[_fields[name]]) for name in fields):
+            try:
+                cache.load()  # properties still missing after that are not available for this cache
+            except errors.Error as e:
+                logging.warning("Cache {} cannot be loaded, exporting known properties only: {!r}".format(cache, e))
+
+        snapshot = cache.to_snapshot()
+        if self.fields is None:
+            return snapshot
+        keys = {_fields[name] for name in self.fields}
+        return {key: value for key, value in snapshot.items() if key in keys or key == "wp"}
+
+    def _start(self):
+        """Write beginning of the output."""
+
+    def _end(self):
+        """Write end of the output."""
+
+    def _write_cache(self, cache):
+        raise NotImplementedError()
+
+    def _write_waypoint(self, waypoint):
+        raise NotImplementedError()
+
+    def _write_log(self, log):
+        raise NotImplementedError()
+
+
+class JSONLExporter(Exporter):
+    """Exporter writing one JSON object per line.
+
+    Each object contains an :code:`object` key (:code:`cache`, :code:`waypoint` or :code:`log`)
+    and a snapshot of the exported object (see :meth:`.Cache.to_snapshot`). Waypoints and logs also
+    contain a :code:`cache` key with GC code of the cache written before them, if any.
+    """
+
+    def _write_line(self, kind, snapshot):
+        line = {"object": kind}
+        if kind != "cache" and self._cache_wp is not None:
+            line["cache"] = self._cache_wp
+        line.update(snapshot)
+        self._file.write(json.dumps(line, ensure_ascii=False))
+        self._file.write("\n")
+
+    def _write_cache(self, cache):
+        self._write_line("cache", self._cache_snapshot(cache))
+
+    def _write_waypoint(self, waypoint):
+        self._write_line("waypoint", waypoint.to_snapshot())
+
+    def _write_log(self, log):
+        self._write_line("log", log.to_snapshot())
+
+
+class GPXExporter(Exporter):
+    """Exporter writing GPX 1.1 with Groundspeak cache extensions.
+
+    Cache location is always exported, because GPX requires it. Logs are put inside the cache
+    written right before them, waypoints without location are skipped. Waypoints of a cache are
+    kept until the cache element is closed (by the next cache or the end of output), so its logs
+    can still follow them.
+    """
+
+    required_fields = ("location",)
+
+    _header = ('<?xml version="1.0" encoding="utf-8"?>\n'
+               '<gpx xmlns="http://www.topografix.com/GPX/1/1" '
+               'xmlns:groundspeak="http://www.groundspeak.com/cache/1/0/1" '
+               'version="1.1" creator="pycaching">\n')
+
+    def _start(self):
+        self._file.write(self._header)
+        self._logs_open = False
+        self._waypoints = []  # snapshots of waypoints written after the open cache
+
+    def _end(self):
+        self._end_cache()
+        self._file.write("</gpx>\n")
+
+    def _end_cache(self):
+        """Close elements of the last written cache."""
+        if self._cache_wp is None:
+            return
+        if self._logs_open:
+            self._file.write("      </groundspeak:logs>\n")
+            self._logs_open = False
+        self._file.write("    </groundspeak:cache>\n  </extensions>\n</wpt>\n")
+        self._cache_wp = None
+        for snapshot in self._waypoints:
+            self._write_waypoint_element(snapshot)
+        self._waypoints = []
+
+    def _element(self, name, value, indent=2, **attributes):
+        attributes = "".join(" {}={}".format(key, quoteattr(value)) for key, value in attributes.items())
+        self._file.write("{}<{}{}>{}</{}>\n".format(" " * indent, name, attributes, escape(str(value)), name))
+
+    def _write_cache(self, cache):
+        self._end_cache()
+        snapshot = self._cache_snapshot(cache)
+        if snapshot.get("location") is None:
+            raise errors.ValueError("Cannot export cache {} without location.".format(cache.wp))
+
+        wp = snapshot["wp"]
+        name = snapshot.get("name")
+        type = _cache_types.get(snapshot.get("type"), "Geocache")
+        found = (snapshot.get("found_status") or {}).get("type") in ("2", "10")  # found it, attended
+
+        self._file.write('<wpt lat="{:.6f}" lon="{:.6f}">\n'.format(*snapshot["location"]))
+        if snapshot.get("hidden"):
+            self._element("time", snapshot["hidden"] + "T00:00:00Z")
+        self._element("name", wp)
+        if name is not None:
+            self._element("desc", "{} by {}, {}".format(name, snapshot.get("author", "?"), type))
+        self._file.write('  <link href="https://coord.info/{}"/>\n'.format(escape(wp)))
+        self._element("sym", "Geocache Found" if found else "Geocache")
+        self._element("type", "Geocache|" + type)
+
+        self._file.write("  <extensions>\n")
+        self._file.write('    <groundspeak:cache id="{}" available="{}" archived="False">\n'.format(
+            _cache_id(wp), snapshot.get("state") is not False))
+        if name is not None:
+            self._element("groundspeak:name", name, 6)
+        if snapshot.get("author") is not None:
+            self._element("groundspeak:placed_by", snapshot["author"], 6)
+        self._element("groundspeak:type", type, 6)
+        if snapshot.get("size") is not None:
+            self._element("groundspeak:container", snapshot["size"].capitalize(), 6)
+        for key in "difficulty", "terrain":
+            if snapshot.get(key) is not None:
+                self._element("groundspeak:" + key, "{:g}".format(snapshot[key]), 6)
+        for key, element in ("summary", "short_description"), ("description", "long_description"):
+            if snapshot.get(key) is not None:
+                self._element("groundspeak:" + element, snapshot[key], 6, html="False")
+        if snapshot.get("hint") is not None:
+            self._element("groundspeak:encoded_hints", snapshot["hint"], 6)
+        # left open for the following logs
+
+        self._cache_wp = wp
+
+    def _write_waypoint(self, waypoint):
+        snapshot = waypoint.to_snapshot()
+        if snapshot["location"] is None:
+            logging.debug("Skipping waypoint {} without location".format(snapshot["id"]))
+        elif self._cache_wp is not None:
+            self._waypoints.append(snapshot)
+        else:
+            self._write_waypoint_element(snapshot)
+
+    def _write_waypoint_element(self, snapshot):
+        self._file.write('<wpt lat="{:.6f}" lon="{:.6f}">\n'.format(*snapshot["location"]))
+        self._element("name", snapshot["id"])
+        if snapshot["note"]:
+            self._element("cmt", snapshot["note"])
+        if snapshot["type"]:
+            self._element("desc", snapshot["type"])
+            self._element("sym", snapshot["type"])
+            self._element("type", "Waypoint|" + snapshot["type"])
+        self._file.write("</wpt>\n")
+
+    def _write_log(self, log):
+        if self._cache_wp is None:
+            raise errors.ValueError("Log can be exported to GPX only after its cache.")
+        if not self._logs_open:
+            self._file.write("      <groundspeak:logs>\n")
+            self._logs_open = True
+
+        snapshot = log.to_snapshot()
+        if "id" in snapshot:
+            self._file.write('        <groundspeak:log id="{}">\n'.format(snapshot["id"]))
+        else:
+            self._file.write("        <groundspeak:log>\n")
+        if "visited" in snapshot:
+            self._element("groundspeak:date", snapshot["visited"] + "T00:00:00Z", 10)
+        if "type" in snapshot:
+            self._element("groundspeak:type", _log_types.get(snapshot["type"], "Write note"), 10)
+        if "author" in snapshot:
+            self._element("groundspeak:finder", snapshot["author"], 10)
+        if "text" in snapshot:
+            self._element("groundspeak:text", snapshot["text"], 10, encoded="False")
+        self._file.write("        </groundspeak:log>\n")
@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 
+import heapq
 import math
-import re
 import logging
-import weakref
+import threading
 import itertools
+from array import array
 import geopy
 import geopy.distance
 import geopy.format
 from statistics import mean
-from collections import namedtuple
+from collections import Counter, deque, namedtuple
+from pycaching import coordinates
 from pycaching.errors import ValueError as PycachingValueError, GeocodeError, BadBlockError, Error
+from pycaching.tile_history import TileHistory
 from pycaching.util import lazy_loaded
 
 
@@ -19,12 +22,42 @@ def to_decimal(deg, min):
     return round(deg + min / 60, 5)
 
 
+# maximal latitude covered by map tiles (Web Mercator projection)
+_max_tile_latitude = 85.0511287798
+
+
+def _numpy():
+    """Return :mod:`numpy` module, or :code:`None` if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _coordinates(numpy, points):
+    """Return arrays of latitudes and longitudes of the points."""
+    points = list(points)
+    return (numpy.fromiter([p.latitude for p in points], float, len(points)),
+            numpy.fromiter([p.longitude for p in points], float, len(points)))
+
+
+def _unwrap(longitudes):
+    """Return longitudes shifted by multiples of 360, so no step between them is longer than 180."""
+    result = [longitudes[0]]
+    for longitude in longitudes[1:]:
+        result.append(longitude + 360 * round((result[-1] - longitude) / 360))
+    return result
+
+
 class Point(geopy.Point):
     """A point on earth defined by its latitude, longitude and possibly more attributes.
 
     Subclass of `geopy.Point <http://geopy.readthedocs.org/en/latest/index.html#geopy.point.Point>`_.
     """
 
+    __slots__ = ("precision",)
+
     def __new__(cls, *args, **kwargs):
         precision = kwargs.pop("precision", None)
         self = super(Point, cls).__new__(cls, *args, **kwargs)
@@ -41,7 +74,14 @@ class Point(geopy.Point):
         :raise .GeocodeError: If location cannot be geocoded (not found).
         """
         res = geocaching._request("api/geocode", params={"q": location}, expect="json")
+        return cls._from_geocode_response(res)
+
+    @classmethod
+    def _from_geocode_response(cls, res):
+        """Return a :class:`.Point` instance from geocoding endpoint JSON.
 
+        :raise .GeocodeError: If location was not found.
+        """
         if res["status"] != "success":
             raise GeocodeError(res["msg"])
 
@@ -51,7 +91,8 @@ class Point(geopy.Point):
     def from_string(cls, string):
         """Return a :class:`.Point` instance from coordinates in degrees minutes format.
 
-        This method can handle various malformed formats. Example inputs are:
+        This method can handle various malformed formats, see :func:`.coordinates.parse`. Example
+        inputs are:
 
         - :code:`S 36 51.918 E 174 46.725` or
         - :code:`N 6 52.861  w174   43.327`
@@ -60,32 +101,14 @@ class Point(geopy.Point):
         :raise .ValueError: If string cannot be parsed as coordinates.
         """
 
-        # Convert to uppercase to simplify hemisphere comparisons
-        string = string.upper()
-        coords = string.replace("N", " ").replace("S", " ") \
-            .replace("E", " ").replace("W", " ").replace("+", " ")
-
         try:
-            m = re.match(r"\s*(-?\s*\d+)\D+(\d+[\.,]\d+)\D?\s*(-?\s*\d+)\D+(\d+[\.,]\d+)", coords)
-
-            latDeg, latMin, lonDeg, lonMin = [
-                float(part.replace(" ", "").replace(",", ".")) for part in m.groups()]
-
-            if "S" in string:
-                latDeg *= -1
-                latMin *= -1
-            if "W" in string:
-                lonDeg *= -1
-                lonMin *= -1
-
-            return cls(to_decimal(latDeg, latMin), to_decimal(lonDeg, lonMin))
-
-        except AttributeError:
+            return cls(*coordinates.parse(string))
+        except PycachingValueError:
             pass
 
-        # fallback
+        # fallback to other formats understood by geopy
         try:
-            return super(cls, cls).from_string(string)
+            return super(cls, cls).from_string(string.upper())
         except ValueError as e:
             # wrap possible error to pycaching.errors.ValueError
             raise PycachingValueError() from e
@@ -166,6 +189,10 @@ class Polygon(Area):
     """Area defined by bordering Point instances.
 
     Subclass of :class:`.Area`.
+
+    Each edge goes the shorter way in longitude, so polygons can cross the antimeridian. If the
+    edges go around the whole Earth, the polygon contains the pole on the side of its mean latitude.
+    Points are stored as a tuple, assign a new sequence to :attr:`points` to change them.
     """
 
     def __init__(self, *points):
@@ -173,13 +200,46 @@ class Polygon(Area):
         assert len(points) >= 3
         self.points = points
 
+    @property
+    def points(self):
+        """Consecutive points bordering the polygon."""
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._points = points = tuple(points)
+        lats = [p.latitude for p in points]
+        lons = [p.longitude for p in points]
+        self._lat_min, self._lat_max = min(lats), max(lats)
+        self._lon_min, self._lon_max = min(lons), max(lons)
+
+        xs, ys = self._border(lats, lons)
+        self._x_min, self._x_max = min(xs), max(xs)
+
+        # non-horizontal edges as (y1, y2, x1, dx/dy) for crossing tests
+        self._edges = [(y1, y2, x1, (x2 - x1) / (y2 - y1))
+                       for x1, y1, x2, y2 in zip(xs, ys, xs[1:], ys[1:]) if y1 != y2]
+
+    def _border(self, lats, lons):
+        """Return closed border in a plane, where longitudes are unwrapped to continue over the antimeridian."""
+        xs = _unwrap(lons + lons[:1])
+        ys = lats + lats[:1]
+        if xs[-1] != xs[0]:
+            # border goes around the Earth, close it over the pole
+            pole = 90.0 if mean(lats) > 0 else -90.0
+            xs += [xs[-1], xs[0], xs[0]]
+            ys += [pole, pole, ys[0]]
+            self._lat_min, self._lat_max = min(self._lat_min, pole), max(self._lat_max, pole)
+        return xs, ys
+
     @property
     def bounding_box(self):
-        """Get area's bounding box (:class:`.Rectangle` computed from min and max coordinates)."""
-        lats = sorted([p.latitude for p in self.points])
-        lons = sorted([p.longitude for p in self.points])
-        return Rectangle(Point(min(lats), min(lons)),
-                         Point(max(lats), max(lons)))
+        """Get area's bounding box (:class:`.Rectangle` computed from min and max coordinates).
+
+        A rectangle cannot cross the antimeridian, so the box of a polygon crossing it spans
+        between the extreme longitudes over the other side of the Earth.
+        """
+        return Rectangle(Point(self._lat_min, self._lon_min), Point(self._lat_max, self._lon_max))
 
     @property
     def mean_point(self):
@@ -188,6 +248,62 @@ class Polygon(Area):
         y = mean([p.longitude for p in self.points])
         return Point(x, y)
 
+    def __contains__(self, p):
+        """Return if the polygon contains a point.
+
+        Points lying exactly on the border may be considered either inside or outside.
+
+        :param .Point p: Examined point.
+        """
+        y = p.latitude
+        if not self._lat_min <= y <= self._lat_max:
+            return False
+
+        # try the longitude in all its forms, which fall into the unwrapped range
+        x = p.longitude + 360 * math.ceil((self._x_min - p.longitude) / 360)
+        while x <= self._x_max:
+            inside = False
+            for y1, y2, x1, slope in self._edges:
+                if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * slope:
+                    inside = not inside
+            if inside:
+                return True
+            x += 360
+        return False
+
+    def contains_many(self, points):
+        """Return which of the points the polygon contains, see :meth:`__contains__`.
+
+        If :mod:`numpy` is installed, all points are examined at once, which is much faster for
+        many points.
+
+        :param points: Iterable of :class:`.Point` objects.
+        :return: List of booleans in the same order as points.
+        :rtype: :class:`list`
+        """
+        numpy = _numpy()
+        if numpy is None:
+            return [p in self for p in points]
+
+        lat, lon = _coordinates(numpy, points)
+        result = numpy.zeros(len(lat), dtype=bool)
+        candidates = numpy.flatnonzero((lat >= self._lat_min) & (lat <= self._lat_max))
+        y, lon = lat[candidates], lon[candidates]
+
+        x = lon + 360 * numpy.ceil((self._x_min - lon) / 360)
+        inside_any = numpy.zeros(len(candidates), dtype=bool)
+        while True:
+            in_range = x <= self._x_max
+            if not in_range.any():
+                break
+            inside = numpy.zeros(len(candidates), dtype=bool)
+            for y1, y2, x1, slope in self._edges:
+                inside ^= ((y1 > y) != (y2 > y)) & (x < x1 + (y - y1) * slope)
+            inside_any |= inside & in_range
+            x = x + 360
+        result[candidates] = inside_any
+        return result.tolist()
+
     def to_tiles(self, gc, zoom=None):
         """Return list of tiles covering this area.
 
@@ -195,33 +311,38 @@ class Polygon(Area):
         :param int zoom: Desired zoom level. If :code:`None`, the `zoom` is computed so that tile
             width is smallest possible, but greater than area width.
         """
-        corners = self.bounding_box.corners
+        # unlike bounding_box, use unwrapped longitudes to cover polygons crossing the antimeridian
+        lon_min, lon_max = self._x_min, self._x_max
 
         if not zoom:
             # calculate zoom, where tile width is just above bounding box width
-            d_lon = corners[1].longitude - corners[0].longitude
+            d_lon = lon_max - lon_min
             zoom = math.floor(math.log2(360 / d_lon))
+        n = 2 ** zoom
 
-        # get corner tiles
-        nw_tile = corners[0].to_tile(gc, zoom)
-        se_tile = corners[1].to_tile(gc, zoom)
+        # get corner tiles, latitudes are limited to the range of the map projection
+        nw_tile = Point(min(self._lat_max, _max_tile_latitude), 0).to_tile(gc, zoom)
+        se_tile = Point(max(self._lat_min, -_max_tile_latitude), 0).to_tile(gc, zoom)
 
-        # sort corner coords because of range
-        x1, x2 = sorted((nw_tile.x, se_tile.x))
-        y1, y2 = sorted((nw_tile.y, se_tile.y))
+        x1 = math.floor((lon_min + 180) / 360 * n)
+        x2 = min(math.floor((lon_max + 180) / 360 * n), x1 + n - 1)
+        y1, y2 = max(min(nw_tile.y, se_tile.y), 0), min(max(nw_tile.y, se_tile.y), n - 1)
 
         logging.debug("Area converted to {} tiles, zoom level {}".format(
             (x2 - x1) * (y2 - y1), zoom))
 
         # for each tile between corners
         for x, y in itertools.product(range(x1, x2 + 1), range(y1, y2 + 1)):
-            yield Tile(gc, x, y, zoom)
+            yield Tile(gc, x % n, y, zoom)
 
 
 class Rectangle(Polygon):
     """Upright rectangle.
 
     Subclass of :class:`.Polygon`.
+
+    Unlike a general polygon, the rectangle spans from minimal to maximal longitude of its corners,
+    it never crosses the antimeridian.
     """
 
     def __init__(self, point_a, point_b):
@@ -236,14 +357,26 @@ class Rectangle(Polygon):
         self.points = [point_a, Point(point_a.latitude, point_b.longitude),
                        point_b, Point(point_b.latitude, point_a.longitude)]
 
+    def _border(self, lats, lons):
+        """Return closed border in a plane, the longitudes are kept as they are (see :meth:`__contains__`)."""
+        return lons + lons[:1], lats + lats[:1]
+
     def __contains__(self, p):
-        """Return if the rectangle contains a point.
+        """Return if the rectangle contains a point (including its border).
 
         :param .Point p: Examined point.
         """
-        lats = sorted([_.latitude for _ in self.points])
-        lons = sorted([_.longitude for _ in self.points])
-        return min(lats) <= p.latitude <= max(lats) and min(lons) <= p.longitude <= max(lons)
+        return self._lat_min <= p.latitude <= self._lat_max and self._lon_min <= p.longitude <= self._lon_max
+
+    def contains_many(self, points):
+        """Return which of the points the rectangle contains, see :meth:`.Polygon.contains_many`."""
+        numpy = _numpy()
+        if numpy is None:
+            return [p in self for p in points]
+
+        lat, lon = _coordinates(numpy, points)
+        return ((lat >= self._lat_min) & (lat <= self._lat_max)
+                & (lon >= self._lon_min) & (lon <= self._lon_max)).tolist()
 
     @property
     def diagonal(self):
@@ -289,10 +422,47 @@ class Tile(object):
     @property
     @lazy_loaded
     def blocks(self):
-        """Return loaded :class:`.Block`s for this tile."""
+        """Return loaded :class:`.Block`s for this tile.
+
+        The blocks are created on first access from decoded tile data.
+        """
+        if self._blocks is None:
+            self._blocks = {wp: Block._from_points(self, wp, name, xs, ys)
+                            for wp, (name, xs, ys) in self._block_points.items()}
         return self._blocks.values()
 
-    def _download_utfgrid(self, *, get_png=False):
+    @property
+    @lazy_loaded
+    def cache_names(self):
+        """Names of caches in this tile.
+
+        :type: :class:`dict` of {waypoint: name}
+        """
+        return {wp: name for wp, (name, _, _) in self._block_points.items()}
+
+    @property
+    @lazy_loaded
+    def middle_points(self):
+        """Middle points of all valid blocks in this tile, computed without creating :class:`.Block`s.
+
+        Blocks which are not entirely filled or are larger than expected (see
+        :meth:`.Block.middle_point`) are left out.
+
+        :type: :class:`dict` of {waypoint: :class:`.UTFGridPoint`}
+        """
+        size = Block.size
+        middle_points = {}
+        for wp, (_, xs, ys) in self._block_points.items():
+            x_min, x_max, y_min, y_max = min(xs), max(xs), min(ys), max(ys)
+            width, height = x_max - x_min + 1, y_max - y_min + 1
+            if width > size or height > size or width * height != len(xs):
+                continue
+            x_min, x_max = _corrected_limits(x_min, x_max, size)
+            y_min, y_max = _corrected_limits(y_min, y_max, size)
+            middle_points[wp] = UTFGridPoint((x_min + x_max) / 2, (y_min + y_max) / 2)
+        return middle_points
+
+    def _download_utfgrid(self, *, get_png=None):
         """Load UTFGrid tile from geocaching.com.
 
         It appears to be mandatory to first download map tile (.png file) and only then UTFGrid.
@@ -300,48 +470,72 @@ class Tile(object):
         loading of the same tile and also a general traffic regulator involved. Try first to
         download grid and if it does not work, get .png and then try it again.
 
-        :param bool get_png: Whether to download .png first.
+        If the :class:`.Geocaching` instance has a :class:`.TileHistory`, it decides whether to
+        start with the .png and whether a grid without content can be trusted right away, and the
+        result is recorded to it.
+
+        :param bool get_png: Whether to download .png first. Predicted by the tile history (if any)
+            when not given.
         :return: JSON with raw tile data.
         :rtype: :class:`dict`
         """
-        # TODO: It might be useful to store time when tile is last downloaded and act based on that.
-        # Logging some statistics (time when tile is loaded + received status code + content length
-        # + time spent on request) might help in algorithm design and evaluating if additional
-        # traffic from .png loading is tolerable and if this should be done all the time.
+        # Statistics of the requests (status code, content length, time spent on request) can be
+        # collected by instrumentation hooks, see pycaching.instrumentation.
         # Requesting for UTFgrid and waiting for 204 response takes also its time.
 
         logging.debug("Downloading UTFGrid for {}".format(self))
 
+        history = self.geocaching.tile_history
+        prediction = None
+        if history is not None:
+            prediction = history.predict(self.z, self.x, self.y)
+            if get_png is None:
+                get_png = prediction == TileHistory.needs_png
+
         params = {
             "x": self.x,
             "y": self.y,
             "z": self.z
         }
+        direct_failed = None  # whether the grid requested first had no content
 
-        if get_png:
-            logging.debug("Getting .png file")
-            self.geocaching._request(self._urls["tile"], params=params, expect="raw")
-
-        logging.debug("Getting UTFGrid")
-        res = self.geocaching._request(self._urls["grid"], params=params, expect="raw")
-
-        if res.status_code == 204:
+        while True:
             if get_png:
-                logging.debug("There is really no content! Returning 0 caches.")
-                return
-            logging.debug("Cannot load UTFgrid: no content. Trying to load .png tile first")
-            return self._download_utfgrid(get_png=True)
-
-        if res.status_code == 200:
-            try:
-                return res.json()
-            except ValueError as e:
-                # this happened during testing, don't know why
-                if get_png:
-                    raise Error("Cannot load UTFgrid.") from e
-                else:
+                logging.debug("Getting .png file")
+                self.geocaching._request(self._urls["tile"], params=params, expect="raw")
+
+            logging.debug("Getting UTFGrid")
+            res = self.geocaching._request(self._urls["grid"], params=params, expect="raw")
+
+            if res.status_code == 204:
+                if get_png or prediction == TileHistory.empty:
+                    logging.debug("There is really no content! Returning 0 caches.")
+                    if history is not None and get_png:
+                        history.record(self.z, self.x, self.y, TileHistory.empty, png_loaded=True,
+                                       direct_failed=direct_failed)
+                    return
+                logging.debug("Cannot load UTFgrid: no content. Trying to load .png tile first")
+
+            elif res.status_code == 200:
+                try:
+                    utfgrid = res.json()
+                except ValueError as e:
+                    # this happened during testing, don't know why
+                    if get_png:
+                        raise Error("Cannot load UTFgrid.") from e
                     logging.debug("JSON parsing failed, trying .png first")
-                    return self._download_utfgrid(get_png=True)
+                else:
+                    if history is not None:
+                        state = TileHistory.needs_png if get_png else TileHistory.direct
+                        history.record(self.z, self.x, self.y, state, png_loaded=bool(get_png),
+                                       direct_failed=direct_failed if get_png else False)
+                    return utfgrid
+
+            else:
+                return
+
+            direct_failed = True
+            get_png = True
 
     def load(self):
         """Load :class:`.Block`s for this tile.
@@ -357,43 +551,51 @@ class Tile(object):
         form :code:`{"n": name, "i": waypoint}`.  Waypoints seem to appear nine times each, if
         the cache is not cut out from edges.
         """
+        with self.geocaching._span("Tile.load", "{}/{}/{}".format(self.z, self.x, self.y)):
+            utfgrid = self._download_utfgrid()
+            self._blocks = None  # created on demand
 
-        utfgrid = self._download_utfgrid()
-
-        if not utfgrid:
-            self._blocks = {}
-            logging.debug("No block loaded to {}".format(self))
-            return
-
-        size = len(utfgrid["grid"])
-        assert len(utfgrid["grid"][1]) == size, "UTFGrid is not square"
-        if size != self.size:
-            logging.warning("UTFGrid has unexpected size.")
-            self.size = size
+            if not utfgrid:
+                self._block_points = {}
+                logging.debug("No block loaded to {}".format(self))
+                return
 
-        self._blocks = {}   # format: { waypoint: <Block> }
+            size = len(utfgrid["grid"])
+            assert len(utfgrid["grid"][1]) == size, "UTFGrid is not square"
+            if size != self.size:
+                logging.warning("UTFGrid has unexpected size.")
+                self.size = size
 
-        # for all non-empty in coords
-        for coordinate_key in utfgrid["data"]:
-            cache_list = utfgrid["data"][coordinate_key]
-            x, y = (int(i) for i in coordinate_key.strip(" ()").split(","))
-            point = UTFGridPoint(x, y)
+            self._block_points = self._decode_utfgrid(utfgrid["data"])
 
-            # store all caches for this coords to dictionary
-            for cache in cache_list:
-                waypoint, name = cache["i"], cache["n"]
+            # try to determine grid coordinate block size
+            Block.determine_block_size(len(xs) for _, xs, _ in self._block_points.values())
 
-                # if block doesn't exist yet, store it to dict
-                if waypoint not in self._blocks:
-                    self._blocks[waypoint] = Block(self, waypoint, name)
+            logging.debug("Loaded {} blocks to {}".format(len(self._block_points), self))
 
-                # extend block points
-                self._blocks[waypoint].add(point)
+    @staticmethod
+    def _decode_utfgrid(data):
+        """Decode UTFGrid data to cache names and coordinates of their points.
 
-        # try to determine grid coordinate block size
-        Block.determine_block_size()
+        Point coordinates are collected to compact arrays, so no per-point objects are created.
 
-        logging.debug("Loaded {} blocks to {}".format(len(self._blocks), self))
+        :param dict data: UTFGrid :code:`data` (see :meth:`load`).
+        :return: Dictionary of {waypoint: (name, X coordinates, Y coordinates)}.
+        :rtype: :class:`dict` of :class:`tuple` of (:class:`str`, :class:`array.array`,
+            :class:`array.array`)
+        """
+        decoded = {}
+        for coordinate_key, cache_list in data.items():
+            x, _, y = coordinate_key.strip(" ()").partition(",")
+            x, y = int(x), int(y)
+            for cache in cache_list:
+                block = decoded.get(cache["i"])
+                if block is None:
+                    decoded[cache["i"]] = cache["n"], array("h", (x,)), array("h", (y,))
+                else:
+                    block[1].append(x)
+                    block[2].append(y)
+        return decoded
 
     def precision(self, point=None):
         """Return (x-axis) coordinate precision for current tile.
@@ -428,20 +630,23 @@ class Block(object):
     """Container for grouped :class:`.UTFGridPoint`s inside a tile."""
 
     # this class can have a lot of instances so use __slots__
-    __slots__ = "tile", "cache_wp", "cache_name", "_points", "_xlim", "_ylim", "__weakref__"
-
-    instances = []
+    __slots__ = "tile", "cache_wp", "cache_name", "_points", "_xlim", "_ylim"
 
     # Assume that block points form a N*N matrix in the UTFGrid, or a part of it.
     # If N cannot be determined automatically, use this fallback value.
-    size = 3
+    _default_size = 3
+    size = _default_size
+
+    # Block size is estimated from point counts of recently loaded blocks. The window is bounded,
+    # its histogram (point count -> number of blocks) keeps the mean cheap to compute.
+    size_window = 1000
+    _size_samples = deque()
+    _size_histogram = Counter()
+    _size_lock = threading.Lock()
 
     def __init__(self, tile=None, wp=None, name=None):
         """Initialize an empty :class:`.Block`.
 
-        Also add the new instance to class-level list of all instances, used for computing the
-        block size.
-
         :param .Tile tile: Base map tile.
         :param str wp: Waypoint of :class:`.Cache` represented by this block.
         :param str wp: Human readable name of :class:`.Cache` represented by this block.
@@ -450,22 +655,54 @@ class Block(object):
         self.cache_wp = wp
         self.cache_name = name
         self.points = []  # will trigger setting of other initial values
-        self.__class__.instances.append(weakref.ref(self))
 
     @classmethod
-    def determine_block_size(cls):
-        """Update the class-level block size from the data of all instances."""
+    def _from_points(cls, tile, wp, name, xs, ys):
+        """Return a block filled with points given by sequences of their X and Y coordinates."""
+        block = cls(tile, wp, name)
+        block._points = set(map(UTFGridPoint, xs, ys))
+        block._xlim = min(xs), max(xs)
+        block._ylim = min(ys), max(ys)
+        return block
+
+    @classmethod
+    def determine_block_size(cls, point_counts=()):
+        """Update the class-level block size from point counts of newly loaded blocks.
+
+        The size is a rounded mean of square roots of point counts of the last
+        :attr:`size_window` blocks. This is safe to call from multiple threads.
 
-        # remove invalid instances
-        cls.instances = list(filter(lambda i: i(), cls.instances))
+        :param point_counts: Iterable of point counts of newly loaded blocks.
+        """
+        with cls._size_lock:
+            for count in point_counts:
+                if len(cls._size_samples) >= cls.size_window:
+                    old_count = cls._size_samples.popleft()
+                    cls._size_histogram[old_count] -= 1
+                    if not cls._size_histogram[old_count]:
+                        del cls._size_histogram[old_count]
+                cls._size_samples.append(count)
+                cls._size_histogram[count] += 1
+
+            total = len(cls._size_samples)
+            if total < 20:
+                logging.warning("Trying to determine block size with small number of blocks.")
+            if not total:
+                return
 
-        if len(cls.instances) < 20:
-            logging.warning("Trying to determine block size with small number of blocks.")
+            avg_block_size = round(sum(math.sqrt(count) * blocks
+                                       for count, blocks in cls._size_histogram.items()) / total)
+            if cls.size != avg_block_size:
+                logging.warning("UTFGrid coordinate block has unexpected size.")
+                cls.size = avg_block_size
 
-        avg_block_size = round(mean((math.sqrt(len(i().points)) for i in cls.instances)))
-        if cls.size != avg_block_size:
-            logging.warning("UTFGrid coordinate block has unexpected size.")
-            cls.size = avg_block_size
+    @classmethod
+    def _reset_block_size(cls):
+        """Forget all point counts used to determine the block size and set it to default."""
+        with cls._size_lock:
+            cls._size_samples.clear()
+            cls._size_histogram.clear()
+            cls.size = cls._default_size
 
     @property
     def points(self):
@@ -552,17 +789,264 @@ class Block(object):
         :return tuple: Pair of corrected values of (lim_min, lim_max).
         :rtype: :class:`tuple` of :class:`int`
         """
+        return _corrected_limits(lim_min, lim_max, self.size)
 
-        # if block has normal size in this axis, there is no need to fix limits
-        if lim_max - lim_min + 1 == self.size:
-            pass
 
-        # if block touches left or up edge of tile
-        elif lim_min == 0:
-            lim_min = lim_max - self.size + 1
+def _corrected_limits(lim_min, lim_max, size):
+    """Calculate corrected limits of a block of given size, see :meth:`.Block._get_corrected_limits`."""
+
+    # if block has normal size in this axis, there is no need to fix limits
+    if lim_max - lim_min + 1 == size:
+        pass
+
+    # if block touches left or up edge of tile
+    elif lim_min == 0:
+        lim_min = lim_max - size + 1
+
+    # if block touches right or bottom edge of tile
+    else:
+        lim_max = lim_min + size - 1
+
+    return lim_min, lim_max
+
+
+# batch computations -----------------------------------------------------------
+
+# WGS-84 ellipsoid
+_wgs84_a = 6378137.0
+_wgs84_f = 1 / 298.257223563
+_wgs84_b = _wgs84_a * (1 - _wgs84_f)
+
+_vincenty_iterations = 200
+
+
+def _great_circle(lat1, lon1, lat2, lon2):
+    """Return great-circle distance in meters between two points by haversine formula."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    h = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * math.asin(math.sqrt(min(h, 1.0))) * geopy.distance.EARTH_RADIUS * 1000
+
+
+def _great_circle_bearing(lat1, lon1, lat2, lon2):
+    """Return initial great-circle bearing in degrees from the first point to the second one."""
+    phi1, phi2, d_lam = math.radians(lat1), math.radians(lat2), math.radians(lon2 - lon1)
+    y = math.sin(d_lam) * math.cos(phi2)
+    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(d_lam)
+    return math.degrees(math.atan2(y, x)) % 360
 
-        # if block touches right or bottom edge of tile
-        else:
-            lim_max = lim_min + self.size - 1
 
-        return lim_min, lim_max
+def _karney(lat1, lon1, lat2, lon2):
+    """Return geodesic distance in meters and initial bearing in degrees by Karney's algorithm."""
+    from geographiclib.geodesic import Geodesic
+    result = Geodesic.WGS84.Inverse(lat1, lon1, lat2, lon2, Geodesic.DISTANCE | Geodesic.AZIMUTH)
+    return result["s12"], result["azi1"] % 360
+
+
+def _geodesic(lat1, lon1, lat2, lon2):
+    """Return geodesic distance in meters and initial bearing in degrees on WGS-84 ellipsoid.
+
+    Vincenty's inverse formula is used, Karney's algorithm if it doesn't converge (nearly
+    antipodal points).
+    """
+    f = _wgs84_f
+    big_l = math.radians((lon2 - lon1 + 180) % 360 - 180)
+    u1 = math.atan((1 - f) * math.tan(math.radians(lat1)))
+    u2 = math.atan((1 - f) * math.tan(math.radians(lat2)))
+    sin_u1, cos_u1, sin_u2, cos_u2 = math.sin(u1), math.cos(u1), math.sin(u2), math.cos(u2)
+
+    lam = big_l
+    for _ in range(_vincenty_iterations):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        if sin_sigma == 0:
+            return 0.0, 0.0  # coincident points
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cos_u1 * cos_u2 * sin_lam / sin_sigma
+        cos2_alpha = 1 - sin_alpha ** 2
+        # zero on equatorial lines
+        cos_2sigma_m = cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha if cos2_alpha else 0.0
+        c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        lam, lam_previous = big_l + (1 - c) * f * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (2 * cos_2sigma_m ** 2 - 1))), lam
+        if abs(lam - lam_previous) <= 1e-12:
+            break
+    else:
+        return _karney(lat1, lon1, lat2, lon2)
+    if abs(lam) > math.pi:
+        return _karney(lat1, lon1, lat2, lon2)
+
+    u_sq = cos2_alpha * (_wgs84_a ** 2 - _wgs84_b ** 2) / _wgs84_b ** 2
+    a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = b * sin_sigma * (cos_2sigma_m + b / 4 * (
+        cos_sigma * (2 * cos_2sigma_m ** 2 - 1)
+        - b / 6 * cos_2sigma_m * (4 * sin_sigma ** 2 - 3) * (4 * cos_2sigma_m ** 2 - 3)))
+    distance = _wgs84_b * a * (sigma - delta_sigma)
+    bearing = math.degrees(math.atan2(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)) % 360
+    return distance, bearing
+
+
+def _numpy_great_circle(numpy, lat1, lon1, lat2, lon2):
+    """Return great-circle distances in meters by haversine formula, see :func:`_great_circle`."""
+    phi1, phi2 = numpy.radians(lat1), numpy.radians(lat2)
+    h = (numpy.sin((phi2 - phi1) / 2) ** 2
+         + numpy.cos(phi1) * numpy.cos(phi2) * numpy.sin(numpy.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * numpy.arcsin(numpy.sqrt(numpy.minimum(h, 1.0))) * geopy.distance.EARTH_RADIUS * 1000
+
+
+def _numpy_great_circle_bearing(numpy, lat1, lon1, lat2, lon2):
+    """Return initial great-circle bearings in degrees, see :func:`_great_circle_bearing`."""
+    phi1, phi2, d_lam = numpy.radians(lat1), numpy.radians(lat2), numpy.radians(lon2 - lon1)
+    y = numpy.sin(d_lam) * numpy.cos(phi2)
+    x = numpy.cos(phi1) * numpy.sin(phi2) - numpy.sin(phi1) * numpy.cos(phi2) * numpy.cos(d_lam)
+    return numpy.degrees(numpy.arctan2(y, x)) % 360
+
+
+def _numpy_geodesic(numpy, lat1, lon1, lat2, lon2):
+    """Return geodesic distances and initial bearings, see :func:`_geodesic`.
+
+    Vincenty's inverse formula is iterated for all pairs at once.
+    """
+    f = _wgs84_f
+    big_l = numpy.radians((lon2 - lon1 + 180) % 360 - 180)
+    u1 = numpy.arctan((1 - f) * numpy.tan(numpy.radians(lat1)))
+    u2 = numpy.arctan((1 - f) * numpy.tan(numpy.radians(lat2)))
+    sin_u1, cos_u1, sin_u2, cos_u2 = numpy.sin(u1), numpy.cos(u1), numpy.sin(u2), numpy.cos(u2)
+
+    lam = big_l
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(_vincenty_iterations):
+            sin_lam, cos_lam = numpy.sin(lam), numpy.cos(lam)
+            sin_sigma = numpy.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = numpy.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = numpy.where(sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # zero on equatorial lines
+            cos_2sigma_m = numpy.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha)
+            c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam, lam_previous = big_l + (1 - c) * f * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (2 * cos_2sigma_m ** 2 - 1))), lam
+            converged = numpy.abs(lam - lam_previous) <= 1e-12
+            if converged.all():
+                break
+
+    u_sq = cos2_alpha * (_wgs84_a ** 2 - _wgs84_b ** 2) / _wgs84_b ** 2
+    a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = b * sin_sigma * (cos_2sigma_m + b / 4 * (
+        cos_sigma * (2 * cos_2sigma_m ** 2 - 1)
+        - b / 6 * cos_2sigma_m * (4 * sin_sigma ** 2 - 3) * (4 * cos_2sigma_m ** 2 - 3)))
+    distance = _wgs84_b * a * (sigma - delta_sigma)
+    bearing = numpy.degrees(numpy.arctan2(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)) % 360
+
+    for i in numpy.flatnonzero(~converged | (numpy.abs(lam) > math.pi)):
+        distance[i], bearing[i] = _karney(lat1[i], lon1[i], lat2[i], lon2[i])
+    return distance, bearing
+
+
+def _numpy_pairs(numpy, points_a, points_b):
+    """Return arrays of latitudes and longitudes of paired points, see :func:`_pairs`."""
+    coordinates = [(float(points.latitude), float(points.longitude)) if isinstance(points, geopy.Point)
+                   else _coordinates(numpy, points) for points in (points_a, points_b)]
+    (lat1, lon1), (lat2, lon2) = coordinates
+    if numpy.ndim(lat1) and numpy.ndim(lat2) and len(lat1) != len(lat2):
+        raise PycachingValueError("Both sequences of points must have the same length.")
+    return numpy.broadcast_arrays(lat1, lon1, lat2, lon2)
+
+
+def _pairs(points_a, points_b):
+    """Return a list of pairs of points, where a single point is paired with all the others."""
+    if isinstance(points_a, geopy.Point):
+        return [(points_a, b) for b in points_b]
+    if isinstance(points_b, geopy.Point):
+        return [(a, points_b) for a in points_a]
+    points_a, points_b = list(points_a), list(points_b)
+    if len(points_a) != len(points_b):
+        raise PycachingValueError("Both sequences of points must have the same length.")
+    return list(zip(points_a, points_b))
+
+
+def _distances(numpy, points_a, points_b, geodesic):
+    """Return an array of distances, see :func:`distances`."""
+    coordinates = _numpy_pairs(numpy, points_a, points_b)
+    if geodesic:
+        return _numpy_geodesic(numpy, *coordinates)[0]
+    return _numpy_great_circle(numpy, *coordinates)
+
+
+def distances(points_a, points_b, *, geodesic=True):
+    """Return distances between pairs of points.
+
+    Either of the arguments can be a single :class:`.Point`, which is then paired with each point
+    of the other one. Otherwise, the points are paired in order. If :mod:`numpy` is installed, all
+    distances are computed at once, which is much faster for many points.
+
+    :param points_a: Iterable of :class:`.Point` objects or a single :class:`.Point`.
+    :param points_b: Iterable of :class:`.Point` objects or a single :class:`.Point`.
+    :param bool geodesic: Whether to compute geodesic distances on WGS-84 ellipsoid (the same as
+        :func:`geopy.distance.distance`), or great-circle distances on a sphere, which are faster,
+        but up to 0.5 % off.
+    :return: List of distances in meters.
+    :rtype: :class:`list` of :class:`float`
+    :raise .ValueError: If both sequences of points have different lengths.
+    """
+    numpy = _numpy()
+    if numpy is None:
+        compute = (lambda *c: _geodesic(*c)[0]) if geodesic else _great_circle
+        return [compute(a.latitude, a.longitude, b.latitude, b.longitude) for a, b in _pairs(points_a, points_b)]
+    return _distances(numpy, points_a, points_b, geodesic).tolist()
+
+
+def bearings(points_a, points_b, *, geodesic=True):
+    """Return initial bearings from the first points of pairs to the second ones.
+
+    The points are paired in the same way as in :func:`distances`.
+
+    :param bool geodesic: Whether to compute bearings of geodesics on WGS-84 ellipsoid, or of great
+        circles on a sphere.
+    :return: List of bearings in degrees clockwise from north, in range [0, 360).
+    :rtype: :class:`list` of :class:`float`
+    :raise .ValueError: If both sequences of points have different lengths.
+    """
+    numpy = _numpy()
+    if numpy is None:
+        compute = (lambda *c: _geodesic(*c)[1]) if geodesic else _great_circle_bearing
+        return [compute(a.latitude, a.longitude, b.latitude, b.longitude) for a, b in _pairs(points_a, points_b)]
+
+    coordinates = _numpy_pairs(numpy, points_a, points_b)
+    if geodesic:
+        return _numpy_geodesic(numpy, *coordinates)[1].tolist()
+    return _numpy_great_circle_bearing(numpy, *coordinates).tolist()
+
+
+def nearest(origin, items, k=1, *, key=None, geodesic=True):
+    """Return items nearest to a point.
+
+    For example, the 10 caches nearest to a point are
+    :code:`nearest(point, caches, 10, key=lambda cache: cache.location)`.
+
+    :param .Point origin: Examined point.
+    :param items: Iterable of :class:`.Point` objects, or any objects if `key` is given.
+    :param int k: Number of items to return.
+    :param key: Function returning a :class:`.Point` of an item.
+    :param bool geodesic: Whether to use geodesic or great-circle distances, see :func:`distances`.
+    :return: List of at most `k` items sorted by distance from the origin.
+    :rtype: :class:`list`
+    """
+    items = list(items)
+    k = min(k, len(items))
+    if k <= 0:
+        return []
+    points = items if key is None else [key(item) for item in items]
+
+    numpy = _numpy()
+    if numpy is None:
+        result = distances(origin, points, geodesic=geodesic)
+        return [items[i] for i in heapq.nsmallest(k, range(len(items)), key=result.__getitem__)]
+
+    result = _distances(numpy, origin, points, geodesic)
+    indices = numpy.argpartition(result, k - 1)[:k] if k < len(items) else numpy.arange(len(items))
+    return [items[i] for i in indices[numpy.argsort(result[indices], kind="stable")]]
@@ -1,19 +1,26 @@
 #!/usr/bin/env python3
 
+import copy
 import logging
 import datetime
 import requests
-import bs4
 import json
-import subprocess
-import warnings
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import parse_qs, urljoin, urlparse
 from os import path
 from pycaching.cache import Cache, Size
 from pycaching.log import Log, Type as LogType
+from pycaching.session_store import dump_cookies, load_cookies
 from pycaching.geo import Point
+from pycaching.instrumentation import RequestRecord, SpanRecord
 from pycaching.trackable import Trackable
-from pycaching.errors import Error, NotLoggedInException, LoginFailedException, PMOnlyException
+from pycaching.util import DateParser, endpoint_key, parse_html
+from pycaching.errors import (Error, NotLoggedInException, LoginFailedException, PMOnlyException,
+                              ValueError as PycachingValueError)
 
 
 class Geocaching(object):
@@ -32,12 +39,67 @@ class Geocaching(object):
     }
     _credentials_file = ".gc_credentials"
 
-    def __init__(self, *, session=None):
+    def __init__(self, *, session=None, html_parser=None, response_cache=None, object_cache=None,
+                 rate_limiter=None, retry_policy=None, hooks=(), tile_history=None, session_store=None):
+        """Create a Geocaching instance.
+
+        :param requests.Session session: Session used for all requests. A new one is created if
+            not given.
+        :param html_parser: HTML parser used for all loaded pages. Either a name of BeautifulSoup
+            tree builder (:code:`html.parser`, :code:`lxml` or :code:`html5lib`) or a callable
+            taking the markup and returning a parsed document. The fast :code:`lxml` parser is
+            recommended, if installed. See :func:`.util.parse_html`.
+        :param .ResponseCache response_cache: Cache of HTTP responses, which can be shared by
+            multiple instances and program runs. Responses are not cached if not given.
+        :param .ObjectCache object_cache: Cache of loaded caches and trackables, returned by
+            :meth:`get_cache` and :meth:`get_trackable` without loading. Not used if not given.
+        :param .RateLimiter rate_limiter: Limiter of request rates, shared by all threads using this
+            instance. Requests are not limited if not given.
+        :param .RetryPolicy retry_policy: Policy of retrying failed requests. Requests are not
+            retried if not given.
+        :param hooks: Instrumentation hooks (see :class:`.instrumentation.Hook`) receiving
+            statistics of all requests and some higher-level operations.
+        :param .TileHistory tile_history: History of UTFGrid downloads, shared by all tiles loaded
+            by this instance, which saves requests for map tile images. Not used if not given.
+        :param .SessionStore session_store: Store of the authenticated session. If given, the
+            session is saved after login and :meth:`login` continues the stored session instead of
+            logging in again. Sessions are not stored if not given.
+        """
         self._logged_in = False
         self._logged_username = None
+        self._credentials = None  # used to log in again when the session expires
+        self._login_lock = threading.Lock()
+        self._login_generation = 0  # incremented by each login in the session
         self._session = session or requests.Session()
+        self.html_parser = html_parser
+        self.response_cache = response_cache
+        self.object_cache = object_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.hooks = list(hooks)
+        self.tile_history = tile_history
+        self.session_store = session_store
+        self._date_parser = DateParser()
+
+    @property
+    def html_parser(self):
+        """The HTML parser used for all loaded pages.
+
+        :type: :class:`str` or callable
+        """
+        return self._html_parser
+
+    @html_parser.setter
+    def html_parser(self, html_parser):
+        if html_parser is not None and not callable(html_parser) and not isinstance(html_parser, str):
+            raise PycachingValueError("HTML parser must be either a parser name or a callable.")
+        self._html_parser = html_parser
+
+    def _parse_html(self, markup, parse_only=None):
+        """Return a :class:`bs4.BeautifulSoup` object parsed by configured parser."""
+        return parse_html(markup, self._html_parser, parse_only)
 
-    def _request(self, url, *, expect="soup", method="GET", login_check=True, **kwargs):
+    def _request(self, url, *, expect="soup", method="GET", login_check=True, parse_only=None, **kwargs):
         """
         Do a HTTP request and return a response based on expect param.
 
@@ -45,6 +107,8 @@ class Geocaching(object):
         :param str method: HTTP method to use.
         :param str expect: Expected type of data (either :code:`soup`, :code:`json` or :code:`raw`).
         :param bool login_check: Whether to check if user is logged in or not.
+        :param bs4.SoupStrainer parse_only: Parse only matching parts of the page (used only when
+            expecting :code:`soup`).
         :param kwargs: Passed to `requests.request
             <http://docs.python-requests.org/en/latest/api/#requests.request>`_ as is.
         """
@@ -55,26 +119,211 @@ class Geocaching(object):
         url = url if "//" in url else urljoin(self._baseurl, url)
 
         try:
-            res = self._session.request(method, url, **kwargs)
+            if self.hooks:
+                return self._request_instrumented(url, expect, method, parse_only, login_check, **kwargs)
+            res = self._send_authenticated(method, url, login_check, expect=expect, **kwargs)
             res.raise_for_status()
-
-            # return bs4.BeautifulSoup, JSON dict or raw requests.Response
-            if expect == "soup":
-                return bs4.BeautifulSoup(res.text, "html.parser")
-            elif expect == "json":
-                return res.json()
-            elif expect == "raw":
-                return res
+            return self._decode(res, expect, parse_only)
 
         except requests.exceptions.RequestException as e:
             raise Error("Cannot load page: {}".format(url)) from e
 
+    def _decode(self, res, expect, parse_only=None):
+        """Return data of a response based on expect param (see :meth:`_request`)."""
+        # return bs4.BeautifulSoup, JSON dict or raw requests.Response
+        if expect == "soup":
+            return self._parse_html(res.text, parse_only)
+        elif expect == "json":
+            return res.json()
+        elif expect == "raw":
+            return res
+
+    def _request_instrumented(self, url, expect, method, parse_only, login_check, **kwargs):
+        """Do the same as :meth:`_request` and report request statistics to hooks."""
+        stats = {"retries": 0, "cached": False}
+        res = error = None
+        network_time = parse_time = 0.0
+        start = time.perf_counter()
+        try:
+            res = self._send_authenticated(method, url, login_check, expect=expect, stats=stats, **kwargs)
+            network_time = time.perf_counter() - start
+            res.raise_for_status()
+
+            start = time.perf_counter()
+            data = self._decode(res, expect, parse_only)
+            parse_time = time.perf_counter() - start
+            return data
+
+        except Exception as e:
+            error = type(e).__name__
+            raise
+
+        finally:
+            if res is None:
+                network_time = time.perf_counter() - start
+            self._emit("on_request", RequestRecord(
+                endpoint_key(url), method, res.status_code if res is not None else None,
+                len(res.content) if res is not None else 0, network_time, parse_time,
+                stats["retries"], stats["cached"], error))
+
+    def _emit(self, event, record):
+        """Pass a statistics record to all hooks."""
+        for hook in self.hooks:
+            try:
+                getattr(hook, event)(record)
+            except Exception:
+                logging.exception("Instrumentation hook {!r} failed".format(hook))
+
+    @contextmanager
+    def _span(self, name, key=None):
+        """Measure duration of an operation and report it to hooks."""
+        if not self.hooks:
+            yield
+            return
+
+        error = None
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._emit("on_span", SpanRecord(name, key, time.perf_counter() - start, error))
+
+    def _send_authenticated(self, method, url, login_check, **kwargs):
+        """Send a request using :meth:`_send` and log in again, if the session has expired.
+
+        Restored or long-running sessions are not validated upfront. Only when a request needing
+        login is redirected to the login page (or refused with 401), the user is logged in again
+        using the credentials given to :meth:`login` and the request is repeated once.
+
+        :param bool login_check: Whether the request needs a logged in user.
+        :rtype: :class:`requests.Response`
+        """
+        generation = self._login_generation
+        res = self._send(method, url, **kwargs)
+        if login_check and self._credentials is not None and self._is_unauthenticated(res):
+            self._relogin(generation)
+            res = self._send(method, url, **kwargs)
+        return res
+
+    def _is_unauthenticated(self, res):
+        """Return whether a response shows that the user is not logged in."""
+        if res.status_code == 401:
+            return True
+        login_path = urlparse(urljoin(self._baseurl, self._urls["login_page"])).path.lower()
+        return urlparse(res.url).path.lower().rstrip("/") == login_path
+
+    def _relogin(self, generation):
+        """Log in again, unless another thread already did so since the request was sent.
+
+        The login runs in a separate session, so requests of other threads keep using the current
+        session (and its login state) until the new cookies replace its cookies.
+
+        :param int generation: Value of :attr:`_login_generation` before the request was sent.
+        """
+        with self._login_lock:
+            if self._login_generation != generation:
+                return
+            logging.info("Session of {} has expired, logging in again.".format(self._logged_username))
+            username, password = self._credentials
+            self._login(*self._get_credentials(username, password), session=self._side_session())
+
+    def _side_session(self):
+        """Return a new session configured as the current one, but without cookies."""
+        current = self._session
+        session = requests.Session()
+        for name in ("headers", "auth", "proxies", "hooks", "params", "stream", "verify", "cert", "max_redirects",
+                     "trust_env"):
+            setattr(session, name, copy.copy(getattr(current, name)))
+        for prefix, adapter in current.adapters.items():
+            session.mount(prefix, adapter)
+        return session
+
+    def _send(self, method, url, *, expect=None, stats=None, **kwargs):
+        """Send a request using the session or get its response from response cache.
+
+        :param dict stats: If given, number of retries and whether the response was cached are
+            stored there.
+        :return: Response to the request.
+        :rtype: :class:`requests.Response`
+        """
+        cache = self.response_cache
+        if cache is None or not cache.is_cacheable(method, url):
+            return self._transmit(method, url, expect, stats, **kwargs)
+
+        key = cache.make_key(method, url, kwargs.get("params"), self._logged_username)
+        cached = cache.get(key)
+        if cached:
+            cached_res, fresh, validators = cached
+            if fresh:
+                logging.debug("Using cached response for {}".format(url))
+                if stats is not None:
+                    stats["cached"] = True
+                return cached_res
+            # ask server whether the stale response is still valid
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **validators)
+
+        res = self._transmit(method, url, expect, stats, **kwargs)
+
+        if cached and res.status_code == 304:
+            logging.debug("Cached response for {} revalidated".format(url))
+            cache.revalidate(key)
+            if stats is not None:
+                stats["cached"] = True
+            return cached_res
+
+        cache.store(key, res, url)
+        return res
+
+    def _transmit(self, method, url, expect, stats=None, **kwargs):
+        """Send a request using the session, retrying it according to the retry policy.
+
+        :rtype: :class:`requests.Response`
+        """
+        attempts = 0
+
+        def send():
+            nonlocal attempts
+            attempts += 1
+            return self._send_once(method, url, expect, **kwargs)
+
+        try:
+            if self.retry_policy is None:
+                return send()
+            return self.retry_policy.call(method, url, send)
+        finally:
+            if stats is not None:
+                stats["retries"] = max(attempts - 1, 0)
+
+    def _send_once(self, method, url, expect, session=None, **kwargs):
+        """Send a request using the session, waiting for the rate limiter first.
+
+        :param requests.Session session: Session used instead of the current one.
+        :rtype: :class:`requests.Response`
+        """
+        session = session or self._session
+        limiter = self.rate_limiter
+        if limiter is None:
+            return session.request(method, url, **kwargs)
+
+        budget = limiter.budget(url, expect)
+        limiter.acquire(budget)
+        res = session.request(method, url, **kwargs)
+        limiter.update(budget, res)
+        return res
+
     def login(self, username=None, password=None):
         """Log in the user for this instance of Geocaching.
 
-        If username or password is not set, try to load credentials from file. Then load login page
-        and do some checks about currently logged user. As a last thing post the login form and
-        check result.
+        If there is a :class:`.SessionStore` with a stored session of the same user (or any user,
+        if username is not set), continue that session without any request. It is validated
+        lazily - if a later request turns out unauthenticated, the user is logged in again.
+
+        Otherwise, if username or password is not set, try to load credentials from file. Then load
+        login page and do some checks about currently logged user. As a last thing post the login
+        form and check result.
 
         :param str username: User's username or :code:`None` to use data from credentials file.
         :param str password: User's password or :code:`None` to use data from credentials file.
@@ -83,21 +332,11 @@ class Geocaching(object):
         """
         logging.info("Logging in...")
 
-        if not username or not password:
-            try:
-                username, password = self._load_credentials(username=username)
-            except FileNotFoundError as e:
-                raise LoginFailedException("Credentials file not found and "
-                                           "no username and password is given.") from e
-            except ValueError as e:
-                raise LoginFailedException("Wrong format of credentials file.") from e
-            except KeyError as e:
-                raise LoginFailedException("Credentials file doesn't contain "
-                                           "username or password/password_cmd.") from e
-            except IOError as e:
-                raise LoginFailedException("Credentials file reading error.") from e
-            except subprocess.CalledProcessError as e:
-                raise LoginFailedException("Error calling password retrieval command.") from e
+        if not self._logged_in and self._restore_session(username):
+            self._credentials = self._logged_username, password
+            return
+
+        username, password = self._get_credentials(username, password)
 
         logging.debug("Checking for previous login.")
         if self._logged_in:
@@ -108,34 +347,110 @@ class Geocaching(object):
                 logging.info("Want to login as {} => logging out.".format(username))
                 self.logout()
 
-        login_page = self._request(self._urls["login_page"], login_check=False)
+        self._login(username, password)
+
+    def _login(self, username, password, session=None):
+        """Post the login form and check result, see :meth:`login`.
+
+        :param requests.Session session: Session used for logging in instead of the current one.
+            After a successful login, its cookies replace the cookies of the current session. A
+            failed login leaves the current session and the session store untouched.
+        """
+        login_page = self._request(self._urls["login_page"], login_check=False, session=session)
 
         # continue logging in, assemble POST
-        logging.debug("Assembling POST data.")
-        token_field_name = "__RequestVerificationToken"
-        token_value = login_page.find("input", attrs={"name": token_field_name})["value"]
-        post = {
-            "UsernameOrEmail": username,
-            "Password": password,
-            token_field_name: token_value
-        }
+        post = self._get_login_post_data(login_page, username, password)
 
         # login to the site
         logging.debug("Submiting login form.")
         after_login_page = self._request(self._urls["login_page"], method="POST",
-                                         data=post, login_check=False)
+                                         data=post, login_check=False, session=session)
 
         logging.debug("Checking the result.")
         if self.get_logged_user(after_login_page):
             logging.info("Logged in successfully as {}.".format(username))
+            if session is not None:
+                # keep the session object, it may be configured by the caller
+                self._session.cookies.clear()
+                self._session.cookies.update(session.cookies)
+            self._login_generation += 1
             self._logged_in = True
             self._logged_username = username
+            self._credentials = username, password
+            self.save_session()
             return
         else:
-            self.logout()
+            if session is None:
+                self.logout()
             raise LoginFailedException("Cannot login to the site "
                                        "(probably wrong username or password).")
 
+    def _restore_session(self, username):
+        """Continue a session from the session store, if there is one for the user.
+
+        :return: Whether the session was restored.
+        """
+        if self.session_store is None:
+            return False
+        stored = self.session_store.load()
+        if stored is None:
+            return False
+        stored_username, cookies = stored
+        if username is not None and username != stored_username:
+            return False
+
+        logging.info("Continuing stored session of {}.".format(stored_username))
+        load_cookies(self._session.cookies, cookies)
+        self._logged_in = True
+        self._logged_username = stored_username
+        return True
+
+    def save_session(self):
+        """Save the current session to the session store, if there is any.
+
+        It is done after each login. Call it also before exiting, if you want to keep cookies
+        renewed by the server during the session.
+        """
+        if self.session_store is not None and self._logged_in:
+            self.session_store.save(self._logged_username, dump_cookies(self._session.cookies))
+
+    def _get_credentials(self, username, password):
+        """Return given credentials or load them from file, if some of them are missing.
+
+        :raise .LoginFailedException: If credentials cannot be loaded from file.
+        """
+        if username and password:
+            return username, password
+
+        import subprocess  # needed only for password commands
+
+        try:
+            return self._load_credentials(username=username)
+        except FileNotFoundError as e:
+            raise LoginFailedException("Credentials file not found and "
+                                       "no username and password is given.") from e
+        except ValueError as e:
+            raise LoginFailedException("Wrong format of credentials file.") from e
+        except KeyError as e:
+            raise LoginFailedException("Credentials file doesn't contain "
+                                       "username or password/password_cmd.") from e
+        except IOError as e:
+            raise LoginFailedException("Credentials file reading error.") from e
+        except subprocess.CalledProcessError as e:
+            raise LoginFailedException("Error calling password retrieval command.") from e
+
+    @staticmethod
+    def _get_login_post_data(login_page, username, password):
+        """Return POST data for login form found on login page."""
+        logging.debug("Assembling POST data.")
+        token_field_name = "__RequestVerificationToken"
+        token_value = login_page.find("input", attrs={"name": token_field_name})["value"]
+        return {
+            "UsernameOrEmail": username,
+            "Password": password,
+            token_field_name: token_value
+        }
+
     def _load_credentials(self, username=None):
         """Load credentials from file.
 
@@ -191,6 +506,7 @@ class Geocaching(object):
             elif "password" in credentials:
                 return credentials["username"], credentials["password"]
             elif "password_cmd" in credentials:
+                import subprocess
                 stdout = subprocess.check_output(credentials["password_cmd"], shell=True)
                 return credentials["username"], stdout.decode("utf-8").strip()
             else:
@@ -198,11 +514,14 @@ class Geocaching(object):
                                "Use either \"password\" or \"password_cmd\".")
 
     def logout(self):
-        """Log out the user for this instance."""
+        """Log out the user for this instance and remove the stored session."""
         logging.info("Logging out.")
         self._logged_in = False
         self._logged_username = None
+        self._credentials = None
         self._session = requests.Session()
+        if self.session_store is not None:
+            self.session_store.clear()
 
     def get_logged_user(self, login_page=None):
         """Return the name of currently logged user.
@@ -212,6 +531,11 @@ class Geocaching(object):
         :rtype: :class:`str` or :code:`None`
         """
         login_page = login_page or self._request(self._urls["login_page"], login_check=False)
+        return self._parse_logged_user(login_page)
+
+    @staticmethod
+    def _parse_logged_user(login_page):
+        """Return the name of logged user found on a page or :code:`None`."""
         assert hasattr(login_page, "find") and callable(login_page.find)
 
         logging.debug("Checking for already logged user.")
@@ -220,74 +544,126 @@ class Geocaching(object):
         except AttributeError:
             return None
 
-    def search(self, point, limit=float("inf")):
+    def search(self, point, limit=float("inf"), *, prefetch=0):
         """Return a generator of caches around some point.
 
         Search for caches around some point by loading search pages and parsing the data from these
         pages. Yield :class:`.Cache` objects filled with data from search page. You can provide limit
         as a convenient way to stop generator after certain number of caches.
 
+        Result pages can be prefetched by background threads, so the next pages are downloaded
+        and parsed while the current one is being consumed. Pages beyond `limit` are never
+        requested and the pending requests are cancelled when the generator is closed.
+
         :param .geo.Point point: Search center point.
         :param int limit: Maximum number of caches to generate.
+        :param int prefetch: Number of result pages to download in advance (zero disables
+            prefetching).
         """
         logging.info("Searching at {}".format(point))
 
-        start_index = 0
-        while True:
-            # get one page
-            geocaches_table, whole_page = self._search_get_page(point, start_index)
-            rows = geocaches_table.find_all("tr")
+        pages = self._search_get_pages(point, limit, prefetch)
+        try:
+            for rows, whole_page in pages:
+                # prepare language-dependent mappings
+                if whole_page is not None:
+                    localized_size_mapping = self._search_get_size_mapping(whole_page)
 
-            # leave loop if there are no (more) results
-            if not rows:
-                return
+                # parse caches in result
+                for row in rows:
 
-            # prepare language-dependent mappings
-            if start_index == 0:
-                cache_sizes_filter_wrapper = whole_page.find("div", class_="cache-sizes-wrapper")
-                localized_size_mapping = {
-                    # key = "Small" (localized), value = Size.small
-                    label.find("span").text.strip(): Size.from_number(label.find("input").get("value"))
-                    for label in cache_sizes_filter_wrapper.find_all("label")
-                }
-
-            # parse caches in result
-            for start_index, row in enumerate(rows, start_index):
-
-                limit -= 1  # handle limit
-                if limit < 0:
+                    limit -= 1  # handle limit
+                    if limit < 0:
+                        return
+
+                    yield self._search_parse_cache(row, localized_size_mapping)
+        finally:
+            pages.close()
+
+    def _search_get_pages(self, point, limit, prefetch=0):
+        """Return a generator of search result pages.
+
+        Yield tuples of result rows and whole parsed page, which is available only for the first
+        page. Stop after an empty page or once `limit` results are covered.
+
+        :param .geo.Point point: Search center point.
+        :param int limit: Maximum number of results needed.
+        :param int prefetch: Number of pages to download in advance by background threads.
+        """
+        geocaches_table, whole_page = self._search_get_page(point, 0)
+        rows = geocaches_table.find_all("tr")
+        yield rows, whole_page
+
+        # the first page determines the page size
+        page_size = start_index = len(rows)
+
+        if not prefetch:
+            while rows and start_index < limit:
+                geocaches_table, _ = self._search_get_page(point, start_index)
+                rows = geocaches_table.find_all("tr")
+                yield rows, None
+                start_index += len(rows)
+            return
+
+        def get_rows(start_index):
+            geocaches_table, _ = self._search_get_page(point, start_index)
+            return geocaches_table.find_all("tr")
+
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        pending = deque()
+        try:
+            while rows:
+                while len(pending) < prefetch and start_index < limit:
+                    pending.append(executor.submit(get_rows, start_index))
+                    start_index += page_size
+                if not pending:
                     return
+                rows = pending.popleft().result()
+                yield rows, None
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _search_get_size_mapping(whole_page):
+        """Return a mapping of localized cache size names to :class:`.cache.Size` from search page."""
+        cache_sizes_filter_wrapper = whole_page.find("div", class_="cache-sizes-wrapper")
+        return {
+            # key = "Small" (localized), value = Size.small
+            label.find("span").text.strip(): Size.from_number(label.find("input").get("value"))
+            for label in cache_sizes_filter_wrapper.find_all("label")
+        }
 
-                # parse raw data
-                cache_details = row.find("span", "cache-details").text.split("|")
-                wp = cache_details[1].strip()
-
-                # create and fill cache object
-                # values are sanitized and converted in Cache setters
-                c = Cache(self, wp)
-                c.type = cache_details[0]
-                c.name = row.find("span", "cache-name").text
-                badge = row.find("svg", class_="badge")
-                c.found = "found" in str(badge) if badge is not None else False
-                c.favorites = row.find(attrs={"data-column": "FavoritePoint"}).text
-                c.state = not (row.get("class") and "disabled" in row.get("class"))
-                c.pm_only = row.find("td", "pm-upsell") is not None
-
-                if c.pm_only:
-                    # PM only caches doesn't have other attributes filled in
-                    yield c
-                    continue
-
-                c.size = localized_size_mapping[row.find(attrs={"data-column": "ContainerSize"}).text.strip()]
-                c.difficulty = row.find(attrs={"data-column": "Difficulty"}).text
-                c.terrain = row.find(attrs={"data-column": "Terrain"}).text
-                c.hidden = row.find(attrs={"data-column": "PlaceDate"}).text
-                c.author = row.find("span", "owner").text[3:]  # delete "by "
-
-                logging.debug("Cache parsed: {}".format(c))
-                yield c
-
-            start_index += 1
+    def _search_parse_cache(self, row, localized_size_mapping):
+        """Return a :class:`.Cache` object filled with data from one search results row."""
+        # parse raw data
+        cache_details = row.find("span", "cache-details").text.split("|")
+        wp = cache_details[1].strip()
+
+        # create and fill cache object
+        # values are sanitized and converted in Cache setters
+        c = Cache(self, wp)
+        c.type = cache_details[0]
+        c.name = row.find("span", "cache-name").text
+        badge = row.find("svg", class_="badge")
+        c.found = "found" in str(badge) if badge is not None else False
+        c.favorites = row.find(attrs={"data-column": "FavoritePoint"}).text
+        c.state = not (row.get("class") and "disabled" in row.get("class"))
+        c.pm_only = row.find("td", "pm-upsell") is not None
+
+        if c.pm_only:
+            # PM only caches doesn't have other attributes filled in
+            return c
+
+        c.size = localized_size_mapping[row.find(attrs={"data-column": "ContainerSize"}).text.strip()]
+        c.difficulty = row.find(attrs={"data-column": "Difficulty"}).text
+        c.terrain = row.find(attrs={"data-column": "Terrain"}).text
+        c.hidden = self._date_parser.parse(row.find(attrs={"data-column": "PlaceDate"}).text)
+        c.author = row.find("span", "owner").text[3:]  # delete "by "
+
+        logging.debug("Cache parsed: {}".format(c))
+        return c
 
     def _search_get_page(self, point, start_index):
         """Return one page for standard search as class:`bs4.BeautifulSoup` object.
@@ -299,60 +675,81 @@ class Geocaching(object):
         assert hasattr(point, "format") and callable(point.format)
         logging.debug("Loading page from start_index {}".format(start_index))
 
-        if start_index == 0:
-            # first request has to load normal search page
-            logging.debug("Using normal search endpoint")
+        with self._span("Geocaching.search.page", start_index):
 
-            # make request
-            res = self._request(self._urls["search"], params={
-                "origin": point.format_decimal(),
-            })
-            return res.find(id="geocaches"), res
+            if start_index == 0:
+                # first request has to load normal search page
+                logging.debug("Using normal search endpoint")
 
-        else:
-            # other requests can use AJAX endpoint
-            logging.debug("Using AJAX search endpoint")
+                # make request
+                res = self._request(self._urls["search"], params=self._search_params(point, start_index))
+                return res.find(id="geocaches"), res
+
+            else:
+                # other requests can use AJAX endpoint
+                logging.debug("Using AJAX search endpoint")
 
-            # make request
-            res = self._request(self._urls["search_more"], params={
-                "origin": point.format_decimal(),
-                "startIndex": start_index,
-                "ssvu": 2,
-                "selectAll": "false",
-            }, expect="json")
+                # make request
+                res = self._request(self._urls["search_more"], params=self._search_params(point, start_index),
+                                    expect="json")
 
-            return bs4.BeautifulSoup(res["HtmlString"].strip(), "html.parser"), None
+                return self._parse_html(res["HtmlString"].strip()), None
 
-    def search_quick(self, area, *, strict=False, zoom=None):
+    @staticmethod
+    def _search_params(point, start_index):
+        """Return query parameters of one search page (see :meth:`_search_get_page`)."""
+        if start_index == 0:
+            return {"origin": point.format_decimal()}
+        return {
+            "origin": point.format_decimal(),
+            "startIndex": start_index,
+            "ssvu": 2,
+            "selectAll": "false",
+        }
+
+    def search_quick(self, area, *, strict=False, zoom=None, workers=4):
         """Return a generator of caches in some area.
 
-        Area is converted to map tiles, each tile is then loaded and :class:`.Cache` objects are then
-        created from its blocks.
+        Area is converted to map tiles, which are loaded by a pool of worker threads, and
+        :class:`.Cache` objects are then created from their blocks. Caches are yielded as soon as
+        their tile is loaded. Each cache is yielded only once, even if it spans several tiles.
 
         :param bool strict: Whether to return caches strictly in the `area` and discard others.
         :param int zoom: Zoom level of tiles. You can also specify it manually, otherwise it is
             automatically determined for whole :class:`.Area` to fit into one :class:`.Tile`. Higher
             zoom level is more precise, but requires more tiles to be loaded.
+        :param int workers: Maximum number of concurrently loaded tiles.
         """
-        # FIXME
-        warnings.warn("Quick search is temporary disabled because of Groundspeak breaking change. "
-                      "If you would like to use it, please consider helping with this issue: "
-                      "https://github.com/tomasbedrich/pycaching/issues/75")
-        raise NotImplementedError()
-
-        # logging.info("Searching quick in {}".format(area))
-        #
-        # tiles = area.to_tiles(self, zoom)
-        # # TODO process tiles by multiple workers
-        # for tile in tiles:
-        #     for block in tile.blocks:
-        #         cache = Cache.from_block(block)
-        #         if strict and cache.location not in area:
-        #             # if strict mode is on and cache is not in area
-        #             continue
-        #         else:
-        #             # can yield more caches (which are not exactly in desired area)
-        #             yield cache
+        if workers < 1:
+            raise PycachingValueError("At least one worker is needed.")
+
+        logging.info("Searching quick in {}".format(area))
+
+        found = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(tile.load): tile for tile in area.to_tiles(self, zoom)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        tile = pending.pop(future)
+                        future.result()  # raise loading errors
+                        names = tile.cache_names
+                        # caches with invalid blocks are left out, they may be complete in another tile
+                        for wp, middle_point in tile.middle_points.items():
+                            if wp in found:
+                                continue
+                            found.add(wp)
+                            cache = Cache(self, wp, name=names[wp])
+                            cache.location = Point.from_tile(tile, middle_point)
+                            if strict and cache.location not in area:
+                                # if strict mode is on and cache is not in area
+                                continue
+                            yield cache
+            finally:
+                # the generator was closed early or loading failed
+                for future in pending:
+                    future.cancel()
 
     # add some shortcuts ------------------------------------------------------
 
@@ -366,6 +763,9 @@ class Geocaching(object):
     def get_cache(self, wp=None, guid=None):
         """Return a :class:`.Cache` object by its waypoint or GUID.
 
+        If :attr:`object_cache` contains a fresh snapshot of the cache, it is returned already
+        loaded, without any request.
+
         :param str wp: Cache waypoint.
         :param str guid: Cache GUID.
 
@@ -375,15 +775,115 @@ class Geocaching(object):
         if (wp is None) == (guid is None):
             raise TypeError('Please provide exactly one of `wp` or `guid`.')
         if wp is not None:
-            return Cache(self, wp)
+            return self._load_snapshot(Cache, wp) or Cache(self, wp)
         return self._cache_from_guid(guid)
 
+    def load_caches(self, wps, *, method="full", workers=4, ordered=True, on_error=None):
+        """Return a generator of loaded caches.
+
+        Caches are loaded concurrently by a pool of worker threads sharing this instance (and its
+        session). Yield :class:`.Cache` objects as soon as they are loaded, either in the same
+        order as `wps` or in order of completion.
+
+        Caches which fail to load are not yielded, the batch continues instead. Each failure is
+        passed to `on_error` or logged, if `on_error` is not set.
+
+        :param wps: Iterable of cache waypoints or :class:`.Cache` objects.
+        :param str method: Loading method, one of :code:`full` (:meth:`.Cache.load`),
+            :code:`quick` (:meth:`.Cache.load_quick`) or :code:`guid`
+            (:meth:`.Cache.load_by_guid`).
+        :param int workers: Maximum number of concurrently loaded caches.
+        :param bool ordered: Whether to yield caches in the same order as `wps`.
+        :param on_error: Callable taking the :class:`.Cache` and raised :class:`.Error` (eg.
+            :class:`.PMOnlyException` or :class:`.LoadError`) for each failed cache. Note that
+            PM only caches passed here have the basic details filled in.
+        """
+        loaders = {"full": Cache.load, "quick": Cache.load_quick, "guid": Cache.load_by_guid}
+        try:
+            loader = loaders[method]
+        except KeyError as e:
+            raise PycachingValueError("Unknown loading method '{}'.".format(method)) from e
+        if workers < 1:
+            raise PycachingValueError("At least one worker is needed.")
+
+        logging.info("Loading caches using {} workers".format(workers))
+
+        def load(cache):
+            try:
+                loader(cache)
+            except Error as e:
+                return cache, e
+            return cache, None
+
+        pending = deque() if ordered else set()
+
+        def collect():
+            """Wait for at least one pending cache and yield the loaded ones."""
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+            for future in done:
+                cache, error = future.result()
+                if error is None:
+                    yield cache
+                elif on_error:
+                    on_error(cache, error)
+                else:
+                    logging.warning("Cache {} cannot be loaded: {!r}".format(cache, error))
+
+        caches = (wp if isinstance(wp, Cache) else Cache(self, wp) for wp in wps)
+        add = pending.append if ordered else pending.add
+        max_pending = 2 * workers  # keep workers busy, but do not submit the whole iterable at once
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for cache in caches:
+                    add(executor.submit(load, cache))
+                    if len(pending) >= max_pending:
+                        yield from collect()
+                while pending:
+                    yield from collect()
+            finally:
+                # the generator was closed early
+                for future in pending:
+                    future.cancel()
+
     def get_trackable(self, tid):
         """Return a :class:`.Trackable` object by its trackable ID.
 
+        If :attr:`object_cache` contains a fresh snapshot of the trackable, it is returned already
+        loaded, without any request.
+
         :param str tid: Trackable ID.
         """
-        return Trackable(self, tid)
+        return self._load_snapshot(Trackable, tid) or Trackable(self, tid)
+
+    def _load_snapshot(self, object_class, id):
+        """Return an object created from fresh snapshot in :attr:`object_cache` or :code:`None`.
+
+        :param type object_class: :class:`.Cache` or :class:`.Trackable`.
+        :param str id: Cache waypoint or trackable ID.
+        """
+        if self.object_cache is None:
+            return None
+        snapshot = self.object_cache.get(self.object_cache.make_key(object_class, id, self._logged_username))
+        if snapshot is None:
+            return None
+        logging.debug("Using cached snapshot of {}".format(id))
+        return object_class.from_snapshot(self, snapshot)
+
+    def _store_snapshot(self, obj, id):
+        """Store a snapshot of a loaded :class:`.Cache` or :class:`.Trackable` in :attr:`object_cache`."""
+        if self.object_cache is not None:
+            key = self.object_cache.make_key(type(obj), id, self._logged_username)
+            self.object_cache.put(key, obj.to_snapshot())
+
+    def _forget_snapshot(self, object_class, id):
+        """Delete an object snapshot from :attr:`object_cache`, eg. after posting a log."""
+        if self.object_cache is not None:
+            self.object_cache.delete(self.object_cache.make_key(object_class, id, self._logged_username))
 
     def post_log(self, wp, text, type=LogType.found_it, date=None):
         """Post a log for cache.
@@ -413,8 +913,12 @@ class Geocaching(object):
             return self.get_cache(guid=guid)
         except PMOnlyException:
             url = self._request(Cache._urls["cache_details"], params={"guid": guid}, expect="raw").url
-            wp = url.split("/")[4].split("_")[0]  # get gccode from redirected url
-            return self.get_cache(wp)
+            return self.get_cache(self._wp_from_details_url(url))
+
+    @staticmethod
+    def _wp_from_details_url(url):
+        """Return cache waypoint from (redirected) cache details URL."""
+        return str(url).split("/")[4].split("_")[0]
 
     def my_logs(self, log_type=None, limit=float('inf')):
         """Get an iterable of the logged-in user's logs.
@@ -424,30 +928,46 @@ class Geocaching(object):
         :param limit: The maximum number of results to return (default: infinity).
         """
         logging.info("Getting {} of my logs of type {}".format(limit, log_type))
-        url = self._urls['my_logs']
-        if log_type is not None:
-            if isinstance(log_type, LogType):
-                log_type = log_type.value
-            url += '?lt={lt}'.format(lt=log_type)
-        cache_table = self._request(url).find(class_='Table')
-        if cache_table is None:  # no logs on the account
-            return
-        cache_table = cache_table.tbody
+        page = self._request(self._my_logs_url(log_type))
+
+        logs = self._parse_my_logs(page)
+        dates = self._date_parser.parse_many(date for _, date in logs)
 
         yielded = 0
-        for row in cache_table.find_all('tr'):
+        for (guid, _), date in zip(logs, dates):
             if yielded >= limit:
                 break
 
-            link = row.find(class_='ImageLink')['href']
-            guid = parse_qs(urlparse(link).query)['guid'][0]
             current_cache = self._try_getting_cache_from_guid(guid)
-            date = row.find_all('td')[2].text.strip()
             current_cache.visited = date
 
             yield current_cache
             yielded += 1
 
+    def _my_logs_url(self, log_type=None):
+        """Return URL of the page listing user's logs of given type."""
+        url = self._urls['my_logs']
+        if log_type is not None:
+            if isinstance(log_type, LogType):
+                log_type = log_type.value
+            url += '?lt={lt}'.format(lt=log_type)
+        return url
+
+    @staticmethod
+    def _parse_my_logs(page):
+        """Return a list of (cache GUID, log date) tuples from the page listing user's logs."""
+        cache_table = page.find(class_='Table')
+        if cache_table is None:  # no logs on the account
+            return []
+
+        logs = []
+        for row in cache_table.tbody.find_all('tr'):
+            link = row.find(class_='ImageLink')['href']
+            guid = parse_qs(urlparse(link).query)['guid'][0]
+            date = row.find_all('td')[2].text.strip()
+            logs.append((guid, date))
+        return logs
+
     def my_finds(self, limit=float('inf')):
         """Get an iterable of the logged-in user's finds.
 
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import Counter, namedtuple
+
+#: Statistics of one :meth:`.Geocaching._request` call.
+#:
+#: - :code:`endpoint` - host and path of the URL, see :func:`.util.endpoint_key`
+#: - :code:`method` - HTTP method
+#: - :code:`status` - response status code or :code:`None`, if no response was received
+#: - :code:`bytes` - length of the response body
+#: - :code:`network_time` - seconds spent waiting for the response (including rate limiting and
+#:   retries)
+#: - :code:`parse_time` - seconds spent parsing the response by BeautifulSoup or JSON decoder
+#: - :code:`retries` - number of retries done by :class:`.RetryPolicy`
+#: - :code:`cached` - whether the response was returned from :class:`.ResponseCache`
+#: - :code:`error` - name of the exception class, if the request failed
+RequestRecord = namedtuple("RequestRecord", "endpoint method status bytes network_time parse_time retries "
+                                            "cached error")
+
+#: Statistics of one higher-level operation, eg. :code:`Cache.load`.
+#:
+#: - :code:`name` - name of the operation
+#: - :code:`key` - identifier of the processed object (eg. GC code) or :code:`None`
+#: - :code:`duration` - seconds spent in the operation
+#: - :code:`error` - name of the exception class, if the operation failed
+SpanRecord = namedtuple("SpanRecord", "name key duration error")
+
+
+class Hook(object):
+    """Base of instrumentation hooks, passed to :class:`.Geocaching`.
+
+    Subclass it and override the methods to export the statistics to your metrics system. The
+    methods are called synchronously by the thread doing the request, so they should be fast.
+    """
+
+    def on_request(self, record):
+        """Called after each request.
+
+        :param .RequestRecord record: Request statistics.
+        """
+
+    def on_span(self, record):
+        """Called after each instrumented operation.
+
+        Operations are :code:`Cache.load`, :code:`Cache.load_quick`, :code:`Cache.load_by_guid`,
+        :code:`Geocaching.search.page` (loading one page of search results) and :code:`Tile.load`.
+
+        :param .SpanRecord record: Operation statistics.
+        """
+
+
+class MetricsAggregator(Hook):
+    """Hook summing up request and operation statistics in memory.
+
+    Useful to tell whether a job is network-bound or parser-bound, see :meth:`summary`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all collected statistics."""
+        with self._lock:
+            self._requests = {}
+            self._spans = {}
+
+    def on_request(self, record):
+        with self._lock:
+            stats = self._requests.get(record.endpoint)
+            if stats is None:
+                stats = self._requests[record.endpoint] = {
+                    "count": 0, "errors": 0, "retries": 0, "cached": 0, "bytes": 0, "network_time": 0.0,
+                    "max_network_time": 0.0, "parse_time": 0.0, "statuses": Counter()}
+            stats["count"] += 1
+            stats["errors"] += record.error is not None
+            stats["retries"] += record.retries
+            stats["cached"] += record.cached
+            stats["bytes"] += record.bytes
+            stats["network_time"] += record.network_time
+            stats["max_network_time"] = max(stats["max_network_time"], record.network_time)
+            stats["parse_time"] += record.parse_time
+            if record.status is not None:
+                stats["statuses"][record.status] += 1
+
+    def on_span(self, record):
+        with self._lock:
+            stats = self._spans.get(record.name)
+            if stats is None:
+                stats = self._spans[record.name] = {"count": 0, "errors": 0, "time": 0.0, "max_time": 0.0}
+            stats["count"] += 1
+            stats["errors"] += record.error is not None
+            stats["time"] += record.duration
+            stats["max_time"] = max(stats["max_time"], record.duration)
+
+    def summary(self):
+        """Return collected statistics.
+
+        :return: Dictionary with keys :code:`requests` (statistics keyed by endpoint) and
+            :code:`spans` (statistics keyed by operation name).
+        :rtype: :class:`dict`
+        """
+        with self._lock:
+            requests = {endpoint: dict(stats, statuses=dict(stats["statuses"]))
+                        for endpoint, stats in self._requests.items()}
+            spans = {name: dict(stats) for name, stats in self._spans.items()}
+        return {"requests": requests, "spans": spans}
@@ -2,6 +2,7 @@
 
 import datetime
 import enum
+import sys
 from pycaching import errors
 from pycaching.util import parse_date
 
@@ -12,7 +13,13 @@ _type = type
 class Log(object):
     """Represents a log record with its properties."""
 
-    def __init__(self, *, type=None, text=None, visited=None, author=None):
+    __slots__ = ("_id", "_created", "_type", "_text", "_visited", "_author")
+
+    def __init__(self, *, type=None, text=None, visited=None, author=None, id=None, created=None):
+        if id is not None:
+            self.id = id
+        if created is not None:
+            self.created = created
         if type is not None:
             self.type = type
         if text is not None:
@@ -22,10 +29,92 @@ class Log(object):
         if author is not None:
             self.author = author
 
+    @classmethod
+    def _from_logbook_data(cls, data, *, created=None, visited=None):
+        """Create a log instance from one item of logbook page JSON.
+
+        :param datetime.date created: Already parsed creation date, parsed from data if not given.
+        :param datetime.date visited: Already parsed log date, parsed from data if not given.
+        """
+        img_filename = data["LogTypeImage"].rsplit(".", 1)[0]  # filename w/o extension
+
+        # create and fill log object
+        log = cls()
+        log.id = data["LogID"]
+        log.created = created or data["Created"]
+        log.type = Type.from_filename(img_filename)
+        log.text = data["LogText"]
+        log.visited = visited or data["Visited"]
+        log.author = data["UserName"]
+        return log
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Return a log from a snapshot created by :meth:`to_snapshot`."""
+        log = cls(text=snapshot.get("text"), author=snapshot.get("author"), id=snapshot.get("id"))
+        if "type" in snapshot:
+            log.type = Type(snapshot["type"])
+        if "visited" in snapshot:
+            log.visited = datetime.datetime.strptime(snapshot["visited"], "%Y-%m-%d").date()
+        if "created" in snapshot:
+            log.created = datetime.datetime.strptime(snapshot["created"], "%Y-%m-%d").date()
+        return log
+
+    def to_snapshot(self):
+        """Return a snapshot of the filled in log properties, which can be serialized to JSON.
+
+        :rtype: :class:`dict`
+        """
+        snapshot = {}
+        if hasattr(self, "_id"):
+            snapshot["id"] = self._id
+        if hasattr(self, "_created"):
+            snapshot["created"] = self._created.isoformat()
+        if hasattr(self, "_type"):
+            snapshot["type"] = self._type.value
+        if hasattr(self, "_text"):
+            snapshot["text"] = self._text
+        if hasattr(self, "_visited"):
+            snapshot["visited"] = self._visited.isoformat()
+        if hasattr(self, "_author"):
+            snapshot["author"] = self._author
+        return snapshot
+
     def __str__(self):
         """Return log text."""
         return self.text
 
+    @property
+    def id(self):
+        """The log ID, which grows with time of log creation.
+
+        :type: :class:`int`
+        """
+        return self._id
+
+    @id.setter
+    def id(self, id):
+        self._id = int(id)
+
+    @property
+    def created(self):
+        """The date of log creation, which can differ from :attr:`visited`.
+
+        :setter: Set a log creation date. If :class:`str` is passed, then :meth:`.util.parse_date`
+            is used and its return value is stored as a date.
+        :type: :class:`datetime.date`
+        """
+        return self._created
+
+    @created.setter
+    def created(self, created):
+        if _type(created) is str:
+            created = parse_date(created)
+        elif _type(created) is not datetime.date:
+            raise errors.ValueError(
+                "Passed object is not datetime.date instance nor string containing a date.")
+        self._created = created
+
     @property
     def type(self):
         """The log type.
@@ -80,7 +169,7 @@ class Log(object):
 
     @author.setter
     def author(self, author):
-        self._author = author.strip()
+        self._author = sys.intern(author.strip())  # shared by all logs of the author
 
 
 class Type(enum.Enum):
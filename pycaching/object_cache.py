@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ObjectCache(object):
+    """Cache of parsed objects used by :meth:`.Geocaching.get_cache` and
+    :meth:`.Geocaching.get_trackable`.
+
+    Stores snapshots of fully loaded :class:`.Cache` and :class:`.Trackable` objects (see
+    :meth:`.Cache.to_snapshot`), so they can be returned again without any downloading or parsing.
+    Snapshots are kept in memory, evicting the least recently used ones over :attr:`max_items`.
+    If a database path is given, snapshots are also stored on disk, so they survive between
+    program runs.
+
+    Each snapshot is fresh for :attr:`ttl` seconds, stale snapshots are never returned.
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS objects (
+            key TEXT PRIMARY KEY,
+            snapshot TEXT NOT NULL,
+            stored_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path=None, *, ttl=24 * 3600, max_items=1000):
+        """Create an object cache.
+
+        :param str path: Path to the SQLite database file for the disk tier. Only the in-memory
+            tier is used if not given.
+        :param int ttl: Time-to-live of snapshots in seconds.
+        :param int max_items: Maximum number of snapshots kept in memory.
+        """
+        self.ttl = ttl
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(self._schema)
+
+    @property
+    def stats(self):
+        """Counters of cache hits and misses.
+
+        :type: :class:`dict`
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def make_key(object_class, id, username=None):
+        """Return a cache key for an object of given class and ID (waypoint, trackable ID)."""
+        return "{} {} {}".format(object_class.__name__, str(id).upper().strip(), username or "")
+
+    def get(self, key):
+        """Return a fresh snapshot stored for a key, or :code:`None`.
+
+        :rtype: :class:`dict`
+        """
+        with self._lock:
+            snapshot = self._get(key)
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return snapshot
+
+    def _get(self, key):
+        now = time.time()
+        if key in self._memory:
+            stored_at, data = self._memory[key]
+            if now - stored_at < self.ttl:
+                self._memory.move_to_end(key)
+                return json.loads(data)
+            del self._memory[key]
+
+        if self._db is not None:
+            row = self._db.execute("SELECT snapshot, stored_at FROM objects WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] < self.ttl:
+                data, stored_at = row
+                self._remember(key, stored_at, data)  # promote to memory
+                return json.loads(data)
+
+        return None
+
+    def put(self, key, snapshot):
+        """Store a snapshot."""
+        # kept serialized, so the returned snapshots are never shared
+        data = json.dumps(snapshot)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, data)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?)", (key, data, now))
+
+    def _remember(self, key, stored_at, data):
+        """Store a serialized snapshot in memory, evicting least recently used ones over the limit."""
+        self._memory[key] = stored_at, data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def delete(self, key):
+        """Delete a snapshot, eg. after the object has changed."""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM objects WHERE key = ?", (key,))
+
+    def __len__(self):
+        """Return number of snapshots in memory."""
+        return len(self._memory)
+
+    def clear(self):
+        """Delete all stored snapshots."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM objects")
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
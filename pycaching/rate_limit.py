@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket(object):
+    """Token bucket allowing a given rate of requests with short bursts.
+
+    The rate can be lowered when the server starts throttling and it slowly recovers then.
+    """
+
+    def __init__(self, rate, burst, *, min_rate=0.1):
+        """Create a full token bucket.
+
+        :param float rate: Maximum number of requests per second.
+        :param int burst: Number of requests which can be sent at once after a period of inactivity.
+        :param float min_rate: The rate is never lowered below this value.
+        """
+        self.max_rate = self.rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, waiting until one is available.
+
+        Tokens are reserved in order of calls, so concurrent callers are served fairly.
+
+        :return: Time waited in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(-self._tokens / self.rate, self._blocked_until - now)
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0)
+
+    def slow_down(self, factor, retry_after=None):
+        """Lower the rate by a factor and optionally block all requests for some time.
+
+        :param float factor: Multiplier of the current rate, between 0 and 1.
+        :param float retry_after: Number of seconds to wait before the next request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * factor)
+            self._tokens = min(self._tokens, 0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def recover(self, step):
+        """Raise the rate by a step, up to the maximum rate.
+
+        :param float step: Fraction of the maximum rate to add.
+        """
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * step)
+
+
+class RateLimiter(object):
+    """Per-host rate limiter used by :meth:`.Geocaching._request`.
+
+    Requests are divided into budgets by host and kind of endpoint - HTML pages (:code:`html`),
+    AJAX JSON endpoints (:code:`ajax`) and map tiles (:code:`tile`). Each budget is a token bucket
+    allowing a rate of requests per second with short bursts.
+
+    When the server responds by 429 or 503 status, or with no content (204) to a page or AJAX
+    request, the rate of the budget is lowered (multiplicative decrease) and :code:`Retry-After`
+    header is respected. Map tiles with no caches are normally empty (204), so that does not count
+    as throttling for tiles. Each
+    successful response then raises the rate a bit (additive increase) back to its maximum.
+
+    One limiter can be shared by multiple :class:`.Geocaching` instances and threads.
+    """
+
+    #: Default maximum rates of requests per second, keyed by kind of endpoint.
+    default_rates = {"html": 2.0, "ajax": 4.0, "tile": 10.0}
+
+    #: Default bursts, keyed by kind of endpoint.
+    default_bursts = {"html": 5, "ajax": 10, "tile": 20}
+
+    #: Response statuses considered as throttling, keyed by kind of endpoint.
+    throttle_statuses = {
+        "html": frozenset({204, 429, 503}),
+        "ajax": frozenset({204, 429, 503}),
+        "tile": frozenset({429, 503}),  # empty tiles are 204
+    }
+
+    def __init__(self, rates=None, bursts=None, *, min_rate=0.1, backoff=0.5, recovery=0.05):
+        """Create a rate limiter.
+
+        :param dict rates: Maximum rates of requests per second, keyed by kind of endpoint. Missing
+            kinds use :attr:`default_rates`.
+        :param dict bursts: Bursts, keyed by kind of endpoint. Missing kinds use
+            :attr:`default_bursts`.
+        :param float min_rate: Minimum rate the throttled budgets can be lowered to.
+        :param float backoff: Multiplier of a rate, when the server throttles.
+        :param float recovery: Fraction of the maximum rate added after each successful response.
+        """
+        self.rates = dict(self.default_rates, **(rates or {}))
+        self.bursts = dict(self.default_bursts, **(bursts or {}))
+        self.min_rate = min_rate
+        self.backoff = backoff
+        self.recovery = recovery
+        self.throttled = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def budget(url, expect=None):
+        """Return a budget key (host, kind) for a request.
+
+        :param str url: Absolute request URL.
+        :param str expect: Expected type of data, as passed to :meth:`.Geocaching._request`.
+        """
+        parsed = urlparse(url)
+        host = parsed.hostname or ""
+        if host.startswith("tiles") or parsed.path.startswith("/map."):
+            kind = "tile"
+        elif expect == "json":
+            kind = "ajax"
+        else:
+            kind = "html"
+        return host, kind
+
+    def _bucket(self, budget):
+        with self._lock:
+            bucket = self._buckets.get(budget)
+            if bucket is None:
+                kind = budget[1]
+                bucket = self._buckets[budget] = TokenBucket(self.rates[kind], self.bursts[kind],
+                                                             min_rate=self.min_rate)
+            return bucket
+
+    def acquire(self, budget):
+        """Wait until a request within the budget can be sent.
+
+        :return: Time waited in seconds.
+        """
+        return self._bucket(budget).acquire()
+
+    def update(self, budget, response):
+        """Adapt the rate of a budget according to a received response."""
+        bucket = self._bucket(budget)
+        if response.status_code in self.throttle_statuses[budget[1]]:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None  # HTTP date is not supported
+            bucket.slow_down(self.backoff, retry_after)
+            with self._lock:
+                self.throttled += 1
+            logging.debug("Throttled by {} (status {}), slowing down to {:.2f} requests/s".format(
+                budget[0], response.status_code, bucket.rate))
+        elif response.status_code < 400:
+            bucket.recover(self.recovery)
+
+    @property
+    def current_rates(self):
+        """Current rates of requests per second, keyed by budget (host, kind).
+
+        :type: :class:`dict`
+        """
+        with self._lock:
+            return {budget: bucket.rate for budget, bucket in self._buckets.items()}
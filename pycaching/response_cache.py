@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ResponseCache(object):
+    """Persistent HTTP response cache used by :meth:`.Geocaching._request`.
+
+    Stores successful responses to GET requests in SQLite database, keyed by method, URL, query
+    parameters and logged-in user. Each response is fresh for a time-to-live determined by its
+    endpoint, see :attr:`ttls`. Stale responses are revalidated using :code:`ETag` and
+    :code:`Last-Modified` headers, if the server has sent them. Least recently used responses are
+    evicted when total size of stored bodies exceeds :attr:`max_size`.
+
+    POST requests and login pages are never cached.
+    """
+
+    #: Default time-to-live of responses in seconds, keyed by URL part.
+    default_ttls = {
+        "seek/cache_details.aspx": 24 * 3600,
+        "seek/cdpf.aspx": 24 * 3600,
+        "tiles01.geocaching.com/map.details": 24 * 3600,
+    }
+
+    #: URL parts of pages which are never cached.
+    _never_cache = ("account/signin", "account/logout")
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            encoding TEXT,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            used_at REAL NOT NULL,
+            ttl REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path=":memory:", *, ttls=None, default_ttl=0, max_size=100 * 2 ** 20):
+        """Create or open a response cache.
+
+        :param str path: Path to the SQLite database file (:code:`:memory:` for a non-persistent
+            cache).
+        :param dict ttls: Time-to-live of responses in seconds, keyed by URL part. Matching key
+            found in request URL is used, longer keys take precedence. If :code:`None`,
+            :attr:`default_ttls` are used.
+        :param int default_ttl: Time-to-live for URLs not matching any key in `ttls`. Zero means
+            that such responses are not cached at all.
+        :param int max_size: Maximum total size of stored response bodies in bytes.
+        """
+        self.ttls = dict(self.default_ttls if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(self._schema)
+
+    @property
+    def stats(self):
+        """Counters of cache hits, misses and successful revalidations.
+
+        :type: :class:`dict`
+        """
+        return {"hits": self.hits, "misses": self.misses, "revalidations": self.revalidations}
+
+    def ttl(self, url):
+        """Return time-to-live in seconds for given URL."""
+        for part in sorted(self.ttls, key=len, reverse=True):
+            if part in url:
+                return self.ttls[part]
+        return self.default_ttl
+
+    def is_cacheable(self, method, url):
+        """Return whether a request can be served from cache."""
+        if method.upper() != "GET" or any(part in url for part in self._never_cache):
+            return False
+        return self.ttl(url) > 0
+
+    @staticmethod
+    def make_key(method, url, params=None, username=None):
+        """Return a cache key for a request."""
+        if params:
+            params = urlencode(sorted(params.items()) if isinstance(params, dict) else params)
+        return "{} {} {} {}".format(method.upper(), url, params or "", username or "")
+
+    def get(self, key):
+        """Return stored response for a key.
+
+        Fresh responses are counted as hits.
+
+        :return: Tuple of (:class:`requests.Response`, :class:`bool` whether the response is
+            fresh, :class:`dict` of revalidation headers) or :code:`None`, if nothing is stored.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT url, status, headers, encoding, body, stored_at, ttl FROM responses "
+                                   "WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            url, status, headers, encoding, body, stored_at, ttl = row
+            fresh = time.time() - stored_at < ttl
+            if fresh:
+                self.hits += 1
+                with self._db:
+                    self._db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = encoding
+        response._content = bytes(body)
+
+        validators = {}
+        if "ETag" in response.headers:
+            validators["If-None-Match"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+
+        return response, fresh, validators
+
+    def revalidate(self, key):
+        """Mark a stored response as fresh again, after the server confirmed it is still valid."""
+        now = time.time()
+        with self._lock, self._db:
+            self.revalidations += 1
+            self._db.execute("UPDATE responses SET stored_at = ?, used_at = ? WHERE key = ?", (now, now, key))
+
+    def store(self, key, response, url=None):
+        """Store a response downloaded because of cache miss.
+
+        Only successful responses are stored, responses redirected to a login page are not.
+        Least recently used responses are evicted, if the size limit is exceeded.
+
+        :param str url: Requested URL, which determines time-to-live of the response. The
+            response URL (after redirects) is used if not given.
+        """
+        with self._lock:
+            self.misses += 1
+
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        if any(part in response.url for part in self._never_cache):
+            return
+
+        body = response.content
+        if len(body) > self.max_size:
+            return
+
+        now = time.time()
+        headers = json.dumps(dict(response.headers))
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (key, response.url, response.status_code, headers, response.encoding,
+                              sqlite3.Binary(body), len(body), now, now, self.ttl(url or response.url)))
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used responses until total size fits the limit."""
+        total, = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_size:
+            return
+
+        evicted = 0
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY used_at").fetchall():
+            if total <= self.max_size:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logging.debug("Evicted {} responses from cache".format(evicted))
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        """Delete all stored responses."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._db.close()
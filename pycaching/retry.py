@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+import requests
+
+from pycaching.util import endpoint_key
+
+
+class RetryPolicy(object):
+    """Policy of retrying failed requests, used by :meth:`.Geocaching._request`.
+
+    Only idempotent requests (GET, HEAD) are retried, never POSTs like posting a log. A request is
+    retried after a connection error, a timeout or a 5xx response, at most :attr:`max_retries`
+    times. Delays between attempts grow exponentially and are randomized ("full jitter"), so
+    concurrent workers don't retry all at once.
+
+    Each endpoint (host and path) also has a retry budget - the number of retries can exceed
+    :attr:`min_budget` only by :attr:`budget_ratio` of all requests to the endpoint. This stops
+    the retries from multiplying the load, when an endpoint is down.
+
+    One policy can be shared by multiple :class:`.Geocaching` instances and threads.
+    """
+
+    #: HTTP methods which are safe to retry.
+    retry_methods = frozenset({"GET", "HEAD"})
+
+    #: Response statuses which are retried.
+    retry_statuses = frozenset({500, 502, 503, 504})
+
+    #: Exceptions which are retried.
+    retry_exceptions = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError)
+
+    def __init__(self, max_retries=3, *, backoff=0.5, max_backoff=30.0, budget_ratio=0.2, min_budget=10):
+        """Create a retry policy.
+
+        :param int max_retries: Maximum number of retries of one request.
+        :param float backoff: Base of the delay before a retry in seconds, the n-th retry waits
+            a random time up to :code:`backoff * 2 ** n`.
+        :param float max_backoff: Maximum delay before a retry in seconds.
+        :param float budget_ratio: Allowed ratio of retries to requests per endpoint.
+        :param int min_budget: Number of retries per endpoint always allowed.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+        self.requests = Counter()
+        self.retries = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        """Numbers of requests and retries, keyed by endpoint.
+
+        :type: :class:`dict`
+        """
+        with self._lock:
+            return {"requests": dict(self.requests), "retries": dict(self.retries)}
+
+    def delay(self, retry):
+        """Return a randomized delay in seconds before the n-th retry (counted from 0)."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** retry))
+
+    def _allow_retry(self, endpoint):
+        """Take a retry from the endpoint budget, if there is any left."""
+        with self._lock:
+            if self.retries[endpoint] >= self.min_budget + self.budget_ratio * self.requests[endpoint]:
+                return False
+            self.retries[endpoint] += 1
+            return True
+
+    def call(self, method, url, send):
+        """Call a function sending the request, retrying it as allowed by the policy.
+
+        :param str method: HTTP method of the request.
+        :param str url: Absolute request URL.
+        :param send: Callable without arguments, which sends the request and returns
+            :class:`requests.Response`.
+        :return: The last response.
+        :raise requests.exceptions.RequestException: The last error, if the request failed.
+        """
+        endpoint = endpoint_key(url)
+        with self._lock:
+            self.requests[endpoint] += 1
+        idempotent = method.upper() in self.retry_methods
+
+        retry = 0
+        while True:
+            try:
+                res = send()
+            except self.retry_exceptions as e:
+                if not idempotent or retry >= self.max_retries or not self._allow_retry(endpoint):
+                    raise
+                reason = type(e).__name__
+            else:
+                if res.status_code not in self.retry_statuses or not idempotent \
+                        or retry >= self.max_retries or not self._allow_retry(endpoint):
+                    return res
+                reason = "status {}".format(res.status_code)
+
+            delay = self.delay(retry)
+            logging.debug("Retrying {} after {} in {:.2f} s".format(url, reason, delay))
+            time.sleep(delay)
+            retry += 1
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+import abc
+import json
+import logging
+import os
+import tempfile
+import time
+
+
+class SessionStore(abc.ABC):
+    """Base of stores of authenticated sessions, passed to :class:`.Geocaching`.
+
+    A store keeps the username and session cookies after login, so the next program run can
+    continue the session without logging in again. Subclass it and override :meth:`_read`,
+    :meth:`_write` and :meth:`clear` to keep the session elsewhere.
+    """
+
+    def load(self):
+        """Return the stored session or :code:`None`, if there is no usable session.
+
+        Expired cookies are left out. A session without any valid cookie is not usable.
+
+        :return: Tuple of username and a list of cookies (dictionaries as returned by
+            :func:`dump_cookies`).
+        :rtype: :class:`tuple` or :code:`None`
+        """
+        try:
+            data = self._read()
+            if data is None:
+                return None
+            state = json.loads(data)
+            username, cookies = state["username"], state["cookies"]
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            logging.warning("Cannot load stored session: {}".format(e))
+            return None
+
+        now = time.time()
+        cookies = [c for c in cookies if c.get("expires") is None or c["expires"] > now]
+        if not cookies:
+            return None
+        return username, cookies
+
+    def save(self, username, cookies):
+        """Store the session.
+
+        :param str username: Name of the logged user.
+        :param list cookies: Session cookies, see :func:`dump_cookies`.
+        """
+        self._write(json.dumps({"username": username, "cookies": cookies}))
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove the stored session."""
+
+    @abc.abstractmethod
+    def _read(self):
+        """Return the stored JSON data or :code:`None`."""
+
+    @abc.abstractmethod
+    def _write(self, data):
+        """Store JSON data."""
+
+
+class FileSessionStore(SessionStore):
+    """Store of an authenticated session in a JSON file readable only by its owner.
+
+    The file is replaced atomically, so it can be shared by multiple worker processes.
+    """
+
+    def __init__(self, path):
+        """Create a file session store.
+
+        :param str path: Path to the file.
+        """
+        self.path = path
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, "w") as f:  # mkstemp creates the file with 0600 permissions
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class KeyringSessionStore(SessionStore):
+    """Store of an authenticated session in the system keyring.
+
+    Requires the `keyring <https://pypi.org/project/keyring/>`_ package.
+    """
+
+    def __init__(self, service="pycaching", key="session"):
+        """Create a keyring session store.
+
+        :param str service: Service name of the keyring entry.
+        :param str key: Username of the keyring entry (not the geocaching.com username).
+        """
+        import keyring
+        self._keyring = keyring
+        self.service = service
+        self.key = key
+
+    def _read(self):
+        return self._keyring.get_password(self.service, self.key)
+
+    def _write(self, data):
+        self._keyring.set_password(self.service, self.key, data)
+
+    def clear(self):
+        try:
+            self._keyring.delete_password(self.service, self.key)
+        except self._keyring.errors.PasswordDeleteError:
+            pass
+
+
+def dump_cookies(jar):
+    """Return cookies from a cookie jar as a list of JSON serializable dictionaries.
+
+    :param http.cookiejar.CookieJar jar: Cookie jar, eg. :attr:`requests.Session.cookies`.
+    :rtype: :class:`list` of :class:`dict`
+    """
+    return [{
+        "name": c.name,
+        "value": c.value,
+        "domain": c.domain,
+        "path": c.path,
+        "expires": c.expires,
+        "secure": c.secure,
+        "rest": {"HttpOnly": None} if c.has_nonstandard_attr("HttpOnly") else {},
+    } for c in jar]
+
+
+def load_cookies(jar, cookies):
+    """Put cookies from a list returned by :func:`dump_cookies` to a cookie jar.
+
+    :param requests.cookies.RequestsCookieJar jar: Cookie jar, eg. :attr:`requests.Session.cookies`.
+    :param list cookies: Cookies to put.
+    """
+    for c in cookies:
+        jar.set(c["name"], c["value"], domain=c["domain"], path=c["path"], expires=c["expires"],
+                secure=c["secure"], rest=c.get("rest", {}))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+from bs4 import SoupStrainer
+
+
+class CacheDetailsStrainer(SoupStrainer):
+    """Filter for cache details page, keeping only the regions used by :meth:`.Cache.load`.
+
+    Each tag outside of already kept regions is checked and kept with all its content if it
+    matches any of the names, IDs or classes below. Everything else is skipped during parsing.
+    """
+
+    _names = {"title", "script"}
+    _ids = {
+        "ctl00_divContentMain",  # PM only caches
+        "cacheDetails",
+        "uxLatLon",
+        "ctl00_ContentBody_GeoNav_logTypeImage",
+        "ctl00_ContentBody_ShortDescription",
+        "ctl00_ContentBody_LongDescription",
+        "div_hint",
+        "ctl00_ContentBody_Waypoints",
+        "ctl00_ContentBody_lblFindCounts",
+    }
+    _classes = {
+        "premium-upgrade-widget",
+        "Warning",
+        "CacheStarLabels",
+        "CacheSize",
+        "CacheDetailNavigationWidget",
+        "OldWarning",
+        "favorite-value",
+    }
+
+    def _match(self, name, attrs):
+        if name in self._names or attrs.get("id") in self._ids:
+            return True
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not self._classes.isdisjoint(classes)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # bs4 >= 4.13
+        return self._match(name, attrs or {})
+
+    def allow_string_creation(self, string):
+        # bs4 >= 4.13
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # bs4 < 4.13
+        return self._match(markup_name, markup_attrs or {})
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import sqlite3
+import threading
+import time
+
+
+class TileHistory(object):
+    """History of UTFGrid downloads, used by :class:`.Tile` to avoid needless requests.
+
+    The tile server sometimes serves an UTFGrid only after the map tile image (.png) has been
+    requested. Without any knowledge, a grid is requested first and if it has no content, the
+    image and the grid again - three requests for such tile. The history remembers for each tile,
+    whether the image was needed and when it was last downloaded, and for each zoom level, how
+    often a grid requested first fails. From that it predicts, whether to start with the image.
+    It also remembers empty tiles, so a grid without content is trusted for them.
+
+    The history is kept in memory. If a database path is given, it is also stored on disk, so it
+    survives between program runs. One history can be shared by multiple :class:`.Geocaching`
+    instances and threads.
+    """
+
+    #: Grid is served without requesting the image first.
+    direct = "direct"
+
+    #: Grid is served only after requesting the image.
+    needs_png = "png"
+
+    #: Tile has no content.
+    empty = "empty"
+
+    _schema = (
+        """
+        CREATE TABLE IF NOT EXISTS tiles (
+            z INTEGER NOT NULL,
+            x INTEGER NOT NULL,
+            y INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            png_at REAL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (z, x, y)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS zooms (
+            z INTEGER PRIMARY KEY,
+            failure_rate REAL NOT NULL,
+            samples INTEGER NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, path=None, *, ttl=7 * 24 * 3600, png_ttl=600, threshold=0.5, min_samples=5,
+                 smoothing=0.2):
+        """Create or open a tile history.
+
+        :param str path: Path to the SQLite database file. The history is kept only in memory if
+            not given.
+        :param int ttl: Number of seconds, for which the recorded state of a tile is used.
+        :param int png_ttl: Number of seconds after downloading a tile image, for which its grid is
+            expected to be served directly.
+        :param float threshold: Ratio of failed direct grid requests on a zoom level, from which
+            the image is requested first for unknown tiles.
+        :param int min_samples: Number of direct grid requests on a zoom level needed to use its
+            failure ratio.
+        :param float smoothing: Weight of the latest direct grid request in the failure ratio.
+        """
+        self.ttl = ttl
+        self.png_ttl = png_ttl
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._tiles = {}
+        self._zooms = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                for schema in self._schema:
+                    self._db.execute(schema)
+                for z, x, y, state, png_at, updated_at in self._db.execute("SELECT * FROM tiles"):
+                    self._tiles[z, x, y] = state, png_at, updated_at
+                for z, failure_rate, samples in self._db.execute("SELECT * FROM zooms"):
+                    self._zooms[z] = failure_rate, samples
+
+    def predict(self, z, x, y):
+        """Return expected state of a tile: :attr:`direct`, :attr:`needs_png` or :attr:`empty`."""
+        now = time.time()
+        with self._lock:
+            tile = self._tiles.get((z, x, y))
+            if tile is not None and now - tile[2] < self.ttl:
+                state, png_at, _ = tile
+                if state == self.empty:
+                    return self.empty
+                if png_at is not None and now - png_at < self.png_ttl:
+                    return self.direct
+                return state
+
+            failure_rate, samples = self._zooms.get(z, (0.0, 0))
+            if samples >= self.min_samples and failure_rate >= self.threshold:
+                return self.needs_png
+            return self.direct
+
+    def record(self, z, x, y, state, *, png_loaded, direct_failed=None):
+        """Record result of a tile download.
+
+        :param str state: Found out state of the tile.
+        :param bool png_loaded: Whether the tile image was downloaded.
+        :param bool direct_failed: Whether the grid requested first had no content, or
+            :code:`None`, if the image was requested first.
+        """
+        now = time.time()
+        with self._lock:
+            previous = self._tiles.get((z, x, y))
+            png_at = now if png_loaded else (previous[1] if previous else None)
+            self._tiles[z, x, y] = state, png_at, now
+
+            if direct_failed is not None:
+                failure_rate, samples = self._zooms.get(z, (0.0, 0))
+                if samples:
+                    failure_rate += self.smoothing * (direct_failed - failure_rate)
+                else:
+                    failure_rate = float(direct_failed)
+                self._zooms[z] = failure_rate, samples + 1
+
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?, ?, ?)",
+                                     (z, x, y, state, png_at, now))
+                    if direct_failed is not None:
+                        self._db.execute("INSERT OR REPLACE INTO zooms VALUES (?, ?, ?)", (z,) + self._zooms[z])
+
+    def __len__(self):
+        """Return number of recorded tiles."""
+        return len(self._tiles)
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
+import sys
+
 from pycaching import errors
-from pycaching.util import lazy_loaded, format_date
+from pycaching.util import lazy_loaded, format_date, check_synchronous
 
 # prefix _type() function to avoid collisions with trackable type
 _type = type
@@ -10,6 +12,9 @@ _type = type
 class Trackable(object):
     """Represents a trackable with its properties."""
 
+    __slots__ = ("_geocaching", "_tid", "url", "_name", "_location", "_owner", "_type", "_description", "_goal",
+                 "_log_page_url", "_kml_url", "__weakref__")
+
     def __init__(self, geocaching, tid, *, name=None, location=None, owner=None,
                  type=None, description=None, goal=None, url=None):
         self.geocaching = geocaching
@@ -32,6 +37,41 @@ class Trackable(object):
         self._log_page_url = None
         self._kml_url = None
 
+    # snapshot keys mapped to names of attributes storing the properties
+    _snapshot_attributes = {
+        "tid": "_tid",
+        "url": "url",
+        "name": "_name",
+        "location": "_location",
+        "owner": "_owner",
+        "type": "_type",
+        "description": "_description",
+        "goal": "_goal",
+        "log_page_url": "_log_page_url",
+        "kml_url": "_kml_url",
+    }
+
+    @classmethod
+    def from_snapshot(cls, geocaching, snapshot):
+        """Return :class:`.Trackable` instance from a snapshot created by :meth:`to_snapshot`.
+
+        :param .Geocaching geocaching: Reference to :class:`.Geocaching` instance.
+        :param dict snapshot: Trackable snapshot.
+        """
+        t = cls(geocaching, None)
+        for name, attribute in cls._snapshot_attributes.items():
+            if name in snapshot:
+                setattr(t, attribute, snapshot[name])
+        return t
+
+    def to_snapshot(self):
+        """Return a snapshot of all properties filled in, which can be serialized to JSON.
+
+        :rtype: :class:`dict`
+        """
+        return {name: getattr(self, attribute) for name, attribute in self._snapshot_attributes.items()
+                if hasattr(self, attribute)}
+
     def __str__(self):
         """Return trackable ID."""
         return self.tid
@@ -135,7 +175,7 @@ class Trackable(object):
 
     @owner.setter
     def owner(self, owner):
-        self._owner = owner.strip()
+        self._owner = sys.intern(owner.strip())
 
     @property
     @lazy_loaded
@@ -151,13 +191,14 @@ class Trackable(object):
 
     @type.setter
     def type(self, type):
-        self._type = type.strip()
+        self._type = sys.intern(type.strip())
 
     def get_KML(self):
         """Return the KML route of the trackable.
 
         :rtype: :class:`str`
         """
+        check_synchronous(self.geocaching)
         if not self._kml_url:
             self.load()  # fills self._kml_url
         return self.geocaching._request(self._kml_url, expect="raw").text
@@ -171,17 +212,30 @@ class Trackable(object):
 
         :raise .LoadError: If trackable loading fails (probably because of not existing cache).
         """
+        check_synchronous(self.geocaching, "get_trackable")
+        # make request
+        root = self.geocaching._request(self._get_details_url())
+        self._parse_details_page(root)
+        self.geocaching._store_snapshot(self, self.tid)
+
+    def _get_details_url(self):
+        """Return URL of trackable details page.
+
+        :raise .LoadError: If there is not enough info to load the trackable.
+        """
         # pick url based on what info we have right now
         if hasattr(self, "url"):
-            url = self.url
+            return self.url
         elif hasattr(self, "_tid"):
-            url = "track/details.aspx?tracker={}".format(self._tid)
+            return "track/details.aspx?tracker={}".format(self._tid)
         else:
             raise errors.LoadError("Trackable lacks info for loading")
 
-        # make request
-        root = self.geocaching._request(url)
+    def _parse_details_page(self, root):
+        """Fill in trackable details from parsed trackable details page.
 
+        :param bs4.BeautifulSoup root: Parsed trackable details page.
+        """
         # parse data
         self.tid = root.find("span", "CoordInfoCode").text
         self.name = root.find(id="ctl00_ContentBody_lbHeading").text
@@ -207,6 +261,7 @@ class Trackable(object):
         :return: Tuple of data necessary to log the trackable.
         :rtype: :class:`tuple` of (:class:`set`:, :class:`dict`, class:`str`)
         """
+        check_synchronous(self.geocaching)
         if not self._log_page_url:
             self.load()  # fills self._log_page_url
         log_page = self.geocaching._request(self._log_page_url)
@@ -247,3 +302,4 @@ class Trackable(object):
         post["ctl00$ContentBody$LogBookPanel1$uxLogInfo"] = log.text
 
         self.geocaching._request(self._log_page_url, method="POST", data=post)
+        self.geocaching._forget_snapshot(Trackable, self.tid)
@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 
 import logging
-import platform
 import re
 import warnings
-import inspect
 import functools
-from datetime import datetime
+from datetime import date
+from urllib.parse import urlparse
 from pycaching import errors
 
 
@@ -17,6 +16,8 @@ _rot13codeTable = str.maketrans(
 
 _attributes_url = "https://www.geocaching.com/app/src/assets/sprites/attributes.svg"
 
+_default_html_parser = "html.parser"
+
 
 def lazy_loaded(func):
     """Decorator providing lazy loading."""
@@ -34,6 +35,29 @@ def lazy_loaded(func):
     return wrapper
 
 
+def check_synchronous(geocaching, alternative=None):
+    """Raise an error if an object owned by :class:`.AsyncGeocaching` is loaded synchronously.
+
+    Synchronous loading (including lazy loading) would get unawaited coroutines from the
+    asynchronous client instead of pages.
+
+    :param str alternative: Name of :class:`.AsyncGeocaching` method to use instead.
+    :raise .Error: If the object is owned by :class:`.AsyncGeocaching`.
+    """
+    if getattr(geocaching, "_asynchronous", False):
+        if alternative:
+            hint = "use `await geocaching.{}(...)` instead".format(alternative)
+        else:
+            hint = "this is not supported by the asynchronous client"
+        raise errors.Error("Objects of AsyncGeocaching cannot be loaded synchronously or lazily, " + hint + ".")
+
+
+def endpoint_key(url):
+    """Return an endpoint key (host and path) of a URL, used to group request statistics."""
+    parsed = urlparse(url)
+    return (parsed.hostname or "") + parsed.path
+
+
 # copied from:
 # https://wiki.python.org/moin/PythonDecoratorLibrary#Generating_Deprecation_Warnings
 def deprecated(func):
@@ -43,6 +67,7 @@ def deprecated(func):
     """
     @functools.wraps(func)
     def new_func(*args, **kwargs):
+        import inspect
         warnings.warn_explicit(
             "Call to deprecated function {}.".format(func.__name__),
             category=FutureWarning,
@@ -58,21 +83,149 @@ def rot13(text):
     return str.translate(text, _rot13codeTable)
 
 
-def parse_date(raw):
-    """Return a parsed date."""
-    raw = raw.strip()
-    patterns = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%d/%m/%Y", "%d-%m-%Y",
-                "%d.%m.%Y", "%d/%b/%Y", "%d.%b.%Y", "%b/%d/%Y", "%d %b %y")
+class _DateFormat(object):
+    """Date format in :meth:`datetime.datetime.strptime` syntax, precompiled to a regex.
+
+    Only directives used by geocaching.com are supported: :code:`%Y`, :code:`%y`, :code:`%m`,
+    :code:`%d` and :code:`%b` (English month abbreviations, regardless of locale).
+    """
+
+    _directives = {"Y": r"(\d{4})", "y": r"(\d{2})", "m": r"(\d{1,2})", "d": r"(\d{1,2})", "b": r"([A-Za-z]{3})"}
+    _months = {name: number for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
 
-    for pattern in patterns:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        first, *parts = pattern.split("%")
+        regex = [re.escape(first)]
+        directives = []
+        for part in parts:
+            directives.append(part[0])
+            regex.append(self._directives[part[0]])
+            regex.append(r"\s+".join(map(re.escape, part[1:].split(" "))))
+        self._regex = re.compile("".join(regex))
+        self._year = directives.index("Y" if "Y" in directives else "y") + 1
+        self._month = directives.index("m" if "m" in directives else "b") + 1
+        self._day = directives.index("d") + 1
+        self._short_year = "y" in directives
+        self._month_name = "b" in directives
+
+    def __call__(self, raw):
+        """Return a parsed date or :code:`None`, if the string doesn't match this format."""
+        m = self._regex.fullmatch(raw)
+        if m is None:
+            return None
+        year, month, day = m.group(self._year, self._month, self._day)
+        year = int(year)
+        if self._short_year:
+            year += 1900 if year >= 69 else 2000  # same as strptime
+        if self._month_name:
+            month = self._months.get(month.lower())
+            if month is None:
+                return None
         try:
-            return datetime.strptime(raw, pattern).date()
-        except ValueError:
-            pass
+            return date(year, int(month), int(day))
+        except ValueError:  # day out of range for month etc.
+            return None
+
+
+_date_formats = tuple(_DateFormat(pattern) for pattern in (
+    "%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%d/%m/%Y", "%d-%m-%Y",
+    "%d.%m.%Y", "%d/%b/%Y", "%d.%b.%Y", "%b/%d/%Y", "%d %b %y"))
+
+
+def parse_date(raw):
+    """Return a parsed date.
+
+    Supported formats are tried in a fixed order. Use :class:`DateParser` to parse many dates
+    in the same format.
+    """
+    raw = raw.strip()
+    for date_format in _date_formats:
+        result = date_format(raw)
+        if result is not None:
+            return result
 
     raise errors.ValueError("Unknown date format - '{}'.".format(raw))
 
 
+class DateParser(object):
+    """Date parser learning the date format in use.
+
+    Dates on geocaching.com are formatted according to the user's preferences, so within one
+    session they almost always use a single format. The parser remembers the last matching format
+    and tries it first, so ambiguous dates (like :code:`01/02/2020`) are also read in that format.
+    Each :class:`.Geocaching` instance has its own parser.
+    """
+
+    def __init__(self):
+        self._format = None
+
+    @property
+    def format(self):
+        """Pattern of the learned format (in :meth:`datetime.datetime.strptime` syntax) or
+        :code:`None`.
+
+        :type: :class:`str`
+        """
+        return self._format.pattern if self._format is not None else None
+
+    def _candidates(self):
+        """Return formats to try, the learned one first."""
+        current = self._format
+        if current is None:
+            return _date_formats
+        return (current,) + tuple(f for f in _date_formats if f is not current)
+
+    def parse(self, raw):
+        """Return a parsed date.
+
+        :param str raw: Date to parse.
+        :rtype: :class:`datetime.date`
+        :raise .ValueError: If the date is not in any of supported formats.
+        """
+        raw = raw.strip()
+        current = self._format
+        if current is not None:
+            result = current(raw)
+            if result is not None:
+                return result
+
+        for date_format in _date_formats:
+            if date_format is not current:
+                result = date_format(raw)
+                if result is not None:
+                    self._format = date_format
+                    return result
+
+        raise errors.ValueError("Unknown date format - '{}'.".format(raw))
+
+    def parse_many(self, raws):
+        """Return a list of parsed dates, eg. from a column of a table.
+
+        The first format which matches all the dates is used (and learned). If there is no such
+        format, each date is parsed separately by :meth:`parse`.
+
+        :param raws: Iterable of dates to parse.
+        :rtype: :class:`list` of :class:`datetime.date`
+        :raise .ValueError: If some date is not in any of supported formats.
+        """
+        raws = [raw.strip() for raw in raws]
+        for date_format in self._candidates():
+            results = []
+            for raw in raws:
+                result = date_format(raw)
+                if result is None:
+                    break
+                results.append(result)
+            else:
+                if raws:
+                    self._format = date_format
+                return results
+
+        return [self.parse(raw) for raw in raws]
+
+
 def format_date(date, user_date_format):
     """Format a date according to user_date_format."""
     # parse user format
@@ -80,6 +233,7 @@ def format_date(date, user_date_format):
     date_format = re.split("(\W+)", date_format)
     # non-zero-padded numbers use different characters depending on different platforms
     # see https://strftime.org/ for example
+    import platform
     eat_zero_prefix = "#" if platform.system() == "Windows" else "-"
     formats = {
         "dd": r'%d',
@@ -94,16 +248,52 @@ def format_date(date, user_date_format):
     return date.strftime(date_format)
 
 
-def get_possible_attributes(*, session=None):
-    """Return a dict of all possible attributes parsed from Groundspeak's website."""
+@functools.lru_cache()
+def _resolve_html_parser(name):
+    """Return the name of an installed BeautifulSoup tree builder, falling back to the default one."""
+    from bs4.builder import builder_registry
+
+    if builder_registry.lookup(name) is None:
+        logging.warning("HTML parser '{}' is not available, falling back to '{}'.".format(
+            name, _default_html_parser))
+        return _default_html_parser
+    return name
+
+
+def parse_html(markup, parser=None, parse_only=None):
+    """Return a parsed HTML document.
+
+    :param str markup: HTML to parse.
+    :param parser: Either a name of a BeautifulSoup tree builder (eg. :code:`html.parser`,
+        :code:`lxml` or :code:`html5lib`) or a callable taking the markup and returning a parsed
+        document. If the named parser is not installed, :code:`html.parser` is used instead.
+    :param bs4.SoupStrainer parse_only: Build only the matching parts of the document. Ignored by
+        custom callables and by :code:`html5lib`, which always return the whole document.
+    :rtype: :class:`bs4.BeautifulSoup`
+    """
+    if callable(parser):
+        return parser(markup)
+
+    from bs4 import BeautifulSoup
+    parser = _resolve_html_parser(parser or _default_html_parser)
+    if parse_only is not None and parser == "html5lib":
+        parse_only = None  # not supported, would only emit a warning
+    return BeautifulSoup(markup, parser, parse_only=parse_only)
+
+
+def get_possible_attributes(*, session=None, html_parser=None):
+    """Return a dict of all possible attributes parsed from Groundspeak's website.
+
+    :param requests.Session session: Session to use for the request.
+    :param html_parser: HTML parser to use, see :func:`parse_html`.
+    """
     # imports are here to not slow down other parts of program which normally don't use this method
     import requests
-    from bs4 import BeautifulSoup
 
     session = session or requests.Session()
 
     try:
-        page = BeautifulSoup(session.get(_attributes_url).text, "html.parser")
+        page = parse_html(session.get(_attributes_url).text, html_parser)
     except requests.exceptions.ConnectionError as e:
         raise errors.Error("Cannot load attributes page.") from e
 
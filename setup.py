@@ -52,7 +52,9 @@ info = {
     "description":         "Geocaching.com site crawler. Provides tools for searching, fetching caches and geocoding.",
     "long_description":    long_description,
     "keywords":            ["geocaching", "crawler", "geocache", "cache", "search", "geocode", "travelbug"],
-    "install_requires":    ["requests>=2.8", "beautifulsoup4>=4.9", "geopy>=1.11"],
+    "install_requires":    ["requests>=2.8", "beautifulsoup4>=4.9", "geopy>=1.13"],
+    "extras_require":      {"lxml": ["lxml"], "async": ["aiohttp>=3.0"], "keyring": ["keyring"],
+                            "numpy": ["numpy"]},
     "tests_require":       ["betamax >=0.8, <0.9", "betamax-serializers >=0.2, <0.3"],
     "setup_requires":      ["nose", "flake8<3.0.0", "coverage"],  # flake8 >= 3.0 has incompatible API
     "cmdclass":            {"test": NoseTestCommand, "lint": LintCommand},
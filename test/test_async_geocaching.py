@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import asyncio
+import base64
+import gzip
+import json
+import unittest
+from unittest import mock
+from pathlib import Path
+from urllib.parse import parse_qsl, urljoin, urlsplit
+
+from requests import Request
+
+from pycaching import Cache, Point, Trackable
+from pycaching.errors import Error, NotLoggedInException, LoadError
+
+try:
+    import aiohttp
+    from pycaching.async_geocaching import AsyncGeocaching
+except ImportError:
+    aiohttp = None
+
+_cassettes_dir = Path(__file__).parent / "cassettes"
+
+
+def _normalize_url(url):
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc, parts.path, tuple(sorted(parse_qsl(parts.query)))
+
+
+class CassetteResponse:
+    """Minimal aiohttp response replaying one recorded interaction."""
+
+    def __init__(self, url, response):
+        self.url = url
+        self.status = response["status"]["code"]
+        body = response["body"]
+        if "base64_string" in body:
+            self._body = base64.b64decode(body["base64_string"])
+            if "gzip" in response["headers"].get("Content-Encoding", []):
+                self._body = gzip.decompress(self._body)
+        else:
+            self._body = body["string"].encode(body.get("encoding") or "utf-8")
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def text(self):
+        return self._body.decode("utf-8")
+
+    async def json(self, content_type=None):
+        return json.loads(self._body.decode("utf-8"))
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class CassetteSession:
+    """Minimal aiohttp session replaying Betamax cassettes, following redirects."""
+
+    def __init__(self, *cassettes):
+        self.interactions = []
+        for name in cassettes:
+            with (_cassettes_dir / "{}.json".format(name)).open(encoding="utf-8") as f:
+                self.interactions.extend(json.load(f)["http_interactions"])
+        self.cookie_jar = mock.Mock()
+
+    def request(self, method, url, params=None, **kwargs):
+        url = Request(method, url, params=params).prepare().url  # encode params same as requests
+        while True:
+            for interaction in self.interactions:
+                request, response = interaction["request"], interaction["response"]
+                if request["method"] == method and _normalize_url(request["uri"]) == _normalize_url(url):
+                    break
+            else:
+                raise aiohttp.ClientConnectionError("No recorded interaction for {}".format(url))
+            if response["status"]["code"] in (301, 302):
+                url = urljoin(url, response["headers"]["Location"][0])
+                continue
+            return CassetteResponse(url, response)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def collect(async_generator):
+    return [item async for item in async_generator]
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestMethods(unittest.TestCase):
+    def make_gc(self, *cassettes):
+        gc = AsyncGeocaching(session=CassetteSession(*cassettes))
+        gc._logged_in = True
+        return gc
+
+    def test_request(self):
+        with self.subTest("login needed"):
+            with self.assertRaises(NotLoggedInException):
+                run(AsyncGeocaching(session=CassetteSession())._request("/"))
+
+    def test_search(self):
+        gc = self.make_gc("geocaching_search")
+        caches = run(collect(gc.search(Point(49.733867, 13.397091), 20)))
+        self.assertEqual(len(caches), 20)
+        self.assertIn("GC5VJ0P", {c.wp for c in caches})
+
+        with self.subTest("lazy loading"):
+            with self.assertRaisesRegex(Error, "load_cache"):
+                caches[0].hint
+
+    def test_get_cache(self):
+        with self.subTest("normal"):
+            cache = run(self.make_gc("cache_normal_normal").get_cache("GC4808G"))
+            self.assertIsInstance(cache, Cache)
+            self.assertEqual("Nekonecne ticho", cache.name)
+
+        with self.subTest("by GUID"):
+            gc = self.make_gc("geocaching_shortcut_getcache__by_guid")
+            cache = run(gc.get_cache(guid="15ad3a3d-92c1-4f7c-b273-60937bcc2072"))
+            self.assertEqual("Nekonecne ticho", cache.name)
+
+        with self.subTest("fail"):
+            with self.assertRaises(LoadError):
+                run(self.make_gc("cache_normal_fail").get_cache("GC123456"))
+
+    def test_load_logbook(self):
+        gc = self.make_gc("cache_setup", "cache_logbook")
+        cache = run(gc.get_cache("GC1PAR2"))
+        log_authors = [log.author for log in run(collect(gc.load_logbook(cache, limit=200)))]
+        for expected_author in ["Dudny-1995", "Sopdet Reviewer", "donovanstangiano83"]:
+            self.assertIn(expected_author, log_authors)
+
+    def test_get_trackable(self):
+        trackable = run(self.make_gc("geocaching_shortcut_gettrackable").get_trackable("TB1KEZ9"))
+        self.assertIsInstance(trackable, Trackable)
+        self.assertEqual("Lilagul #2: SwedenHawk Geocoin", trackable.name)
+
+    def test_geocode(self):
+        point = run(self.make_gc("geocaching_shortcut_geocode").geocode("Prague"))
+        self.assertAlmostEqual(point.latitude, 50.08, places=1)
+
+    def test_my_finds(self):
+        gc = self.make_gc("geocaching_my_finds")
+        finds = run(collect(gc.my_finds(5)))
+        self.assertEqual(5, len(finds))
+        for cache in finds:
+            self.assertTrue(cache.name)
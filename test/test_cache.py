@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import json
 import unittest
 from datetime import date
 from unittest import mock
@@ -122,6 +123,18 @@ class TestProperties(unittest.TestCase):
     def test_author(self):
         self.assertEqual(self.c.author, "human")
 
+        with self.subTest("shared between caches"):
+            other = Cache(self.gc, "GC54321", author="".join(["hu", "man"]))
+            self.assertIs(self.c.author, other.author)
+
+    def test_compact(self):
+        self.assertFalse(hasattr(self.c, "__dict__"))
+        self.assertFalse(hasattr(self.c.location, "__dict__"))
+
+        with self.subTest("unknown attribute"):
+            with self.assertRaises(AttributeError):
+                self.c.unknown = 1
+
     def test_hidden(self):
         self.assertEqual(self.c.hidden, date(2000, 1, 1))
 
@@ -211,6 +224,41 @@ class TestMethods(NetworkedTest):
                     cache = Cache(self.gc, "GC123456")
                     cache.load()
 
+    def test_load_partial(self):
+        for cassette, wp in ("cache_normal_normal", "GC4808G"), ("cache_non-ascii", "GC5VJ0P"):
+            caches = []
+            for partial in True, False:
+                cache = Cache(self.gc, wp)
+                with self.recorder.use_cassette(cassette):
+                    cache.load(partial=partial)
+                caches.append(cache)
+
+            for attr in ("name", "location", "original_location", "type", "state", "found", "size",
+                         "difficulty", "terrain", "author", "hidden", "attributes", "summary",
+                         "description", "hint", "favorites", "log_counts", "_logbook_token",
+                         "_trackable_page_url"):
+                with self.subTest("{} {}".format(wp, attr)):
+                    self.assertEqual(getattr(caches[0], attr), getattr(caches[1], attr))
+            with self.subTest("{} waypoints".format(wp)):
+                self.assertEqual(caches[0].waypoints.keys(), caches[1].waypoints.keys())
+
+    def test_snapshot(self):
+        with self.recorder.use_cassette("cache_normal_normal"):
+            cache = Cache(self.gc, "GC4808G")
+            cache.load()
+
+        snapshot = json.loads(json.dumps(cache.to_snapshot()))
+        with mock.patch.object(Cache, "load") as mock_load:
+            restored = Cache.from_snapshot(self.gc, snapshot)
+            for attr in ("wp", "name", "location", "original_location", "type", "state", "found", "size",
+                         "difficulty", "terrain", "author", "hidden", "attributes", "summary",
+                         "description", "hint", "favorites", "pm_only", "log_counts", "_logbook_token",
+                         "_trackable_page_url"):
+                with self.subTest(attr):
+                    self.assertEqual(getattr(cache, attr), getattr(restored, attr))
+            self.assertEqual(cache.waypoints.keys(), restored.waypoints.keys())
+            self.assertFalse(mock_load.called)
+
     def test_load_quick(self):
         with self.subTest("normal"):
             with self.recorder.use_cassette('cache_quick_normal'):
@@ -289,9 +337,54 @@ class TestMethods(NetworkedTest):
     def test_load_logbook(self):
         with self.recorder.use_cassette('cache_logbook'):
             # limit over 100 tests pagination
-            log_authors = list(map(lambda log: log.author, self.c.load_logbook(limit=200)))
+            logs = list(self.c.load_logbook(limit=200))
+        log_authors = [log.author for log in logs]
         for expected_author in ["Dudny-1995", "Sopdet Reviewer", "donovanstangiano83"]:
             self.assertIn(expected_author, log_authors)
+        self.assertEqual(592751552, logs[0].id)
+        self.assertEqual(date(2016, 4, 19), logs[0].created)
+
+    def test_load_logbook_pages(self):
+        def get_page(page, per_page):
+            return [_logbook_data(i) for i in range(page * per_page, min((page + 1) * per_page, total))]
+
+        cache = Cache(self.gc, "GC12345", _logbook_token="token")
+        with mock.patch.object(Cache, "_logbook_get_page", side_effect=get_page) as mock_get_page:
+            for description, total, log_counts, limit, expected_pages in (
+                    ("exact log counts", 250, 250, float("inf"), [0, 1, 2]),
+                    ("full last page", 200, 200, float("inf"), [0, 1, 2]),
+                    ("outdated log counts", 250, 150, float("inf"), [0, 1, 2]),
+                    ("outdated log counts filling pages", 150, 100, float("inf"), [0, 1]),
+                    ("limit", 250, 250, 150, [0, 1]),
+                    ("small limit", 250, 250, 10, [0])):
+                with self.subTest(description):
+                    mock_get_page.reset_mock()
+                    cache.log_counts = {LogType.found_it: log_counts}
+                    logs = list(cache.load_logbook(limit, workers=2))
+                    self.assertEqual([str(i) for i in range(min(total, limit))], [log.author for log in logs])
+                    self.assertEqual(expected_pages, sorted(c[0][0] for c in mock_get_page.call_args_list))
+
+            with self.subTest("zero limit"):
+                mock_get_page.reset_mock()
+                self.assertEqual([], list(cache.load_logbook(limit=0)))
+                mock_get_page.assert_not_called()
+
+    def test_load_logbook_since(self):
+        def get_page(page, per_page):
+            return [_logbook_data(i) for i in range(page * per_page, (page + 1) * per_page)]
+
+        cache = Cache(self.gc, "GC12345", _logbook_token="token", log_counts={LogType.found_it: 1000})
+        with mock.patch.object(Cache, "_logbook_get_page", side_effect=get_page) as mock_get_page:
+            with self.subTest("log ID"):
+                logs = list(cache.load_logbook(since=_logbook_data(150)["LogID"]))
+                self.assertEqual([str(i) for i in range(150)], [log.author for log in logs])
+                self.assertEqual([0, 1], [c[0][0] for c in mock_get_page.call_args_list])
+
+            with self.subTest("date"):
+                mock_get_page.reset_mock()
+                logs = list(cache.load_logbook(since=date(2012, 2, 2)))
+                self.assertEqual([str(i) for i in range(11)], [log.author for log in logs])
+                self.assertEqual(1, mock_get_page.call_count)
 
     def test_load_log_page(self):
         expected_types = {t.value for t in (LogType.found_it, LogType.didnt_find_it, LogType.note)}
@@ -376,6 +469,12 @@ class TestMethods(NetworkedTest):
                 self.assertEqual(cache.type, Type.geocaching_hq)
 
 
+def _logbook_data(i):
+    """Return logbook JSON data of i-th newest log."""
+    return {"LogID": 10000 - i, "LogTypeImage": "2.png", "LogText": "text", "UserName": str(i),
+            "Visited": "2012-02-02", "Created": "2012-02-{:02d}".format(max(1, 12 - i))}
+
+
 class TestWaypointProperties(unittest.TestCase):
     def setUp(self):
         self.w = Waypoint("id", "Parking", Point("N 56° 50.006′ E 13° 56.423′"),
@@ -420,3 +519,9 @@ class TestWaypointProperties(unittest.TestCase):
 
     def test_str(self):
         self.assertEqual(str(self.w), "id")
+
+    def test_snapshot(self):
+        snapshot = json.loads(json.dumps(self.w.to_snapshot()))
+        w = Waypoint.from_snapshot(snapshot)
+        self.assertEqual((w.identifier, w.type, w.location, w.note),
+                         (self.w.identifier, self.w.type, self.w.location, self.w.note))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import random
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import geopy.distance
+
+from pycaching import Cache, Geocaching, Point, Rectangle
+from pycaching.cache_index import CacheIndex
+from pycaching.errors import LoadError, ValueError as PycachingValueError
+
+
+class TestCacheIndex(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching()
+        rnd = random.Random(42)
+        self.caches = [Cache(self.gc, "GC{:X}".format(0x1000 + i),
+                             location=Point(rnd.uniform(-89.9, 89.9), rnd.uniform(-180, 180)))
+                       for i in range(500)]
+        # a dense cluster around the antimeridian
+        self.caches += [Cache(self.gc, "GC{:X}".format(0x2000 + i),
+                              location=Point(rnd.uniform(-17, -16), rnd.choice((-1, 1)) * rnd.uniform(179.5, 180)))
+                        for i in range(200)]
+        self.index = CacheIndex(self.caches, cell_size=0.5)
+
+    def distance(self, point, cache):
+        return geopy.distance.great_circle(point, cache.location).meters
+
+    def assertNearest(self, point, k):
+        expected = sorted(self.caches, key=lambda cache: self.distance(point, cache))[:k]
+        self.assertEqual([c.wp for c in expected], [c.wp for c in self.index.nearest(point, k)])
+
+    def test_nearest(self):
+        for point in (Point(49, 16), Point(-16.5, 180), Point(-16.5, -179.99), Point(89.99, 0), Point(-90, 0)):
+            for k in (1, 10, 50):
+                with self.subTest(point=point, k=k):
+                    self.assertNearest(point, k)
+
+        with self.subTest("more than indexed"):
+            self.assertEqual(len(self.caches), len(self.index.nearest(Point(0, 0), 10000)))
+            self.assertEqual([], CacheIndex().nearest(Point(0, 0), 3))
+
+    def test_within(self):
+        for point, radius in ((Point(-16.5, 179.9), 30000), (Point(10, 10), 2000000), (Point(88, 50), 500000),
+                              (Point(0, 0), 30000000)):
+            with self.subTest(point=point, radius=radius):
+                expected = {c.wp for c in self.caches if self.distance(point, c) <= radius}
+                found = self.index.within(point, radius)
+                self.assertEqual(expected, {c.wp for c in found})
+                distances = [self.distance(point, c) for c in found]
+                self.assertEqual(sorted(distances), distances)
+
+    def test_in_rectangle(self):
+        rectangles = (Rectangle(Point(-16.2, 179.8), Point(-16.8, 179.95)), Rectangle(Point(60, -30), Point(-60, 30)),
+                      Rectangle(Point(90, -180), Point(-90, 180)))
+        for rectangle in rectangles:
+            with self.subTest(rectangle=rectangle.corners):
+                expected = {c.wp for c in self.caches if c.location in rectangle}
+                self.assertEqual(expected, {c.wp for c in self.index.in_rectangle(rectangle)})
+
+    def test_add_remove(self):
+        index = CacheIndex()
+        cache = Cache(self.gc, "GC12345", location=Point(49, 16))
+        index.add(cache)
+        self.assertIn("gc12345", index)
+        self.assertEqual([cache], index.nearest(Point(0, 0)))
+
+        with self.subTest("replace"):
+            moved = Cache(self.gc, "GC12345", location=Point(-49, 16))
+            index.add(moved)
+            self.assertEqual(1, len(index))
+            self.assertEqual([], index.within(Point(49, 16), 1000))
+            self.assertEqual([moved], index.within(Point(-49, 16), 1000))
+
+        with self.subTest("remove"):
+            index.remove(cache)
+            self.assertEqual(0, len(index))
+            self.assertEqual([], index.nearest(Point(-49, 16)))
+            with self.assertRaises(KeyError):
+                index.remove("GC12345")
+
+        with self.subTest("no location"):
+            with mock.patch.object(Cache, "load") as load, self.assertRaises(PycachingValueError):
+                index.add(Cache(self.gc, "GC1"))
+            load.assert_not_called()
+
+    def test_save_load(self):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.json")
+            self.index.save(path)
+            loaded = CacheIndex.load(self.gc, path)
+
+        self.assertEqual(len(self.index), len(loaded))
+        self.assertEqual(self.index.cell_size, loaded.cell_size)
+        point = Point(-16.5, 179.9)
+        self.assertEqual([c.wp for c in self.index.nearest(point, 20)], [c.wp for c in loaded.nearest(point, 20)])
+        self.assertIs(self.gc, next(iter(loaded)).geocaching)
+
+        with self.assertRaises(LoadError):
+            CacheIndex.load(self.gc, io.StringIO("[]"))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from pycaching.checkpoints import LogbookCheckpoints
+from pycaching.errors import ValueError as PycachingValueError
+from pycaching.log import Log
+
+
+class TestLogbookCheckpoints(unittest.TestCase):
+    def test_get_set(self):
+        checkpoints = LogbookCheckpoints()
+        self.assertIsNone(checkpoints.get("GC12345"))
+        checkpoints.set("gc12345", 100)
+        self.assertEqual(100, checkpoints.get("GC12345"))
+
+    def test_disk(self):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoints.sqlite")
+            checkpoints = LogbookCheckpoints(path)
+            checkpoints.set("GC12345", 100)
+            checkpoints.close()
+
+            checkpoints = LogbookCheckpoints(path)
+            self.assertEqual(100, checkpoints.get("GC12345"))
+            checkpoints.close()
+
+    def test_load_new_logs(self):
+        checkpoints = LogbookCheckpoints()
+        cache = mock.Mock(wp="GC12345")
+        cache.load_logbook.return_value = [Log(id=5), Log(id=7), Log(id=6)]
+
+        with self.subTest("first run"):
+            self.assertEqual([5, 7, 6], [log.id for log in checkpoints.load_new_logs(cache, workers=2)])
+            cache.load_logbook.assert_called_with(since=None, workers=2)
+            self.assertEqual(7, checkpoints.get("GC12345"))
+
+        with self.subTest("interrupted run"):
+            cache.load_logbook.return_value = [Log(id=9), Log(id=8)]
+            logs = checkpoints.load_new_logs(cache)
+            next(logs)
+            logs.close()
+            cache.load_logbook.assert_called_with(since=7)
+            self.assertEqual(7, checkpoints.get("GC12345"))
+
+        with self.subTest("no new logs"):
+            cache.load_logbook.return_value = []
+            self.assertEqual([], list(checkpoints.load_new_logs(cache)))
+            self.assertEqual(7, checkpoints.get("GC12345"))
+
+        with self.subTest("limit"):
+            cache.load_logbook.reset_mock()
+            cache.load_logbook.return_value = [Log(id=10), Log(id=9), Log(id=8)]
+            with self.assertRaises(PycachingValueError):
+                checkpoints.load_new_logs(cache, limit=1)
+            cache.load_logbook.assert_not_called()
+            self.assertEqual(7, checkpoints.get("GC12345"))
+            self.assertEqual([10, 9, 8], [log.id for log in checkpoints.load_new_logs(cache)])
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from pycaching.coordinates import parse, parse_many
+from pycaching.errors import ValueError as PycachingValueError
+
+
+class TestParse(unittest.TestCase):
+    def test_ddm(self):
+        cases = {
+            "N 49 45.123 E 013 22.123": (49.75205, 13.36872),
+            "s 49 45.123 w 013 22.123": (-49.75205, -13.36872),
+            "49S 45.123 013W 22.123": (-49.75205, -13.36872),
+            "N49° 45,123′ E013° 22,123′": (49.75205, 13.36872),
+            "N 6 52.861  w174   43.327": (6.88102, -174.72212),
+            "-49 45.123 -13 22.123": (-49.75205, -13.36872),
+            "N 49 45.123 E 013 22.123 (WGS84)": (49.75205, 13.36872),
+        }
+        for string, expected in cases.items():
+            with self.subTest(string):
+                self.assertEqual(expected, parse(string))
+
+    def test_dms(self):
+        latitude, longitude = parse("49°45'7.38\"N 13°22'7.38\"W")
+        self.assertAlmostEqual(49.75205, latitude)
+        self.assertAlmostEqual(-13.368717, longitude, places=6)
+
+    def test_decimal(self):
+        self.assertEqual((-49.75205, 13.36872), parse("-49.75205, 13.36872"))
+        self.assertEqual((49.5, -13.2), parse("49,5 N 13,2 W"))
+
+    def test_invalid(self):
+        for string in ("123", "???", "", "N 91 00.000 E 0 0.000", "N 49 75.000 E 13 0.000", "49 13 7"):
+            with self.subTest(string):
+                with self.assertRaises(PycachingValueError):
+                    parse(string)
+
+    def test_parse_many(self):
+        strings = ["N 49 45.123 E 013 22.123", "???"]
+        self.assertEqual([(49.75205, 13.36872), None], parse_many(strings))
+        with self.assertRaises(PycachingValueError):
+            parse_many(strings, strict=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import gzip
+import io
+import json
+import os
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import date
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from pycaching import Cache, Geocaching, Log, Point
+from pycaching.cache import Size, Type, Waypoint
+from pycaching.errors import PMOnlyException, ValueError as PycachingValueError
+from pycaching.export import GPXExporter, JSONLExporter, _cache_id
+from pycaching.log import Type as LogType
+
+GPX = "{http://www.topografix.com/GPX/1/1}"
+GS = "{http://www.groundspeak.com/cache/1/0/1}"
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching()
+        self.cache = Cache(self.gc, "GC1PAR2", name="Testing <&>", type=Type.traditional,
+                           location=Point(49.5, 16.25), size=Size.micro, difficulty=1.5, terrain=5,
+                           author="human", hidden=date(2000, 1, 2), hint="rot13")
+        self.waypoint = Waypoint("PK1PAR2", "Parking Area", Point(49.6, 16.3), "note")
+        self.log = Log(id=1, type=LogType.found_it, text="TFTC", visited=date(2012, 2, 2), author="finder")
+        self.items = [self.cache, self.log, self.waypoint, Cache(self.gc, "GC12345", location=Point(1, 2))]
+
+    def test_jsonl(self):
+        out = io.StringIO()
+        with mock.patch.object(Cache, "load") as load, JSONLExporter(out) as exporter:
+            exporter.write_all(self.items)
+        load.assert_not_called()
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(["cache", "log", "waypoint", "cache"], [line["object"] for line in lines])
+        self.assertEqual("GC1PAR2", lines[1]["cache"])
+        self.assertEqual("Testing <&>", Cache.from_snapshot(self.gc, lines[0]).name)
+        self.assertEqual(self.waypoint.location, Waypoint.from_snapshot(lines[2]).location)
+
+    def test_gpx(self):
+        out = io.StringIO()
+        with mock.patch.object(Cache, "load") as load, GPXExporter(out) as exporter:
+            exporter.write_all(self.items)
+        load.assert_not_called()
+
+        root = ET.fromstring(out.getvalue())
+        wpts = root.findall(GPX + "wpt")
+        self.assertEqual(3, len(wpts))
+        self.assertEqual(["GC1PAR2", "PK1PAR2", "GC12345"], [wpt.find(GPX + "name").text for wpt in wpts])
+        self.assertEqual(("49.500000", "16.250000"), (wpts[0].get("lat"), wpts[0].get("lon")))
+        self.assertEqual("2000-01-02T00:00:00Z", wpts[0].find(GPX + "time").text)
+        self.assertEqual("Waypoint|Parking Area", wpts[1].find(GPX + "type").text)
+
+        cache = wpts[0].find(GPX + "extensions").find(GS + "cache")
+        self.assertEqual("Testing <&>", cache.find(GS + "name").text)
+        self.assertEqual("Traditional Cache", cache.find(GS + "type").text)
+        self.assertEqual("Micro", cache.find(GS + "container").text)
+        self.assertEqual("1.5", cache.find(GS + "difficulty").text)
+        log = cache.find(GS + "logs").find(GS + "log")
+        self.assertEqual("1", log.get("id"))
+        self.assertEqual("Found it", log.find(GS + "type").text)
+        self.assertEqual("finder", log.find(GS + "finder").text)
+
+        with self.subTest("cache, its waypoints and logs"):
+            out = io.StringIO()
+            with GPXExporter(out) as exporter:
+                exporter.write_all([self.cache, self.waypoint, self.log, Log(id=2, text="second")])
+            wpts = ET.fromstring(out.getvalue()).findall(GPX + "wpt")
+            self.assertEqual(["GC1PAR2", "PK1PAR2"], [wpt.find(GPX + "name").text for wpt in wpts])
+            logs = wpts[0].find(GPX + "extensions").find(GS + "cache").find(GS + "logs")
+            self.assertEqual(["1", "2"], [log.get("id") for log in logs.findall(GS + "log")])
+
+        with self.subTest("log without cache"):
+            with self.assertRaises(PycachingValueError):
+                GPXExporter(io.StringIO()).write(self.log)
+
+    def test_fields(self):
+        def load(cache):
+            cache.hint = "loaded hint"
+            cache.favorites = 10
+
+        out = io.StringIO()
+        with mock.patch.object(Cache, "load", autospec=True, side_effect=load) as mock_load:
+            with JSONLExporter(out, fields=["name", "hint"]) as exporter:
+                exporter.write(self.cache)
+                exporter.write(Cache(self.gc, "GC12345"))
+        self.assertEqual(1, mock_load.call_count)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual({"object": "cache", "wp": "GC1PAR2", "name": "Testing <&>", "hint": "rot13"}, lines[0])
+        self.assertEqual({"object": "cache", "wp": "GC12345", "hint": "loaded hint"}, lines[1])
+
+        with self.subTest("fields never loaded"):
+            caches = [self.cache, Cache(self.gc, "GC12345")]
+            with mock.patch.object(Cache, "load", autospec=True, side_effect=load) as mock_load:
+                with JSONLExporter(io.StringIO(), fields=["visited", "original_location", "hint", "name"]) as exporter:
+                    exporter.write_all(caches)
+            self.assertEqual([mock.call(cache) for cache in caches], mock_load.call_args_list)
+
+        with self.subTest("load error"):
+            out = io.StringIO()
+            with mock.patch.object(Cache, "load", side_effect=PMOnlyException), self.assertLogs(level="WARNING"):
+                with JSONLExporter(out, fields=["name", "hint"]) as exporter:
+                    exporter.write_all([Cache(self.gc, "GC12345", name="PM only"), self.cache])
+            lines = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual({"object": "cache", "wp": "GC12345", "name": "PM only"}, lines[0])
+            self.assertEqual("GC1PAR2", lines[1]["wp"])
+
+        with self.subTest("unknown field"):
+            with self.assertRaises(PycachingValueError):
+                JSONLExporter(io.StringIO(), fields=["unknown"])
+
+    def test_gzip(self):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "caches.gpx.gz")
+            with GPXExporter(path) as exporter:
+                exporter.write_all(self.items)
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self.assertEqual(3, len(ET.fromstring(f.read()).findall(GPX + "wpt")))
+
+        with self.subTest("file object"):
+            out = io.BytesIO()
+            with JSONLExporter(out, compress=True) as exporter:
+                exporter.write_all(self.items)
+            self.assertFalse(out.closed)
+            self.assertEqual(4, len(gzip.decompress(out.getvalue()).splitlines()))
+
+    def test_cache_id(self):
+        self.assertEqual(0xFFFF, _cache_id("GCFFFF"))
+        self.assertEqual(65536, _cache_id("GCG000"))
+        self.assertEqual(512401, _cache_id("GC10000"))
@@ -2,16 +2,18 @@
 
 import json
 import logging
+import random
 import unittest
 from os import path
 from unittest import mock
 
-from geopy.distance import great_circle
+from geographiclib.geodesic import Geodesic
+from geopy.distance import geodesic, great_circle
 
-from pycaching import Cache
-from pycaching.errors import GeocodeError, BadBlockError
+from pycaching import Cache, Geocaching
+from pycaching.errors import GeocodeError, BadBlockError, ValueError as PycachingValueError
 from pycaching.geo import Point, Polygon, Rectangle, Tile, UTFGridPoint, Block
-from pycaching.geo import to_decimal
+from pycaching.geo import bearings, distances, nearest, to_decimal
 from . import NetworkedTest
 
 _sample_caches_file = path.join(path.dirname(__file__), "sample_caches.csv")
@@ -64,7 +66,7 @@ class TestPoint(NetworkedTest):
             self.assertEqual(Point.from_string("N 49 45.000 E 13 0.0"), Point(49.75, 13.0))
 
         with self.subTest("include precision"):
-            self.assertIn("precision", Point(49.75, 13.0).__dict__)
+            self.assertTrue(hasattr(Point(49.75, 13.0), "precision"))
 
         with self.assertRaises(ValueError):
             Point.from_string("123")
@@ -154,6 +156,40 @@ class TestPolygon(unittest.TestCase):
         with self.subTest("Maximum longitude"):
             self.assertEqual(ne.longitude, 40.)
 
+        with self.subTest("new box each time"):
+            self.assertIsNot(bb, self.p.bounding_box)
+            self.assertEqual(bb.corners, self.p.bounding_box.corners)
+
+        with self.subTest("antimeridian"):
+            fiji = Polygon(*[Point(*i) for i in [(-15, 177), (-15, -178), (-20, -178), (-20, 177)]])
+            sw, ne = fiji.bounding_box.corners
+            self.assertEqual((-178, 177), (sw.longitude, ne.longitude))
+
+    def test_points(self):
+        self.assertIsInstance(self.p.points, tuple)
+        with self.assertRaises(AttributeError):
+            self.p.points.append(Point(50., 50.))
+
+        self.p.points = [Point(*i) for i in [(0., 0.), (0., 60.), (60., 60.)]]
+        self.assertEqual((0., 60.), (self.p.bounding_box.corners[0].latitude, self.p.bounding_box.corners[1].latitude))
+        self.assertIn(Point(10., 50.), self.p)
+        self.assertNotIn(Point(-10., -10.), self.p)
+
+    def test_to_tiles(self):
+        with self.subTest("antimeridian"):
+            fiji = Polygon(*[Point(*i) for i in [(-15, 177), (-15, -178), (-20, -178), (-20, 177)]])
+            tiles = list(fiji.to_tiles(None, 10))
+            self.assertEqual({1015, 1016, 1017, 1018, 1019, 1020, 1021, 1022, 1023, 0, 1, 2, 3, 4, 5},
+                             {t.x for t in tiles})
+            for point in (Point(-17, 179), Point(-17, -179.5)):
+                self.assertIn(point.to_tile(None, 10), tiles)
+
+        with self.subTest("around pole"):
+            arctic = Polygon(*[Point(70, lon) for lon in (-180, -90, 0, 90)])
+            tiles = list(arctic.to_tiles(None, 3))
+            self.assertEqual(set(range(8)), {t.x for t in tiles})
+            self.assertEqual({0, 1}, {t.y for t in tiles})
+
     def test_mean_point(self):
         mp = self.p.mean_point
         with self.subTest("latitude"):
@@ -161,6 +197,43 @@ class TestPolygon(unittest.TestCase):
         with self.subTest("longitude"):
             self.assertEqual(mp.longitude, -23.0)
 
+    def test_contains(self):
+        # concave "C" shape opened to the east
+        c = Polygon(*[Point(*i) for i in [(0, 0), (0, 10), (2, 10), (2, 2), (8, 2), (8, 10), (10, 10), (10, 0)]])
+        for point in [(1, 5), (5, 1), (9, 9)]:
+            self.assertIn(Point(*point), c)
+        for point in [(5, 5), (5, 11), (-1, 1), (11, 5)]:
+            self.assertNotIn(Point(*point), c)
+
+        with self.subTest("antimeridian"):
+            fiji = Polygon(*[Point(*i) for i in [(-15, 177), (-15, -178), (-20, -178), (-20, 177)]])
+            for point in [(-17, 179), (-17, -179.5), (-17, 180)]:
+                self.assertIn(Point(*point), fiji)
+            for point in [(-17, 0), (-17, 176), (-17, -177), (-14, 179)]:
+                self.assertNotIn(Point(*point), fiji)
+
+        with self.subTest("around pole"):
+            arctic = Polygon(*[Point(70, lon) for lon in (-180, -90, 0, 90)])
+            for point in [(80, 45), (89, -170), (70.5, 0)]:
+                self.assertIn(Point(*point), arctic)
+            for point in [(60, 45), (-80, 0)]:
+                self.assertNotIn(Point(*point), arctic)
+
+    def test_contains_many(self):
+        rnd = random.Random(0)
+        points = [Point(rnd.uniform(-90, 90), rnd.uniform(-180, 180)) for _ in range(2000)]
+        points += [Point(rnd.uniform(-22, -13), (rnd.uniform(174, 186) + 180) % 360 - 180)
+                   for _ in range(200)]
+        polygons = [self.p, Polygon(*[Point(*i) for i in [(-15, 177), (-15, -178), (-20, -178), (-20, 177)]]),
+                    Polygon(*[Point(-60, lon) for lon in (0, 100, -150, -50)])]
+        for polygon in polygons:
+            expected = [p in polygon for p in points]
+            self.assertTrue(any(expected))
+            self.assertEqual(expected, polygon.contains_many(points))
+            with mock.patch("pycaching.geo._numpy", return_value=None):
+                self.assertEqual(expected, polygon.contains_many(iter(points)))
+        self.assertEqual([], self.p.contains_many([]))
+
 
 class TestRectangle(unittest.TestCase):
     def setUp(self):
@@ -176,10 +249,85 @@ class TestRectangle(unittest.TestCase):
         for p in outside_points:
             self.assertFalse(p in self.rect)
 
+    def test_contains_many(self):
+        points = [Point(*i) for i in [(10., 20.), (18., 15.), (-10., -170.), (20., -10.)]]
+        self.assertEqual([True, True, False, False], self.rect.contains_many(points))
+        with mock.patch("pycaching.geo._numpy", return_value=None):
+            self.assertEqual([True, True, False, False], self.rect.contains_many(points))
+
+    def test_to_tiles(self):
+        tiles = list(self.rect.to_tiles(None, 10))
+        for point in (Point(10., 20.), Point(30., -5.), Point(18., 15.)):
+            self.assertIn(point.to_tile(None, 10), tiles)
+
+        with self.subTest("wider than 180 degrees"):
+            wide = Rectangle(Point(10, -100), Point(-10, 100))
+            self.assertIn(Point(0, 0), wide)
+            self.assertEqual(set(range(1, 7)), {t.x for t in wide.to_tiles(None, 3)})
+
     def test_diagonal(self):
         self.assertAlmostEqual(self.rect.diagonal, 3411261.6697293497)
 
 
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(0)
+        self.origin = Point(49.74, 13.38)
+        self.points = [Point(rnd.uniform(-90, 90), rnd.uniform(-180, 180)) for _ in range(500)]
+        self.points += [Point(-49.74, -166.62), Point(0, 0), Point(0, -180), Point(49.75, 13.38)]
+
+    def run_with_and_without_numpy(self, test):
+        with self.subTest("numpy"):
+            test()
+        with self.subTest("pure Python"), mock.patch("pycaching.geo._numpy", return_value=None):
+            test()
+
+    def test_distances(self):
+        def test():
+            expected = [geodesic(self.origin, p).meters for p in self.points]
+            for result in (distances(self.origin, self.points), distances(self.points, self.origin)):
+                for e, r in zip(expected, result):
+                    self.assertAlmostEqual(e, r, delta=0.001)
+            expected = [great_circle(self.origin, p).meters for p in self.points]
+            for e, r in zip(expected, distances(self.origin, self.points, geodesic=False)):
+                self.assertAlmostEqual(e, r, delta=0.001)
+
+            pairwise = distances(self.points[:3], self.points[3:6], geodesic=False)
+            self.assertEqual(3, len(pairwise))
+            self.assertAlmostEqual(great_circle(self.points[1], self.points[4]).meters, pairwise[1], delta=0.001)
+            with self.assertRaises(PycachingValueError):
+                distances(self.points[:3], self.points[:2])
+
+        self.run_with_and_without_numpy(test)
+
+    def test_bearings(self):
+        targets = [Point(50, 13.38), Point(49.74, 14), Point(49, 13.38), Point(49.74, 13), Point(49, 12)]
+
+        def test():
+            for geodesic_bearings in (True, False):
+                result = bearings(self.origin, targets, geodesic=geodesic_bearings)
+                self.assertEqual([0, 90, 180, 270, 231], [round(r) for r in result])
+            for p, r in zip(self.points, bearings(self.origin, self.points)):
+                e = Geodesic.WGS84.Inverse(self.origin.latitude, self.origin.longitude, p.latitude, p.longitude)["azi1"]
+                self.assertAlmostEqual(e % 360, r, delta=1e-6)
+
+        self.run_with_and_without_numpy(test)
+
+    def test_nearest(self):
+        gc = Geocaching()
+        caches = [Cache(gc, "GC{:X}".format(0x1000 + i), location=p) for i, p in enumerate(self.points)]
+        expected = sorted(caches, key=lambda cache: geodesic(self.origin, cache.location).meters)
+
+        def test():
+            result = nearest(self.origin, caches, 10, key=lambda cache: cache.location)
+            self.assertEqual(expected[:10], result)
+            self.assertEqual(expected, nearest(self.origin, caches, 10000, key=lambda cache: cache.location))
+            self.assertEqual([self.points[-1]], nearest(self.origin, self.points, geodesic=False))
+            self.assertEqual([], nearest(self.origin, [], 5))
+
+        self.run_with_and_without_numpy(test)
+
+
 class TestTile(NetworkedTest):
     # see
     # http://gis.stackexchange.com/questions/8650/how-to-measure-the-accuracy-of-latitude-and-longitude
@@ -224,6 +372,30 @@ class TestTile(NetworkedTest):
             expected_caches.pop(c.wp)
         self.assertEqual(len(expected_caches), 0)
 
+    @mock.patch.object(Tile, '_download_utfgrid')
+    def test_middle_points(self, mock_utfgrid):
+        """Compare middle points computed in bulk to the ones computed by blocks"""
+        with open(_sample_utfgrid_file, encoding="utf8") as f:
+            mock_utfgrid.return_value = json.load(f)
+
+        middle_points = self.tile.middle_points
+        self.assertEqual({b.cache_wp: b.cache_name for b in self.tile.blocks}, self.tile.cache_names)
+        for b in self.tile.blocks:
+            with self.subTest(b.cache_wp):
+                try:
+                    expected = b.middle_point
+                except BadBlockError:
+                    self.assertNotIn(b.cache_wp, middle_points)
+                else:
+                    self.assertEqual(expected, middle_points[b.cache_wp])
+
+    def test_decode_utfgrid(self):
+        decoded = Tile._decode_utfgrid({"(1, 2)": [{"i": "GC1", "n": "One"}, {"i": "GC2", "n": "Two"}],
+                                        "(1, 3)": [{"i": "GC1", "n": "One"}]})
+        self.assertEqual({"GC1", "GC2"}, decoded.keys())
+        name, xs, ys = decoded["GC1"]
+        self.assertEqual(("One", [1, 1], [2, 3]), (name, list(xs), list(ys)))
+
     def test_precision(self):
         with self.subTest("with point coorection"):
             t1 = make_tile(0, 0, 14)[0]
@@ -292,7 +464,10 @@ class TestBlock(unittest.TestCase):
 
     def setUp(self):
         self.b = Block()
-        Block.instances = []
+        Block._reset_block_size()
+
+    def tearDown(self):
+        Block._reset_block_size()
 
     def _generate_blocks(self, case, num=100):
         """Generate some blocks for testing block sizes"""
@@ -301,6 +476,10 @@ class TestBlock(unittest.TestCase):
             block.points = self.good_cases[case][0]
         return blocks
 
+    def _determine_block_size(self, blocks):
+        Block._reset_block_size()
+        Block.determine_block_size(len(block.points) for block in blocks)
+
     def test_determine_block_size(self):
         """Test if correct size is determined based on passed points"""
 
@@ -308,40 +487,36 @@ class TestBlock(unittest.TestCase):
             self.assertEqual(Block.size, 3)
 
         with self.subTest("all blocks has 9 points"):
-            blocks = self._generate_blocks(9, 100)
-            Block.determine_block_size()
+            self._determine_block_size(self._generate_blocks(9, 100))
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("most blocks has 9 points, some has 6 points"):
-            blocks = self._generate_blocks(9, 100) + self._generate_blocks(6, 20)
-            Block.determine_block_size()
+            self._determine_block_size(self._generate_blocks(9, 100) + self._generate_blocks(6, 20))
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("most blocks has 9 points, some has other num of points"):
             blocks = self._generate_blocks(9, 100) + self._generate_blocks(6, 20)
             blocks += self._generate_blocks(3, 10) + self._generate_blocks(1, 2)
-            Block.determine_block_size()
+            self._determine_block_size(blocks)
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("small number of instances"):
-            blocks = self._generate_blocks(9, 10)
             with self.assertLogs(level=logging.WARNING):
-                Block.determine_block_size()
+                self._determine_block_size(self._generate_blocks(9, 10))
             self.assertEqual(Block.size, 3)
-            del blocks
 
         with self.subTest("all blocks has 4 points"):
-            blocks = self._generate_blocks(4, 100)
             with self.assertLogs(level=logging.WARNING):
-                Block.determine_block_size()
+                self._determine_block_size(self._generate_blocks(4, 100))
             self.assertEqual(Block.size, 2)
-            del blocks
 
-        # set back to initial value
-        Block.size = 3
+        with self.subTest("only recent blocks are used"):
+            Block._reset_block_size()
+            Block.determine_block_size([4] * Block.size_window)
+            Block.determine_block_size([9] * Block.size_window)
+            self.assertEqual(Block.size, 3)
+            self.assertEqual(Block.size_window, len(Block._size_samples))
+            self.assertEqual({9: Block.size_window}, Block._size_histogram)
 
     def test_points(self):
         """Test points operations"""
@@ -6,13 +6,15 @@ import os
 import unittest
 from subprocess import CalledProcessError
 from tempfile import NamedTemporaryFile
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from geopy.distance import great_circle
 
 import pycaching
 from pycaching import Cache, Geocaching, Point, Rectangle
-from pycaching.errors import NotLoggedInException, LoginFailedException, PMOnlyException
+from pycaching.geo import Tile
+from pycaching.errors import NotLoggedInException, LoginFailedException, PMOnlyException, LoadError
+from pycaching.errors import ValueError as PycachingValueError
 from . import username as _username, password as _password, NetworkedTest
 
 
@@ -46,6 +48,54 @@ class TestMethods(NetworkedTest):
                 caches = list(self.gc.search(Point(49.733867, 13.397091), 100))
             self.assertNotEqual(caches[0], caches[50])
 
+        with self.subTest("prefetch"):
+            with self.recorder.use_cassette('geocaching_search_pagination'):
+                prefetched = list(self.gc.search(Point(49.733867, 13.397091), 100, prefetch=3))
+            self.assertEqual([c.wp for c in caches], [c.wp for c in prefetched])
+
+    def test_search_get_pages(self):
+        point = Point(49.733867, 13.397091)
+
+        def get_page(point, start_index):
+            table = Mock()
+            table.find_all.return_value = list(range(start_index, min(start_index + 20, 70)))
+            return table, "whole page" if start_index == 0 else None
+
+        with patch.object(Geocaching, "_search_get_page", side_effect=get_page) as mock_get_page:
+            for prefetch in 0, 2:
+                with self.subTest("limit", prefetch=prefetch):
+                    mock_get_page.reset_mock()
+                    pages = list(self.gc._search_get_pages(point, 40, prefetch))
+                    self.assertEqual([list(range(20)), list(range(20, 40))], [rows for rows, _ in pages])
+                    self.assertEqual("whole page", pages[0][1])
+                    self.assertEqual(2, mock_get_page.call_count)
+
+                with self.subTest("end of results", prefetch=prefetch):
+                    pages = list(self.gc._search_get_pages(point, float("inf"), prefetch))
+                    self.assertEqual(list(range(70)), [row for rows, _ in pages for row in rows])
+
+    def test_search_quick_tiles(self):
+        with open(os.path.join(os.path.dirname(__file__), "sample_utfgrid.json"), encoding="utf8") as f:
+            utfgrid = json.load(f)
+        rect = Rectangle(Point(49.73, 13.38), Point(49.74, 13.40))
+
+        # every tile returns the same grid, so each cache is in all of them
+        with patch.object(Tile, "_download_utfgrid", return_value=utfgrid) as mock_utfgrid:
+            with self.subTest("deduplicate"):
+                res = [c.wp for c in self.gc.search_quick(rect, zoom=16, workers=3)]
+                self.assertGreater(mock_utfgrid.call_count, 1)
+                self.assertEqual(len(res), len(set(res)))
+                self.assertEqual({key["i"] for keys in utfgrid["data"].values() for key in keys}, set(res))
+
+            with self.subTest("strict"):
+                res = list(self.gc.search_quick(rect, strict=True, zoom=16))
+                for cache in res:
+                    self.assertIn(cache.location, rect)
+
+            with self.subTest("invalid workers"):
+                with self.assertRaises(PycachingValueError):
+                    list(self.gc.search_quick(rect, workers=0))
+
     @unittest.expectedFailure
     def test_search_quick(self):
         """Perform quick search and check found caches"""
@@ -96,6 +146,73 @@ class TestMethods(NetworkedTest):
                 except PMOnlyException:
                     pass
 
+    def test_load_caches(self):
+        wps = ["GC{}".format(i) for i in range(1, 30)]
+
+        def fake_load(cache):
+            if cache.wp == "GC13":
+                raise PMOnlyException()
+            if cache.wp == "GC17":
+                raise LoadError()
+            cache.name = cache.wp
+
+        with patch.object(Cache, "load", autospec=True, side_effect=fake_load):
+            with self.subTest("ordered"):
+                errors = []
+                caches = list(self.gc.load_caches(wps, workers=3, on_error=lambda c, e: errors.append((c.wp, e))))
+                self.assertEqual([c.wp for c in caches], [wp for wp in wps if wp not in ("GC13", "GC17")])
+                self.assertEqual([c.name for c in caches], [c.wp for c in caches])
+                self.assertEqual(sorted((wp, type(e)) for wp, e in errors),
+                                 [("GC13", PMOnlyException), ("GC17", LoadError)])
+
+            with self.subTest("as completed"):
+                caches = list(self.gc.load_caches(iter(wps), workers=5, ordered=False))
+                self.assertEqual(sorted(c.wp for c in caches), sorted(set(wps) - {"GC13", "GC17"}))
+
+            with self.subTest("close early"):
+                gen = self.gc.load_caches(wps, workers=2)
+                self.assertEqual(next(gen).wp, "GC1")
+                gen.close()
+
+        with patch.object(Cache, "load_quick", autospec=True) as load_quick:
+            with self.subTest("other method"):
+                caches = list(self.gc.load_caches([Cache(self.gc, "GC1")], method="quick"))
+                self.assertEqual(len(caches), 1)
+                self.assertTrue(load_quick.called)
+
+        with self.subTest("unknown method"):
+            with self.assertRaises(PycachingValueError):
+                list(self.gc.load_caches(wps, method="xxx"))
+
+    def test_html_parser(self):
+        try:
+            import lxml  # NOQA
+        except ImportError:
+            self.skipTest("lxml is not installed")
+
+        def load(html_parser):
+            gc = Geocaching(session=self.session, html_parser=html_parser)
+            gc._logged_in = True
+            cache = Cache(gc, "GC4808G")
+            with self.recorder.use_cassette('cache_normal_normal'):
+                cache.load()
+            return cache
+
+        reference, cache = load("html.parser"), load("lxml")
+        for attr in ("name", "location", "type", "size", "difficulty", "terrain", "author", "hidden",
+                     "attributes", "hint", "favorites", "log_counts"):
+            with self.subTest(attr):
+                self.assertEqual(getattr(reference, attr), getattr(cache, attr))
+
+        # lxml normalizes line endings in text nodes
+        for attr in ("summary", "description"):
+            with self.subTest(attr):
+                self.assertEqual(getattr(reference, attr).replace("\r\n", "\n"), getattr(cache, attr))
+
+        with self.subTest("invalid parser"):
+            with self.assertRaises(PycachingValueError):
+                Geocaching(html_parser=123)
+
     def test__try_getting_cache_from_guid(self):
         # get "normal" cache from guidpage
         with self.recorder.use_cassette('geocaching_shortcut_getcache__by_guid'):  # is a replacement for login
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import os
+import subprocess
+import sys
+import unittest
+
+import pycaching
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(statement):
+    """Run a statement in a new interpreter with :code:`-X importtime` and return imported modules.
+
+    :return: Dictionary of {module name: cumulative import time in microseconds}.
+    """
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=_root,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    modules = {}
+    for line in res.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestLazyImports(unittest.TestCase):
+    heavy_modules = {"requests", "bs4", "geopy", "aiohttp", "subprocess"}
+
+    def assertNotImported(self, statement, modules):
+        imported = set(imported_modules(statement))
+        self.assertEqual(set(), imported & set(modules), "{!r} imports them".format(statement))
+
+    def test_package(self):
+        self.assertNotImported("import pycaching", self.heavy_modules)
+
+    def test_package_time(self):
+        lazy = imported_modules("import pycaching")["pycaching"]
+        full = imported_modules("import pycaching.geocaching")["pycaching.geocaching"]
+        self.assertLess(lazy, full / 10)
+
+    def test_enums(self):
+        self.assertNotImported("from pycaching.log import Type", self.heavy_modules)
+        self.assertNotImported("from pycaching.cache import Type, Size", {"bs4"})
+
+    def test_point(self):
+        self.assertNotImported("from pycaching import Point", {"bs4"})
+
+    def test_geocaching(self):
+        self.assertNotImported("from pycaching import Geocaching", {"bs4"})
+
+    def test_attributes(self):
+        from pycaching.geocaching import Geocaching
+        self.assertIs(Geocaching, pycaching.Geocaching)
+        self.assertIn("Point", dir(pycaching))
+        with self.assertRaises(AttributeError):
+            pycaching.Foo
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+import requests
+
+from pycaching import Cache, Geocaching
+from pycaching.errors import Error, LoadError
+from pycaching.instrumentation import Hook, MetricsAggregator, RequestRecord, SpanRecord
+from pycaching.response_cache import ResponseCache
+from pycaching.retry import RetryPolicy
+from .test_response_cache import make_response
+
+_details_url = "https://www.geocaching.com/seek/cache_details.aspx"
+_endpoint = "www.geocaching.com/seek/cache_details.aspx"
+
+
+class TestMetricsAggregator(unittest.TestCase):
+    def test_summary(self):
+        aggregator = MetricsAggregator()
+        aggregator.on_request(RequestRecord(_endpoint, "GET", 200, 100, 0.5, 0.25, 0, False, None))
+        aggregator.on_request(RequestRecord(_endpoint, "GET", 500, 10, 1.5, 0.0, 3, False, "HTTPError"))
+        aggregator.on_span(SpanRecord("Cache.load", "GC12345", 2.0, None))
+
+        summary = aggregator.summary()
+        self.assertEqual({
+            "count": 2, "errors": 1, "retries": 3, "cached": 0, "bytes": 110, "network_time": 2.0,
+            "max_network_time": 1.5, "parse_time": 0.25, "statuses": {200: 1, 500: 1},
+        }, summary["requests"][_endpoint])
+        self.assertEqual({"count": 1, "errors": 0, "time": 2.0, "max_time": 2.0}, summary["spans"]["Cache.load"])
+
+        with self.subTest("reset"):
+            aggregator.reset()
+            self.assertEqual({"requests": {}, "spans": {}}, aggregator.summary())
+
+
+class TestGeocachingHooks(unittest.TestCase):
+    def setUp(self):
+        self.hook = mock.Mock(spec=Hook)
+        self.gc = Geocaching(hooks=[self.hook])
+        self.gc._logged_in = True
+        self.request = mock.Mock()
+        self.gc._session.request = self.request
+
+    def test_request(self):
+        self.request.return_value = make_response(_details_url, body=b"<p>page</p>")
+        self.gc._request(_details_url)
+
+        record = self.hook.on_request.call_args[0][0]
+        self.assertEqual((_endpoint, "GET", 200, 11, 0, False, None),
+                         (record.endpoint, record.method, record.status, record.bytes, record.retries,
+                          record.cached, record.error))
+        self.assertGreater(record.network_time, 0)
+        self.assertGreater(record.parse_time, 0)
+
+    def test_request_failed(self):
+        self.request.side_effect = requests.exceptions.ConnectionError()
+        with self.assertRaises(Error):
+            self.gc._request(_details_url)
+
+        record = self.hook.on_request.call_args[0][0]
+        self.assertEqual((None, 0, "ConnectionError"), (record.status, record.bytes, record.error))
+
+    def test_retries_and_cache(self):
+        self.gc.retry_policy = RetryPolicy()
+        self.gc.response_cache = ResponseCache()
+        self.addCleanup(self.gc.response_cache.close)
+        self.request.side_effect = [make_response(_details_url, status=503), make_response(_details_url)]
+
+        with mock.patch("time.sleep"):
+            self.gc._request(_details_url, expect="raw")
+            self.gc._request(_details_url, expect="raw")
+
+        first, second = [c[0][0] for c in self.hook.on_request.call_args_list]
+        self.assertEqual((1, False), (first.retries, first.cached))
+        self.assertEqual((0, True), (second.retries, second.cached))
+
+    def test_span(self):
+        self.request.return_value = make_response(_details_url, status=404)
+        with self.assertRaises(LoadError):
+            Cache(self.gc, "GC12345").load()
+
+        record = self.hook.on_span.call_args[0][0]
+        self.assertEqual(("Cache.load", "GC12345", "LoadError"), (record.name, record.key, record.error))
+
+    def test_failing_hook(self):
+        self.hook.on_request.side_effect = RuntimeError()
+        self.request.return_value = make_response(_details_url)
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(200, self.gc._request(_details_url, expect="raw").status_code)
@@ -9,11 +9,30 @@ from pycaching.errors import ValueError as PycachingValueError
 class TestLog(unittest.TestCase):
 
     def setUp(self):
-        self.l = Log(type=Type.found_it, text="text", visited="2012-02-02", author="human")
+        self.l = Log(type=Type.found_it, text="text", visited="2012-02-02", author="human", id="123",
+                     created="2012-02-03")
 
     def test___str__(self):
         self.assertEqual(str(self.l), "text")
 
+    def test_snapshot(self):
+        log = Log.from_snapshot(self.l.to_snapshot())
+        self.assertEqual((log.id, log.type, log.text, log.visited, log.created, log.author),
+                         (self.l.id, self.l.type, self.l.text, self.l.visited, self.l.created, self.l.author))
+
+    def test_compact(self):
+        self.assertFalse(hasattr(self.l, "__dict__"))
+
+    def test_id(self):
+        self.assertEqual(self.l.id, 123)
+
+    def test_created(self):
+        self.assertEqual(self.l.created, date(2012, 2, 3))
+
+        with self.subTest("filter invalid types"):
+            with self.assertRaises(PycachingValueError):
+                self.l.created = None
+
     def test_type(self):
         self.assertEqual(self.l.type, Type.found_it)
 
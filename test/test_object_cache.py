@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from pycaching import Cache, Geocaching, Trackable
+from pycaching.object_cache import ObjectCache
+
+
+class TestObjectCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = ObjectCache()
+        key = cache.make_key(Cache, "gc1par2", "user")
+        self.assertEqual("Cache GC1PAR2 user", key)
+        self.assertIsNone(cache.get(key))
+
+        cache.put(key, {"wp": "GC1PAR2"})
+        snapshot = cache.get(key)
+        self.assertEqual({"wp": "GC1PAR2"}, snapshot)
+
+        with self.subTest("snapshots are not shared"):
+            snapshot["wp"] = "GC12345"
+            self.assertEqual({"wp": "GC1PAR2"}, cache.get(key))
+
+        self.assertEqual({"hits": 2, "misses": 1}, cache.stats)
+
+        with self.subTest("delete"):
+            cache.delete(key)
+            self.assertIsNone(cache.get(key))
+
+    def test_ttl(self):
+        cache = ObjectCache(ttl=60)
+        cache.put("key", {})
+        with mock.patch("time.time", return_value=10 ** 12):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(0, len(cache))
+
+    def test_evict(self):
+        cache = ObjectCache(max_items=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")  # make "a" recently used
+        cache.put("c", {})
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+    def test_disk(self):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "objects.sqlite")
+            cache = ObjectCache(path)
+            cache.put("key", {"name": "Testing"})
+            cache.close()
+
+            cache = ObjectCache(path)
+            self.assertEqual({"name": "Testing"}, cache.get("key"))
+            self.assertEqual(1, len(cache))  # promoted to memory
+            cache.close()
+
+
+class TestGeocachingSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching(object_cache=ObjectCache())
+
+    def test_get_cache(self):
+        cache = Cache(self.gc, "GC12345", name="Testing", favorites=10)
+        self.gc._store_snapshot(cache, cache.wp)
+
+        with mock.patch.object(Geocaching, "_request") as mock_request:
+            cache = self.gc.get_cache("GC12345")
+            self.assertEqual("Testing", cache.name)
+            self.assertEqual(10, cache.favorites)
+            self.assertFalse(mock_request.called)
+
+        with self.subTest("not cached"):
+            self.assertFalse(hasattr(self.gc.get_cache("GC54321"), "_name"))
+
+        with self.subTest("other user"):
+            self.gc._logged_username = "other"
+            self.assertFalse(hasattr(self.gc.get_cache("GC12345"), "_name"))
+
+    def test_get_trackable(self):
+        trackable = Trackable(self.gc, "TB12345", name="Testing")
+        self.gc._store_snapshot(trackable, trackable.tid)
+
+        with mock.patch.object(Geocaching, "_request") as mock_request:
+            self.assertEqual("Testing", self.gc.get_trackable("TB12345").name)
+            self.assertFalse(mock_request.called)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+from pycaching import Geocaching
+from pycaching.rate_limit import RateLimiter, TokenBucket
+from .test_response_cache import make_response
+
+_details_url = "https://www.geocaching.com/seek/cache_details.aspx"
+_tile_url = "https://tiles01.geocaching.com/map.info"
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.time = 100.0
+        patchers = [mock.patch("time.monotonic", side_effect=lambda: self.time),
+                    mock.patch("time.sleep")]
+        self.sleep = patchers[1].start()
+        patchers[0].start()
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def test_acquire(self):
+        bucket = TokenBucket(2, 3)
+        delays = [bucket.acquire() for _ in range(5)]
+        self.assertEqual([0, 0, 0, 0.5, 1.0], delays)
+        self.assertEqual([mock.call(0.5), mock.call(1.0)], self.sleep.call_args_list)
+
+        with self.subTest("refill"):
+            self.time += 10
+            self.assertEqual(0, bucket.acquire())
+
+    def test_slow_down(self):
+        bucket = TokenBucket(2, 3, min_rate=0.5)
+        bucket.slow_down(0.5)
+        self.assertEqual(1, bucket.rate)
+        bucket.slow_down(0.1, retry_after=30)
+        self.assertEqual(0.5, bucket.rate)
+        self.assertEqual(30, bucket.acquire())
+
+        with self.subTest("recover"):
+            for _ in range(10):
+                bucket.recover(0.25)
+            self.assertEqual(2, bucket.rate)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_budget(self):
+        self.assertEqual(("www.geocaching.com", "html"), RateLimiter.budget(_details_url))
+        self.assertEqual(("www.geocaching.com", "ajax"),
+                         RateLimiter.budget("https://www.geocaching.com/play/search/more-results", "json"))
+        self.assertEqual(("tiles01.geocaching.com", "tile"), RateLimiter.budget(_tile_url, "raw"))
+
+    def test_update(self):
+        limiter = RateLimiter({"html": 4})
+        budget = limiter.budget(_details_url)
+        limiter.update(budget, make_response(_details_url))
+        self.assertEqual({budget: 4}, limiter.current_rates)
+
+        with mock.patch.object(TokenBucket, "slow_down") as slow_down:
+            limiter.update(budget, make_response(_details_url, status=429, headers={"Retry-After": "5"}))
+            slow_down.assert_called_once_with(0.5, 5)
+
+        for status in 503, 204:
+            limiter.update(budget, make_response(_details_url, status=status))
+        self.assertEqual({budget: 1}, limiter.current_rates)
+        self.assertEqual(3, limiter.throttled)
+
+        with self.subTest("recover"):
+            limiter.update(budget, make_response(_details_url))
+            self.assertEqual({budget: 1.2}, limiter.current_rates)
+
+        with self.subTest("empty tile"):
+            tile_budget = limiter.budget(_tile_url, "raw")
+            limiter.update(tile_budget, make_response(_tile_url, status=204))
+            self.assertEqual(10, limiter.current_rates[tile_budget])
+            self.assertEqual(3, limiter.throttled)
+            limiter.update(tile_budget, make_response(_tile_url, status=429))
+            self.assertEqual(5, limiter.current_rates[tile_budget])
+
+
+class TestGeocachingRateLimit(unittest.TestCase):
+    def setUp(self):
+        self.limiter = RateLimiter({"html": 1, "tile": 1}, {"html": 2, "tile": 1})
+        self.gc = Geocaching(rate_limiter=self.limiter)
+        self.gc._logged_in = True
+        self.gc._session.request = mock.Mock(side_effect=lambda method, url, **kwargs: make_response(url))
+
+    def test_request(self):
+        with mock.patch("time.monotonic", return_value=100.0), mock.patch("time.sleep") as sleep:
+            for _ in range(3):
+                self.gc._request(_details_url, expect="raw")
+            self.gc._request(_tile_url, expect="raw")
+        sleep.assert_called_once_with(1.0)
+        self.assertEqual({("www.geocaching.com", "html"): 1, ("tiles01.geocaching.com", "tile"): 1},
+                         self.limiter.current_rates)
+
+    def test_shared(self):
+        other = Geocaching(rate_limiter=self.limiter)
+        other._logged_in = True
+        other._session = self.gc._session
+        with mock.patch("time.monotonic", return_value=100.0), mock.patch("time.sleep") as sleep:
+            self.gc._request(_details_url, expect="raw")
+            other._request(_details_url, expect="raw")
+            self.gc._request(_details_url, expect="raw")
+        sleep.assert_called_once_with(1.0)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+import requests
+
+from pycaching import Geocaching
+from pycaching.response_cache import ResponseCache
+
+_details_url = "https://www.geocaching.com/seek/cache_details.aspx"
+
+
+def make_response(url, status=200, body=b"<html></html>", headers=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_is_cacheable(self):
+        self.assertTrue(self.cache.is_cacheable("GET", _details_url))
+        self.assertFalse(self.cache.is_cacheable("POST", _details_url))
+        self.assertFalse(self.cache.is_cacheable("GET", "https://www.geocaching.com/account/signin"))
+        self.assertFalse(self.cache.is_cacheable("GET", "https://www.geocaching.com/play/search"))
+
+    def test_make_key(self):
+        with self.subTest("params order"):
+            self.assertEqual(self.cache.make_key("GET", _details_url, {"wp": "GC1", "a": "b"}),
+                             self.cache.make_key("GET", _details_url, {"a": "b", "wp": "GC1"}))
+
+        with self.subTest("user"):
+            self.assertNotEqual(self.cache.make_key("GET", _details_url, None, "user1"),
+                                self.cache.make_key("GET", _details_url, None, "user2"))
+
+    def test_store_get(self):
+        key = self.cache.make_key("GET", _details_url)
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.store(key, make_response(_details_url, headers={"ETag": "abc"}))
+        response, fresh, validators = self.cache.get(key)
+        self.assertTrue(fresh)
+        self.assertEqual(b"<html></html>", response.content)
+        self.assertEqual("<html></html>", response.text)
+        self.assertEqual({"If-None-Match": "abc"}, validators)
+        self.assertEqual({"hits": 1, "misses": 1, "revalidations": 0}, self.cache.stats)
+
+    def test_store_unsuccessful(self):
+        key = self.cache.make_key("GET", _details_url)
+        self.cache.store(key, make_response(_details_url, status=404))
+        self.cache.store(key, make_response(_details_url, headers={"Cache-Control": "no-store"}))
+        self.assertEqual(0, len(self.cache))
+
+    def test_store_login_redirect(self):
+        key = self.cache.make_key("GET", _details_url)
+        self.cache.store(key, make_response("https://www.geocaching.com/account/signin?returnUrl=x"), _details_url)
+        self.assertEqual(0, len(self.cache))
+
+    def test_ttl(self):
+        key = self.cache.make_key("GET", _details_url)
+        self.cache.store(key, make_response(_details_url))
+        with mock.patch("time.time", return_value=10 ** 12):
+            _, fresh, _ = self.cache.get(key)
+            self.assertFalse(fresh)
+            self.cache.revalidate(key)
+            _, fresh, _ = self.cache.get(key)
+            self.assertTrue(fresh)
+
+    def test_evict(self):
+        self.cache.max_size = 25
+        keys = [self.cache.make_key("GET", _details_url, {"wp": wp}) for wp in ("GC1", "GC2", "GC3")]
+        with mock.patch("time.time", side_effect=range(100)):
+            self.cache.store(keys[0], make_response(_details_url, body=b"1" * 10))
+            self.cache.store(keys[1], make_response(_details_url, body=b"2" * 10))
+            self.cache.get(keys[0])  # make GC1 recently used
+            self.cache.store(keys[2], make_response(_details_url, body=b"3" * 10))
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+
+
+class TestGeocachingSend(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.gc = Geocaching(response_cache=self.cache)
+        self.gc._logged_in = True
+        self.request = mock.Mock()
+        self.gc._session.request = self.request
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_hit(self):
+        self.request.return_value = make_response(_details_url, body=b"<p>cached</p>")
+        first = self.gc._request(_details_url, params={"wp": "GC1"}, expect="raw")
+        second = self.gc._request(_details_url, params={"wp": "GC1"}, expect="raw")
+        self.assertEqual(1, self.request.call_count)
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(1, self.cache.hits)
+
+    def test_redirected_hit(self):
+        self.request.return_value = make_response("https://www.geocaching.com/geocache/GC1_name")
+        self.gc._request(_details_url, params={"wp": "GC1"}, expect="raw")
+        self.gc._request(_details_url, params={"wp": "GC1"}, expect="raw")
+        self.assertEqual(1, self.request.call_count)
+        self.assertEqual({"hits": 1, "misses": 1, "revalidations": 0}, self.cache.stats)
+
+    def test_not_cached(self):
+        self.request.return_value = make_response(_details_url)
+        with self.subTest("POST"):
+            self.gc._request(_details_url, method="POST", expect="raw")
+            self.gc._request(_details_url, method="POST", expect="raw")
+            self.assertEqual(2, self.request.call_count)
+
+        with self.subTest("login page"):
+            self.request.reset_mock()
+            url = "https://www.geocaching.com/account/signin"
+            self.gc._request(url, expect="raw", login_check=False)
+            self.gc._request(url, expect="raw", login_check=False)
+            self.assertEqual(2, self.request.call_count)
+
+    def test_revalidation(self):
+        self.request.return_value = make_response(_details_url, body=b"<p>old</p>", headers={"ETag": "abc"})
+        self.gc._request(_details_url, expect="raw")
+
+        self.request.return_value = make_response(_details_url, status=304, body=b"")
+        with mock.patch("time.time", return_value=10 ** 12):
+            res = self.gc._request(_details_url, expect="raw")
+        self.assertEqual("<p>old</p>", res.text)
+        self.assertEqual({"If-None-Match": "abc"}, self.request.call_args[1]["headers"])
+        self.assertEqual(1, self.cache.revalidations)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+import requests
+
+from pycaching import Geocaching
+from pycaching.errors import Error
+from pycaching.retry import RetryPolicy
+from .test_response_cache import make_response
+
+_details_url = "https://www.geocaching.com/seek/cache_details.aspx"
+_endpoint = "www.geocaching.com/seek/cache_details.aspx"
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        with mock.patch("random.uniform", side_effect=lambda a, b: b):
+            self.assertEqual([1, 2, 4, 5], [policy.delay(retry) for retry in range(4)])
+
+    def test_call(self):
+        policy = RetryPolicy(max_retries=2)
+
+        with self.subTest("connection error"):
+            send = mock.Mock(side_effect=[requests.exceptions.ConnectionError(), make_response(_details_url)])
+            self.assertEqual(200, policy.call("GET", _details_url, send).status_code)
+            self.assertEqual(2, send.call_count)
+
+        with self.subTest("5xx responses"):
+            send = mock.Mock(return_value=make_response(_details_url, status=503))
+            self.assertEqual(503, policy.call("GET", _details_url, send).status_code)
+            self.assertEqual(3, send.call_count)
+
+        with self.subTest("client errors are not retried"):
+            send = mock.Mock(return_value=make_response(_details_url, status=404))
+            policy.call("GET", _details_url, send)
+            self.assertEqual(1, send.call_count)
+
+        with self.subTest("POST is not retried"):
+            send = mock.Mock(side_effect=requests.exceptions.Timeout())
+            with self.assertRaises(requests.exceptions.Timeout):
+                policy.call("POST", _details_url, send)
+            self.assertEqual(1, send.call_count)
+
+        self.assertEqual({"requests": {_endpoint: 4}, "retries": {_endpoint: 3}}, policy.stats)
+        self.assertEqual(3, self.sleep.call_count)
+
+    def test_budget(self):
+        policy = RetryPolicy(max_retries=5, budget_ratio=0.5, min_budget=0)
+        send = mock.Mock(return_value=make_response(_details_url, status=500))
+        policy.call("GET", _details_url, send)
+        self.assertEqual(2, send.call_count)  # only one retry fits the budget
+
+        with self.subTest("budget grows with requests"):
+            send.reset_mock()
+            send.return_value = make_response(_details_url)
+            for _ in range(4):
+                policy.call("GET", _details_url, send)
+            send.return_value = make_response(_details_url, status=500)
+            policy.call("GET", _details_url, send)
+            self.assertEqual(4 + 3, send.call_count)  # 0.5 * 6 retries allowed in total
+
+        with self.subTest("other endpoints are not affected"):
+            send.reset_mock()
+            policy.call("GET", "https://www.geocaching.com/play/search", send)
+            self.assertEqual(2, send.call_count)
+
+
+class TestGeocachingRetry(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy()
+        self.gc = Geocaching(retry_policy=self.policy)
+        self.gc._logged_in = True
+        self.request = mock.Mock()
+        self.gc._session.request = self.request
+        patcher = mock.patch("time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_request(self):
+        self.request.side_effect = [requests.exceptions.ConnectTimeout(), make_response(_details_url, status=502),
+                                    make_response(_details_url, body=b"<p>ok</p>")]
+        self.assertEqual("<p>ok</p>", self.gc._request(_details_url, expect="raw").text)
+        self.assertEqual({_endpoint: 2}, self.policy.stats["retries"])
+
+    def test_request_failed(self):
+        with self.subTest("GET"):
+            self.request.return_value = make_response(_details_url, status=500)
+            with self.assertRaises(Error):
+                self.gc._request(_details_url)
+            self.assertEqual(4, self.request.call_count)
+
+        with self.subTest("POST"):
+            self.request.reset_mock()
+            self.request.side_effect = requests.exceptions.ConnectionError()
+            with self.assertRaises(Error):
+                self.gc._request(_details_url, method="POST", data={})
+            self.assertEqual(1, self.request.call_count)
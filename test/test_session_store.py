@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+import os
+import stat
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import requests
+
+from pycaching import Geocaching
+from pycaching.errors import LoginFailedException
+from pycaching.session_store import FileSessionStore, SessionStore, dump_cookies, load_cookies
+from .test_response_cache import make_response
+
+_details_url = "https://www.geocaching.com/seek/cache_details.aspx"
+_signin_url = "https://www.geocaching.com/account/signin?returnUrl=%2fseek%2fcache_details.aspx"
+
+
+def make_cookies(expires=None):
+    jar = requests.cookies.RequestsCookieJar()
+    jar.set("gspkauth", "secret", domain=".geocaching.com", path="/", expires=expires, secure=True,
+            rest={"HttpOnly": None})
+    return dump_cookies(jar)
+
+
+class TestFileSessionStore(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "session.json")
+        self.store = FileSessionStore(self.path)
+
+    def test_save_load(self):
+        self.assertIsNone(self.store.load())
+
+        cookies = make_cookies(expires=int(time.time()) + 3600)
+        self.store.save("user", cookies)
+        self.assertEqual(("user", cookies), self.store.load())
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+
+        with self.subTest("clear"):
+            self.store.clear()
+            self.assertIsNone(self.store.load())
+            self.store.clear()
+
+    def test_expired(self):
+        self.store.save("user", make_cookies(expires=int(time.time()) - 1))
+        self.assertIsNone(self.store.load())
+
+    def test_corrupted(self):
+        with open(self.path, "w") as f:
+            f.write("{")
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(self.store.load())
+
+    def test_cookies(self):
+        jar = requests.cookies.RequestsCookieJar()
+        load_cookies(jar, make_cookies())
+        cookie, = jar
+        self.assertEqual(("gspkauth", "secret", ".geocaching.com", True), (cookie.name, cookie.value, cookie.domain,
+                                                                           cookie.secure))
+        self.assertTrue(cookie.has_nonstandard_attr("HttpOnly"))
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            SessionStore()
+
+
+class TestGeocachingSession(unittest.TestCase):
+    def setUp(self):
+        self.store = mock.Mock(spec=FileSessionStore)
+        self.store.load.return_value = ("user", make_cookies())
+        self.gc = Geocaching(session_store=self.store)
+        self.request = mock.Mock()
+        self.gc._session.request = self.request
+
+    def test_restore(self):
+        self.gc.login()
+        self.assertEqual("user", self.gc._logged_username)
+        self.assertEqual("secret", self.gc._session.cookies["gspkauth"])
+        self.request.assert_not_called()
+
+    def test_restore_other_user(self):
+        with mock.patch.object(Geocaching, "_login") as login:
+            self.gc.login("other", "pass")
+            login.assert_called_once_with("other", "pass")
+
+    def test_save(self):
+        with mock.patch.object(Geocaching, "get_logged_user", return_value="user"), \
+                mock.patch.object(Geocaching, "_get_login_post_data", return_value={}):
+            self.request.return_value = make_response(_signin_url)
+            self.gc._login("user", "pass")
+        self.store.save.assert_called_once_with("user", [])
+
+    def test_relogin(self):
+        session = self.gc._session
+        self.gc.login("user", "pass")
+        self.request.side_effect = [make_response(_signin_url), make_response(_details_url, body=b"<p>page</p>")]
+
+        def login(username, password, session):
+            # other threads still see the user logged in and use the old session
+            self.assertTrue(self.gc._logged_in)
+            self.assertIsNot(session, self.gc._session)
+            self.gc._login_generation += 1
+
+        with mock.patch.object(Geocaching, "_login", side_effect=login) as login_mock:
+            page = self.gc._request(_details_url)
+            login_mock.assert_called_once_with("user", "pass", session=mock.ANY)
+        self.assertEqual("page", page.text)
+        self.assertIs(session, self.gc._session)
+
+        with self.subTest("already logged in again by another thread"):
+            with mock.patch.object(Geocaching, "_login") as login_mock:
+                self.gc._relogin(self.gc._login_generation - 1)
+                login_mock.assert_not_called()
+
+    def test_relogin_cookies(self):
+        session = requests.Session()
+        session.headers["User-Agent"] = "test"
+        gc = Geocaching(session=session)
+        gc._logged_in, gc._credentials = True, ("user", "pass")
+        side_sessions = []
+
+        def request(self, method, url, **kwargs):
+            side_sessions.append(self)
+            self.cookies.set("gspkauth", "new", domain=".geocaching.com")
+            return make_response(url)
+
+        with mock.patch.object(requests.Session, "request", autospec=True, side_effect=request), \
+                mock.patch.object(Geocaching, "get_logged_user", return_value="user"), \
+                mock.patch.object(Geocaching, "_get_login_post_data", return_value={}):
+            gc._relogin(gc._login_generation)
+
+        self.assertEqual(2, len(side_sessions))
+        side_session = side_sessions[0]
+        self.assertIsNot(session, side_session)
+        self.assertEqual("test", side_session.headers["User-Agent"])
+        self.assertIs(session, gc._session)
+        self.assertEqual("new", session.cookies["gspkauth"])
+        self.assertTrue(gc._logged_in)
+
+        with self.subTest("failed login"):
+            store = mock.Mock(spec=FileSessionStore)
+            gc.session_store = store
+            session.cookies.set("gspkauth", "old", domain=".geocaching.com")
+            with mock.patch.object(requests.Session, "request", autospec=True, side_effect=request), \
+                    mock.patch.object(Geocaching, "get_logged_user", return_value=None), \
+                    mock.patch.object(Geocaching, "_get_login_post_data", return_value={}), \
+                    self.assertRaises(LoginFailedException):
+                gc._relogin(gc._login_generation)
+            self.assertIs(session, gc._session)
+            self.assertEqual("old", session.cookies["gspkauth"])
+            store.clear.assert_not_called()
+
+    def test_logged_in_response(self):
+        self.gc.login("user", "pass")
+        self.request.return_value = make_response(_details_url)
+        with mock.patch.object(Geocaching, "_login") as login:
+            self.gc._request(_details_url)
+            login.assert_not_called()
+
+    def test_logout(self):
+        self.gc.login()
+        self.gc.logout()
+        self.store.clear.assert_called_once_with()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from pycaching import Geocaching
+from pycaching.geo import Tile
+from pycaching.tile_history import TileHistory
+
+_utfgrid = {"grid": [], "keys": [], "data": {}}
+
+
+class FakeTileServer(object):
+    """Serves UTFGrids of tiles needing the .png first and empty tiles, counts the requests."""
+
+    def __init__(self, needs_png=(), empty=()):
+        self.needs_png = set(needs_png)
+        self.empty = set(empty)
+        self.png_loaded = set()
+        self.requests = []
+
+    def __call__(self, url, params, expect):
+        key = params["z"], params["x"], params["y"]
+        self.requests.append(url)
+        if url == Tile._urls["tile"]:
+            self.png_loaded.add(key)
+            return mock.Mock(status_code=200)
+        if key in self.empty or (key in self.needs_png and key not in self.png_loaded):
+            return mock.Mock(status_code=204)
+        return mock.Mock(status_code=200, **{"json.return_value": _utfgrid})
+
+
+class TestTileHistory(unittest.TestCase):
+    def test_predict(self):
+        history = TileHistory(png_ttl=10, min_samples=2)
+
+        with self.subTest("unknown"):
+            self.assertEqual(TileHistory.direct, history.predict(14, 1, 1))
+
+        with self.subTest("needs png"):
+            with mock.patch("time.time", return_value=0):
+                history.record(14, 1, 1, TileHistory.needs_png, png_loaded=True, direct_failed=True)
+            with mock.patch("time.time", return_value=5):
+                self.assertEqual(TileHistory.direct, history.predict(14, 1, 1))
+            with mock.patch("time.time", return_value=20):
+                self.assertEqual(TileHistory.needs_png, history.predict(14, 1, 1))
+
+        with self.subTest("empty"):
+            with mock.patch("time.time", return_value=0):
+                history.record(14, 1, 2, TileHistory.empty, png_loaded=True, direct_failed=True)
+                self.assertEqual(TileHistory.empty, history.predict(14, 1, 2))
+
+        with self.subTest("zoom"):
+            self.assertEqual(TileHistory.needs_png, history.predict(14, 5, 5))
+            self.assertEqual(TileHistory.direct, history.predict(13, 5, 5))
+
+        with self.subTest("expired"):
+            with mock.patch("time.time", return_value=history.ttl + 1):
+                self.assertEqual(TileHistory.needs_png, history.predict(14, 1, 2))
+
+    def test_zoom_failure_rate(self):
+        history = TileHistory(min_samples=1, smoothing=0.5)
+        history.record(14, 1, 1, TileHistory.needs_png, png_loaded=True, direct_failed=True)
+        history.record(14, 1, 2, TileHistory.direct, png_loaded=False, direct_failed=False)
+        self.assertEqual(TileHistory.needs_png, history.predict(14, 5, 5))
+        history.record(14, 1, 3, TileHistory.direct, png_loaded=False, direct_failed=False)
+        self.assertEqual(TileHistory.direct, history.predict(14, 5, 5))
+
+    def test_disk(self):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tiles.sqlite")
+            history = TileHistory(path, min_samples=1)
+            history.record(14, 1, 1, TileHistory.empty, png_loaded=True, direct_failed=True)
+            history.close()
+
+            history = TileHistory(path, min_samples=1)
+            self.assertEqual(1, len(history))
+            self.assertEqual(TileHistory.empty, history.predict(14, 1, 1))
+            self.assertEqual(TileHistory.needs_png, history.predict(14, 5, 5))
+            history.close()
+
+
+class TestTileDownload(unittest.TestCase):
+    def setUp(self):
+        self.gc = Geocaching(tile_history=TileHistory(png_ttl=0, min_samples=2))
+        self.server = FakeTileServer(needs_png={(14, x, 0) for x in range(10)}, empty={(14, 0, 1)})
+        patcher = mock.patch.object(self.gc, "_request", side_effect=self.server)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def download(self, x, y):
+        self.server.requests.clear()
+        result = Tile(self.gc, x, y, 14)._download_utfgrid()
+        return result, len(self.server.requests)
+
+    def test_without_history(self):
+        self.gc.tile_history = None
+        self.assertEqual((_utfgrid, 3), self.download(0, 0))
+        self.assertEqual((None, 3), self.download(0, 1))
+
+    def test_zoom_prediction(self):
+        self.assertEqual((_utfgrid, 3), self.download(0, 0))
+        self.assertEqual((_utfgrid, 3), self.download(1, 0))
+        for x in range(2, 10):
+            self.assertEqual((_utfgrid, 2), self.download(x, 0))
+
+    def test_tile_prediction(self):
+        self.assertEqual((_utfgrid, 3), self.download(0, 0))
+        self.assertEqual((_utfgrid, 2), self.download(0, 0))
+
+    def test_empty(self):
+        self.assertEqual((None, 3), self.download(0, 1))
+        self.assertEqual((None, 1), self.download(0, 1))
+
+    def test_direct(self):
+        self.assertEqual((_utfgrid, 1), self.download(0, 2))
+        self.assertEqual(TileHistory.direct, self.gc.tile_history.predict(14, 0, 2))
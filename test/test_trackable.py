@@ -73,6 +73,15 @@ class TestMethods(NetworkedTest):
             with self.assertRaises(LoadError):
                 trackable.name
 
+    def test_snapshot(self):
+        restored = Trackable.from_snapshot(self.gc, self.t.to_snapshot())
+        with mock.patch.object(Trackable, "load") as mock_load:
+            for attr in ("tid", "name", "location", "owner", "type", "description", "goal",
+                         "_log_page_url", "_kml_url"):
+                with self.subTest(attr):
+                    self.assertEqual(getattr(self.t, attr), getattr(restored, attr))
+            self.assertFalse(mock_load.called)
+
     def test_load_log_page(self):
         expected_types = {t.value for t in (LogType.grabbed_it, LogType.note, LogType.discovered_it)}
         expected_inputs = "__EVENTTARGET", "__VIEWSTATE"  # and more ...
@@ -2,8 +2,12 @@
 
 import datetime
 import itertools
+import unittest
 
-from pycaching.util import rot13, parse_date, format_date, get_possible_attributes
+from bs4 import BeautifulSoup
+
+from pycaching.errors import ValueError as PycachingValueError
+from pycaching.util import rot13, parse_date, format_date, get_possible_attributes, parse_html, DateParser
 from . import NetworkedTest
 
 
@@ -51,6 +55,22 @@ class TestModule(NetworkedTest):
         for user_format, ref_result in cases.items():
             self.assertEqual(format_date(date, user_format), ref_result)
 
+    def test_parse_html(self):
+        markup = "<p id='x'>text</p>"
+
+        with self.subTest("default parser"):
+            self.assertEqual(parse_html(markup).find(id="x").text, "text")
+
+        with self.subTest("named parser"):
+            self.assertEqual(parse_html(markup, "html.parser").find(id="x").text, "text")
+
+        with self.subTest("missing parser falls back"):
+            self.assertEqual(parse_html(markup, "nonexistent-parser").find(id="x").text, "text")
+
+        with self.subTest("custom callable"):
+            soup = parse_html(markup, lambda m: BeautifulSoup(m.upper(), "html.parser"))
+            self.assertEqual(soup.find(id="X").text, "TEXT")
+
     def test_get_possible_attributes(self):
         with self.recorder.use_cassette('util_attributes'):
             attributes = get_possible_attributes(session=self.session)
@@ -61,3 +81,39 @@ class TestModule(NetworkedTest):
 
         with self.subTest("non-existing attributes"):
             self.assertNotIn("xxx", attributes)
+
+
+class TestDateParser(unittest.TestCase):
+    def test_parse(self):
+        parser = DateParser()
+        self.assertIsNone(parser.format)
+
+        with self.subTest("ambiguous date before learning"):
+            self.assertEqual(datetime.date(2020, 1, 2), parse_date("01/02/2020"))
+
+        with self.subTest("learning"):
+            self.assertEqual(datetime.date(2020, 2, 13), parser.parse("13/02/2020"))
+            self.assertEqual("%d/%m/%Y", parser.format)
+            self.assertEqual(datetime.date(2020, 2, 1), parser.parse("01/02/2020"))
+
+        with self.subTest("other format"):
+            self.assertEqual(datetime.date(2020, 2, 1), parser.parse("2020-02-01"))
+            self.assertEqual("%Y-%m-%d", parser.format)
+
+        with self.subTest("invalid"):
+            for raw in ("31/02/2020", "01/Foo/2020", "2020"):
+                with self.assertRaises(PycachingValueError):
+                    parser.parse(raw)
+
+    def test_parse_many(self):
+        parser = DateParser()
+        self.assertEqual([datetime.date(2020, 2, 1), datetime.date(2020, 2, 13)],
+                         parser.parse_many(["01/02/2020", " 13/02/2020"]))
+        self.assertEqual("%d/%m/%Y", parser.format)
+
+        with self.subTest("mixed formats"):
+            self.assertEqual([datetime.date(2020, 2, 1), datetime.date(1999, 3, 5)],
+                             parser.parse_many(["01/02/2020", "05 Mar 99"]))
+
+        with self.subTest("empty"):
+            self.assertEqual([], parser.parse_many([]))